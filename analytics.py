@@ -0,0 +1,352 @@
+# analytics.py
+# Engagement analytics: click-through rates per student, job, source and day.
+# Nothing here rescans the raw logs. Counters are kept in daily rollup tables
+# (data/analytics.db) that are updated as events arrive:
+#   - send_email records each delivered digest (one "send" per job in it),
+#   - fetch_all_jobs records each source's scrape time and candidate count,
+#   - refresh() folds in only the clicks added to clicks.db since the last
+#     refresh (a watermark on the click row id).
+# Sends and scrapes happen on the runner but clicks reach the tracker, so a
+# runner's Analytics(push_url=PUSH_URL) also queues what it records and
+# push() posts it, signed like the click index, to the tracker's
+# /analytics/push, where load() records it into the tracker's rollups.
+# A report is then a GROUP BY over a few small tables. "clicked" counts a
+# student's first click on a job, so CTR = clicked / sends is not inflated
+# by repeat clicks.
+#
+#   python analytics.py source --since 2025-11-01
+#   python analytics.py student --limit 20 --json
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import closing
+from datetime import date, datetime
+
+from click_tokens import push_entries
+from url_canon import link_key
+
+DEFAULT_PATH = os.path.join("data", "analytics.db")
+CLICK_DB_PATH = os.getenv("CLICK_DB_PATH", os.path.join("data", "clicks.db"))
+# Tracker endpoint for the runner's sends and scrape times; defaults to the
+# /analytics/push next to CLICK_INDEX_URL
+_CLICK_INDEX_URL = os.getenv("CLICK_INDEX_URL", "")
+PUSH_URL = os.getenv("ANALYTICS_PUSH_URL") or (
+    _CLICK_INDEX_URL.removesuffix("/click-index") + "/analytics/push" if _CLICK_INDEX_URL else "")
+REFRESH_BATCH = 5000
+UNKNOWN_SOURCE = "(unknown)"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,         -- the job store id
+    title TEXT,
+    company TEXT,
+    source TEXT,
+    link_key TEXT                       -- to attribute ?email=&link= clicks
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_link_key ON jobs(link_key);
+
+CREATE TABLE IF NOT EXISTS clicked_pairs (
+    job_id INTEGER NOT NULL,
+    student TEXT NOT NULL,
+    PRIMARY KEY (job_id, student)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_students (
+    day TEXT NOT NULL,
+    student TEXT NOT NULL,              -- lowercased email address
+    sends INTEGER NOT NULL DEFAULT 0,   -- jobs emailed
+    clicks INTEGER NOT NULL DEFAULT 0,  -- every click
+    clicked INTEGER NOT NULL DEFAULT 0, -- first clicks on a job
+    PRIMARY KEY (day, student)
+);
+CREATE TABLE IF NOT EXISTS daily_jobs (
+    day TEXT NOT NULL,
+    job_id INTEGER NOT NULL,
+    sends INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    clicked INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, job_id)
+);
+CREATE TABLE IF NOT EXISTS daily_sources (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    sends INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    clicked INTEGER NOT NULL DEFAULT 0,
+    scrape_seconds REAL NOT NULL DEFAULT 0,
+    candidates INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, source)
+);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# rollup table -> its key column (besides day); counters are only ever added to
+ROLLUPS = {
+    "daily_students": "student",
+    "daily_jobs": "job_id",
+    "daily_sources": "source",
+}
+
+
+def _bump(conn, table, rows, columns=("sends", "clicks", "clicked")):
+    """Add (day, key, *counts) rows onto a rollup table."""
+    key = ROLLUPS[table]
+    conn.executemany(
+        f"INSERT INTO {table} (day, {key}, {', '.join(columns)}) VALUES (?, ?{', ?' * len(columns)}) "
+        f"ON CONFLICT(day, {key}) DO UPDATE SET "
+        + ", ".join(f"{c} = {c} + excluded.{c}" for c in columns), rows)
+
+
+def _today():
+    return date.today().isoformat()
+
+
+class Analytics:
+    def __init__(self, path=None, clicks_path=None, push_url=None):
+        self.path = path or os.getenv("ANALYTICS_DB_PATH", DEFAULT_PATH)
+        self.clicks_path = clicks_path or CLICK_DB_PATH
+        self.push_url = push_url
+        self._outgoing = {"jobs": [], "sends": [], "scrapes": []}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_jobs(self, jobs):
+        """Remember title/company/source/link of jobs (dicts with their store "id") for reports."""
+        rows = [(j["id"], j.get("title"), j.get("company"), j.get("source") or UNKNOWN_SOURCE, j.get("link"))
+                for j in jobs if j.get("id") is not None]
+        with self._lock, closing(self.connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO jobs (job_id, title, company, source, link_key) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                "source = excluded.source, link_key = excluded.link_key",
+                [r[:4] + (link_key(r[4]) if r[4] else None,) for r in rows])
+            if self.push_url:
+                self._outgoing["jobs"] += [dict(zip(("id", "title", "company", "source", "link"), r)) for r in rows]
+
+    def record_send(self, student, jobs, day=None):
+        """One delivered digest: `jobs` are the job dicts (with "id" and "source") it carried."""
+        day = day or _today()
+        student = student.strip().lower()
+        ids = [j["id"] for j in jobs if j.get("id") is not None]
+        sources = Counter(j.get("source") or UNKNOWN_SOURCE for j in jobs)
+        with self._lock, closing(self.connect()) as conn, conn:
+            _bump(conn, "daily_students", [(day, student, len(jobs), 0, 0)])
+            _bump(conn, "daily_jobs", [(day, i, 1, 0, 0) for i in ids])
+            _bump(conn, "daily_sources", [(day, s, n, 0, 0) for s, n in sources.items()])
+            if self.push_url:
+                self._outgoing["sends"].append({"day": day, "student": student, "jobs": [
+                    {"id": j.get("id"), "source": j.get("source") or UNKNOWN_SOURCE} for j in jobs]})
+
+    def record_scrape(self, stats, day=None):
+        """Per-source scrape stats from scrape_engine.run_sources: {name: {"jobs", "seconds", ...}}."""
+        day = day or _today()
+        with self._lock, closing(self.connect()) as conn, conn:
+            _bump(conn, "daily_sources", [(day, name, st.get("seconds", 0), st.get("jobs", 0))
+                                          for name, st in stats.items()],
+                  columns=("scrape_seconds", "candidates"))
+            if self.push_url:
+                self._outgoing["scrapes"].append({"day": day, "stats": {
+                    name: {"seconds": st.get("seconds", 0), "jobs": st.get("jobs", 0)} for name, st in stats.items()}})
+
+    def load(self, entries):
+        """Record the jobs, sends and scrapes pushed by a runner (the body push() sends)."""
+        for kind in ("jobs", "sends", "scrapes"):
+            if not isinstance(entries.get(kind, []), list):
+                raise ValueError(f"{kind!r} must be a list")
+        # unpack everything first, so a malformed entry records nothing
+        sends = [(s["student"], list(s["jobs"]), str(s["day"])[:10]) for s in entries.get("sends", [])]
+        scrapes = [(dict(s["stats"]), str(s["day"])[:10]) for s in entries.get("scrapes", [])]
+        self.record_jobs(entries.get("jobs", []))
+        for student, jobs, day in sends:
+            self.record_send(student, jobs, day=day)
+        for stats, day in scrapes:
+            self.record_scrape(stats, day=day)
+
+    def push(self, session, secret=None):
+        """POST what was recorded since the last push to push_url. Returns how many records went."""
+        with self._lock:
+            entries, self._outgoing = self._outgoing, {"jobs": [], "sends": [], "scrapes": []}
+        count = sum(map(len, entries.values()))
+        if not self.push_url or not count:
+            return 0
+        try:
+            push_entries(self.push_url, entries, session, secret)
+        except Exception:
+            with self._lock:  # keep them for the next push
+                for kind, items in entries.items():
+                    self._outgoing[kind][:0] = items
+            raise
+        return count
+
+    def refresh(self, batch=REFRESH_BATCH):
+        """Fold clicks stored since the last refresh into the rollups. Returns how many were added."""
+        if not os.path.exists(self.clicks_path):
+            return 0
+        added = 0
+        with self._lock, closing(self.connect()) as conn, \
+                closing(sqlite3.connect(f"file:{self.clicks_path}?mode=ro", uri=True, timeout=30)) as clicks:
+            while True:
+                row = conn.execute("SELECT value FROM watermarks WHERE name = 'clicks'").fetchone()
+                last = row[0] if row else 0
+                rows = clicks.execute(
+                    "SELECT id, clicked_at, email, link, job_id FROM clicks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, batch)).fetchall()
+                if not rows:
+                    return added
+                with conn:
+                    self._fold(conn, rows)
+                    conn.execute("INSERT OR REPLACE INTO watermarks (name, value) VALUES ('clicks', ?)",
+                                 (rows[-1][0],))
+                added += len(rows)
+
+    def _fold(self, conn, rows):
+        # clicks from ?email=&link= links carry no job id: match the link to a sent job
+        keys = {r[3]: link_key(r[3]) for r in rows if r[4] is None and r[3]}
+        by_link = {}
+        for lk in set(keys.values()):
+            hit = conn.execute("SELECT job_id FROM jobs WHERE link_key = ? ORDER BY job_id DESC LIMIT 1",
+                               (lk,)).fetchone()
+            if hit:
+                by_link[lk] = hit[0]
+
+        students, jobs = Counter(), Counter()
+        events = []
+        for _, clicked_at, email, link, job_id in rows:
+            day = (clicked_at or _today())[:10]
+            student = (email or "").strip().lower()
+            if job_id is None and link:
+                job_id = by_link.get(keys[link])
+            events.append((day, student, job_id))
+            students[day, student] += 1
+            if job_id is not None:
+                jobs[day, job_id] += 1
+
+        # first clicks: (student, job) pairs not clicked in any earlier batch or earlier in this one
+        job_ids = list({j for _, j in jobs})
+        seen = set()
+        for i in range(0, len(job_ids), 500):
+            chunk = job_ids[i:i + 500]
+            seen.update(conn.execute(
+                f"SELECT student, job_id FROM clicked_pairs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk))
+        first = Counter()
+        for day, student, job_id in events:
+            if student and job_id is not None and (student, job_id) not in seen:
+                seen.add((student, job_id))
+                first[day, student, job_id] += 1
+        conn.executemany("INSERT OR IGNORE INTO clicked_pairs (job_id, student) VALUES (?, ?)",
+                         [(j, s) for _, s, j in first])
+
+        source_of = {}
+        for i in range(0, len(job_ids), 500):
+            chunk = job_ids[i:i + 500]
+            source_of.update(conn.execute(
+                f"SELECT job_id, source FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk))
+        sources, source_first, student_first, job_first = Counter(), Counter(), Counter(), Counter()
+        for day, _, job_id in events:
+            sources[day, source_of.get(job_id, UNKNOWN_SOURCE)] += 1
+        for (day, student, job_id), n in first.items():
+            source_first[day, source_of.get(job_id, UNKNOWN_SOURCE)] += n
+            student_first[day, student] += n
+            job_first[day, job_id] += n
+
+        _bump(conn, "daily_students", [(d, s, 0, n, student_first[d, s]) for (d, s), n in students.items()])
+        _bump(conn, "daily_jobs", [(d, j, 0, n, job_first[d, j]) for (d, j), n in jobs.items()])
+        _bump(conn, "daily_sources", [(d, s, 0, n, source_first[d, s]) for (d, s), n in sources.items()])
+
+    def report(self, by="source", since=None, until=None, limit=None, refresh=True):
+        """
+        CTR rows grouped by "student", "job", "source" or "day" over
+        [since, until] (ISO dates, inclusive), highest CTR first (by day:
+        newest first).
+        """
+        if refresh:
+            self.refresh()
+        since, until = since or "0000-00-00", until or "9999-99-99"
+        if by == "day":
+            sql = ("SELECT day, SUM(sends), SUM(clicks), SUM(clicked) FROM daily_sources "
+                   "WHERE day BETWEEN ? AND ? GROUP BY day ORDER BY day DESC")
+        elif by == "student":
+            sql = ("SELECT student, SUM(sends), SUM(clicks), SUM(clicked) FROM daily_students "
+                   "WHERE day BETWEEN ? AND ? GROUP BY student")
+        elif by == "job":
+            sql = ("SELECT d.job_id, SUM(d.sends), SUM(d.clicks), SUM(d.clicked), j.title, j.company, j.source "
+                   "FROM daily_jobs d LEFT JOIN jobs j USING (job_id) "
+                   "WHERE d.day BETWEEN ? AND ? GROUP BY d.job_id")
+        elif by == "source":
+            sql = ("SELECT source, SUM(sends), SUM(clicks), SUM(clicked), SUM(scrape_seconds), SUM(candidates) "
+                   "FROM daily_sources WHERE day BETWEEN ? AND ? GROUP BY source")
+        else:
+            raise ValueError(f"unknown grouping {by!r} (student, job, source or day)")
+
+        with closing(self.connect()) as conn:
+            rows = conn.execute(sql, (since, until)).fetchall()
+        out = []
+        for r in rows:
+            key, sends, clicks, clicked = r[:4]
+            row = {by: key, "sends": sends, "clicks": clicks, "clicked": clicked,
+                   "ctr": round(clicked / sends, 4) if sends else None}
+            if by == "job":
+                row.update(title=r[4], company=r[5], source=r[6])
+            elif by == "source":
+                row.update(scrape_seconds=round(r[4], 1), candidates=r[5],
+                           clicks_per_scrape_minute=round(clicked / (r[4] / 60), 2) if r[4] else None)
+            out.append(row)
+        if by != "day":
+            out.sort(key=lambda x: (x["ctr"] or 0, x["clicked"]), reverse=True)
+        return out[:limit] if limit else out
+
+
+def _print(rows, by):
+    if not rows:
+        print("📭 No data for this period")
+        return
+    print(f"📊 CTR by {by}")
+    for r in rows:
+        label = r[by] if by != "job" else f"{r['title']} — {r['company']} ({r['source']})"
+        ctr = f"{r['ctr'] * 100:5.1f}%" if r["ctr"] is not None else "    –"
+        line = f"  {str(label)[:60]:60s} {ctr}  {r['clicked']:5d}/{r['sends']:<5d} ({r['clicks']} clicks)"
+        if by == "source":
+            line += f"  scrape {r['scrape_seconds']:.0f}s"
+            if r["clicks_per_scrape_minute"] is not None:
+                line += f", {r['clicks_per_scrape_minute']:.2f} clicked/min"
+        print(line)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Click-through rates from the daily rollups")
+    ap.add_argument("by", nargs="?", default="source", choices=("student", "job", "source", "day"))
+    ap.add_argument("--since", help="first day (YYYY-MM-DD)")
+    ap.add_argument("--until", help="last day (YYYY-MM-DD)")
+    ap.add_argument("--limit", type=int)
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args(argv)
+
+    stats = Analytics()
+    added = stats.refresh()
+    rows = stats.report(args.by, args.since, args.until, args.limit, refresh=False)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print(f"🔄 {added} new clicks folded in ({datetime.now():%H:%M:%S})")
+        _print(rows, args.by)
+
+
+if __name__ == "__main__":
+    main()
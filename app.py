@@ -1,359 +1,352 @@
 # app.py
 import os
-import smtplib
 import time
-import re
+import threading
 import urllib.parse
-import pandas as pd
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import WebDriverException, NoSuchElementException, TimeoutException
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from scrape_engine import make_source, run_sources, current_source, source_setting
+import http_fetch
+import readiness
+from crawl_state import CrawlState, posting_key
+from job_store import JobStore
+import batch_filter
+import fixtures
+from browser_pool import BrowserPool, chrome_factory, chromedriver_path
+from digest import analytics, push_analytics, send_email
 
 # -------------------------
 # CONFIG / SETUP
 # -------------------------
-# Selenium/Chrome options suitable for GitHub Actions
-chrome_options = Options()
-chrome_options.add_argument("headless")
-chrome_options.add_argument("no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--window-size=1920,1080")
-# optional: avoid images to speed up
-chrome_prefs = {"profile.managed_default_content_settings.images": 2}
-chrome_options.add_experimental_option("prefs", chrome_prefs)
-
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-time.sleep(1)
+# Selenium/Chrome options suitable for GitHub Actions (built when the first browser starts)
+def chrome_options():
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.add_argument("headless")
+    options.add_argument("no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    # optional: avoid images to speed up
+    chrome_prefs = {"profile.managed_default_content_settings.images": 2}
+    options.add_experimental_option("prefs", chrome_prefs)
+    return options
+
+PAGE_LOAD_TIMEOUT = int(os.getenv("PAGE_LOAD_TIMEOUT", "60"))
+
+# Concurrency: each running source leases one Chrome instance from the pool
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "4"))
+SOURCE_TIMEOUT = int(os.getenv("SOURCE_TIMEOUT", "300"))
+# Upper bound for condition-based page readiness waits
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", "10"))
+# Why each candidate was accepted or rejected (JSON lines, rewritten every run)
+DECISION_LOG_PATH = os.getenv("FILTER_LOG_PATH", os.path.join("data", "filter_decisions.jsonl"))
+# Incremental crawl: history of seen postings, and the hard cap on table pages per run
+# (a fixture replay starts from an empty history of its own, never saved)
+crawl_state = CrawlState(fixtures.store.output_path("crawl_state.json")) if fixtures.store.replaying else CrawlState()
+# History of every job found (first_seen / last_seen per job)
+job_store = JobStore()
+MAX_TABLE_PAGES = int(os.getenv("MAX_TABLE_PAGES", "20"))
+# Restart a Chrome instance after this many page loads to cap its memory growth
+BROWSER_MAX_PAGE_LOADS = int(os.getenv("BROWSER_MAX_PAGE_LOADS", "40"))
+
+browser_pool = BrowserPool(
+    # chromedriver is only resolved when the first browser starts
+    chrome_factory(chrome_options, chromedriver_path, page_load_timeout=PAGE_LOAD_TIMEOUT),
+    size=SCRAPER_WORKERS,
+    max_page_loads=BROWSER_MAX_PAGE_LOADS,
+)
+
+_thread_state = threading.local()
+_source_drivers = {}  # source name -> leased driver (so a timed-out source can be killed)
+
+def get_driver():
+    """Return the browser leased by the current thread, leasing one from the pool on first use."""
+    drv = getattr(_thread_state, "driver", None)
+    if drv is None:
+        drv = browser_pool.acquire()
+        _thread_state.driver = drv
+        name = current_source()
+        if name:
+            _source_drivers[name] = drv
+    return drv
+
+def release_driver(source_name=None, broken=False):
+    """Give the current thread's browser back to the pool (quit it if broken)."""
+    drv = getattr(_thread_state, "driver", None)
+    _thread_state.driver = None
+    if source_name:
+        _source_drivers.pop(source_name, None)
+    if drv is not None:
+        browser_pool.release(drv, broken=broken)
+
+def kill_source_driver(source_name):
+    """Quit the browser of a hung source so its worker thread unblocks."""
+    drv = _source_drivers.pop(source_name, None)
+    if drv is not None:
+        browser_pool.recycle(drv)
+
+def open_url(url):
+    """driver.get on the current thread's browser, swapping it out first if it is worn out."""
+    from selenium.common.exceptions import WebDriverException
+    if fixtures.store.replaying:
+        html = fixtures.store.load(url)
+        if html is None:
+            raise WebDriverException(f"no recorded page for {url}")
+        return fixtures.ReplayDriver(url, html)
+    drv = get_driver()
+    if browser_pool.is_worn_out(drv):
+        release_driver(current_source())
+        drv = get_driver()
+    try:
+        drv.get(url)
+    except WebDriverException:
+        if not browser_pool.is_alive(drv):
+            # Chrome crashed: drop it so the next page gets a fresh instance
+            release_driver(current_source(), broken=True)
+        raise
+    browser_pool.record_page_load(drv)
+    return drv
 
 # -------------------------
-# FILTERS
+# HELPERS: safety + scrolling + parsing
 # -------------------------
-EXCLUDE_KEYWORDS = [
-    "php","laravel","wordpress","drupal",".net","c#","java","spring","hibernate",
-    "senior","lead","manager","architect","director","principal","vp","head",
-    "3 year","3 years","4 year","4 years","5 year","5 years","5+","6 year","6 years"
-]
-EXCLUDE_LOWER = [e.lower() for e in EXCLUDE_KEYWORDS]
+_fetch_counts = {"static": 0, "unchanged": 0, "fallback": 0, "browser": 0}
+_fetch_counts_lock = threading.Lock()
 
-PREFER_TERMS = [
-    "fresher","freshers","intern","internship","trainee","entry level",
-    "0-1","0 - 1","0-2","0 - 2","0 to 2","1 year","below 2","junior"
-]
-PREFER_LOWER = [p.lower() for p in PREFER_TERMS]
-
-INCLUDE_TERMS = [
-    "python","django","flask","fastapi","react","angular","vue","javascript","typescript",
-    "full stack","backend","frontend","web developer","backend developer",
-    "machine learning","ml","ai","artificial intelligence","deep learning",
-    "data science","data scientist","data analyst","analytics","business intelligence",
-    "power bi","tableau","excel","sql","dashboard","bi developer","data engineer",
-    "nlp","llm","pandas","numpy","scikit-learn","tensorflow","pytorch","rest api","Data Analyst","Junior Data Analyst","Senior Data Analyst","Business Data Analyst",
-"Business Analyst","Reporting Analyst","Data Reporting Analyst","Operations Analyst","Product Analyst","Marketing Analyst","Financial Analyst","BI Analyst / Business Intelligence Analyst","Data Quality Analyst","Data Visualization Analyst",
-"Quantitative Analyst / Quant Analyst","Statistical Analyst","Data Science Analyst","Insights Analyst","Data Operations Analyst","Risk Analyst","Fraud Analyst","Workforce Analyst"
-"Revenue Analyst","Research Analyst","Analytics Specialist","Decision Support Analyst","flutter",
-    "dart",
-    "flutter developer",
-    "mobile developer",
-    "android developer",
-    "ios developer",
-    "cross platform developer",
-    "mobile app developer",
-
-    # Flutter frameworks / tools
-    "flutter bloc",
-    "bloc pattern",
-    "provider",
-    "riverpod",
-    "getx",
-    "flutter mobx",
-    "flutter cubit",
-    "flutter hooks",
-    "clean architecture flutter",
-
-    # Backend API integration (common in Flutter roles)
-    "rest api",
-    "graphql",
-    "firebase",
-    "supabase",
-    "appwrite",
-    "backend integration",
-
-    # Database keywords
-    "sqlite",
-    "hive",
-    "moor",
-    "isar",
-    "shared preferences",
-
-    # UI / UX keywords used in job posts
-    "ui design",
-    "ux",
-    "material design",
-    "responsive ui",
-    "widget development",
-    "state management",
-
-    # Extra skills often expected
-    "git",
-    "github",
-    "devops",
-    "ci cd",
-    "play store",
-    "app store",
-    "deployment",
-    "version control",
-
-    # Cloud integrations common in Flutter jobs
-    "aws",
-    "gcp",
-    "google cloud",
-    "azure",
-    "cloud functions",
-
-    # Testing
-    "unit testing",
-    "integration testing",
-    "flutter test",
-    "widget testing",
-
-    # Other frontend/mobile tech often listed in job descriptions
-    "react native",
-    "kotlin",
-    "swift",
-    "java android",
-    "objective c",
+def _count_fetch(kind):
+    with _fetch_counts_lock:
+        _fetch_counts[kind] += 1
 
-]
-
-# Regex to detect high experience mentions (to be excluded)
-HIGH_EXPERIENCE_RE = re.compile(r"\b([3-9]|[1-9]\d)\+?\s*(year|years|yrs|yr)\b", flags=re.IGNORECASE)
-
-# -------------------------
-# HELPERS: safety + scrolling + parsing
-# -------------------------
-def safe_get(url, wait_after=1.0):
+def static_page(url):
+    """Fetch a page over plain HTTP (no JavaScript) through the response cache; None on failure."""
+    if fixtures.store.replaying:
+        return fixtures.store.page(url)
+    try:
+        page = http_fetch.fetch_page(url, ttl=source_setting("cache_ttl", 0))
+    except Exception as e:
+        print(f"⚠️ Static fetch failed for {url}: {e}")
+        return None
+    if fixtures.store.recording:
+        fixtures.store.save(url, page.text, current_source(), via="http")
+    return page
+
+def page_soup(driver, url):
+    """BeautifulSoup of the page the browser has loaded for url (saved as a fixture when recording)."""
+    html = driver.page_source
+    if fixtures.store.recording:
+        fixtures.store.save(url, html, current_source(), via="browser")
+    return BeautifulSoup(html, "html.parser")
+
+def _usable(soup):
+    """A static response is trusted only if it has the content the source expects."""
+    expect = source_setting("expect")
+    return not expect or soup.select_one(expect) is not None
+
+def browser_get(url, wait_after=1.0):
     """Open URL with driver.get — return BeautifulSoup or None on failure."""
+    from selenium.common.exceptions import WebDriverException
     try:
-        driver.get(url)
-        time.sleep(wait_after)
-        return BeautifulSoup(driver.page_source, "html.parser")
+        driver = open_url(url)
+        wait_ready(driver, fixed=wait_after)
+        return page_soup(driver, url)
     except WebDriverException as e:
         print(f"⚠️ Could not load {url}: {e}")
         return None
 
-def scroll_page(pause=0.5, scrolls=6):
-    """Scroll the page to trigger lazy loading (Selenium context)."""
-    try:
-        for _ in range(scrolls):
-            driver.execute_script("window.scrollBy(0, document.body.scrollHeight);")
-            time.sleep(pause)
-    except Exception:
-        pass
-
-def text_clean(s):
-    return (s or "").strip()
-
-def looks_relevant(title, snippet=""):
-    text = f"{title} {snippet}".lower()
-
-    # exclude if explicit exclude tokens present
-    if any(ex in text for ex in EXCLUDE_LOWER):
-        return False
-
-    # must contain at least one include term
-    if not any(term in text for term in INCLUDE_TERMS):
-        return False
-
-    # explicit high experience -> exclude
-    if re.search(HIGH_EXPERIENCE_RE, text):
-        return False
+def safe_get(url, wait_after=1.0):
+    """
+    Return BeautifulSoup for url, or None on failure. Sources declared with
+    mode="static" try plain HTTP first and only fall back to driver.get when
+    the response lacks the content the source expects.
+    """
+    if source_setting("mode") == "static":
+        page = static_page(url)
+        if page is not None:
+            soup = BeautifulSoup(page.text, "html.parser")
+            if _usable(soup):
+                _count_fetch("static")
+                return soup
+        _count_fetch("fallback")
+    else:
+        _count_fetch("browser")
+    return browser_get(url, wait_after)
 
-    # exclude managerial words
-    if re.search(r"\b(senior|lead|manager|director|principal|head|vp)\b", text):
-        return False
+def scrape_page(url, parse, wait_after=1.0, postings=None):
+    """
+    Fetch url and return parse(soup, url), a list of candidates ([] on failure).
+    For static sources, a page whose body is unchanged since the last run is
+    not parsed again: the candidates parsed from it last time are reused.
 
-    # prefer fresher/trainee terms but not mandatory
-    if any(p in text for p in PREFER_LOWER):
+    `postings` is the list the parser appends every posting key on the page
+    to (relevant or not); it is filled from the cache for unchanged pages too.
+    """
+    if source_setting("mode") != "static":
+        _count_fetch("browser")
+        soup = browser_get(url, wait_after)
+        return parse(soup, url) if soup else []
+
+    page = static_page(url)
+    if page is not None:
+        key = f"candidates:{current_source()}"
+        if page.unchanged:
+            memo = http_fetch.cache.recall(url, page.body_hash, key)
+            if memo is not None:
+                _count_fetch("unchanged")
+                if postings is not None:
+                    postings.extend(memo["postings"])
+                return memo["jobs"]
+        soup = BeautifulSoup(page.text, "html.parser")
+        if _usable(soup):
+            _count_fetch("static")
+            jobs = parse(soup, url)
+            http_fetch.cache.remember(url, page.body_hash, key,
+                                      {"jobs": jobs, "postings": list(postings or [])})
+            return jobs
+    _count_fetch("fallback")
+    soup = browser_get(url, wait_after)
+    return parse(soup, url) if soup else []
+
+DEFAULT_READY = readiness.dom_stable(quiet=0.5)
+
+def wait_ready(driver, fixed=1.0):
+    """
+    Wait until the current source's page is loaded (its declared `ready`
+    condition, or a settled DOM), capped at READY_TIMEOUT. `fixed` is the
+    sleep this replaces and only feeds the time-saved report.
+    """
+    if fixtures.store.replaying:
         return True
+    return readiness.wait_until(driver, source_setting("ready", DEFAULT_READY),
+                                timeout=READY_TIMEOUT, fixed=fixed)
 
-    # otherwise accept general relevant roles (non-senior)
-    return True
-
-def normalize_job(job):
-    return {
-        "title": text_clean(job.get("title","")),
-        "company": text_clean(job.get("company","")),
-        "link": text_clean(job.get("link",""))
-    }
-
-def dedupe_jobs(jobs):
-    seen = set()
-    unique = []
-    for j in jobs:
-        key = (j.get("title","").lower(), j.get("company","").lower())
-        if key not in seen:
-            seen.add(key)
-            unique.append(j)
-    return unique
+def scroll_page(pause=0.5, scrolls=6):
+    """Scroll the page to trigger lazy loading, stopping once no new cards appear (Selenium context)."""
+    if fixtures.store.replaying:
+        return
+    try:
+        driver = get_driver()
+        readiness.scroll_until_stable(driver, source_setting("cards"), max_scrolls=scrolls, settle=pause)
+    except Exception:
+        pass
 
 # -------------------------
 # SITE-SPECIFIC SCRAPERS
 # Note: Many sites change UI frequently. These are robust, best-effort scrapers.
+# Scrapers only collect raw candidates {title, company, link, snippet}; the
+# relevance filter runs once over all of them in batch_filter.
 # -------------------------
 
-# 1) Infopark (Kerala)
-def fetch_infopark_jobs(pages=5):
+# Shared page parsers: parse(soup, url) -> list of candidates
+def parse_job_table(soup, url, company, postings=None):
+    """
+    IT-park job-search tables: Sl.No | Title | Company | ... (falls back to job
+    anchors). Every row's posting key is appended to `postings` when given.
+    """
     jobs = []
-    for page in range(1, pages+1):
-        url = f"https://infopark.in/companies/job-search?page={page}"
-        soup = safe_get(url, wait_after=1.2)
-        if not soup:
+    rows = soup.select("table tr")
+    if not rows or len(rows) < 2:
+        return parse_job_anchors(soup, url, company)
+    for row in rows[1:]:
+        cols = row.find_all("td")
+        if len(cols) < 3:
             continue
-        rows = soup.select("table tr")
-        if not rows:
-            # fallback: anchors
-            anchors = soup.find_all("a", href=True)
-            for a in anchors:
-                t = a.get_text(strip=True)
-                if looks_relevant(t):
-                    link = a['href']
-                    if not link.startswith("http"):
-                        link = urllib.parse.urljoin(url, link)
-                    jobs.append({"title": t, "company": "Infopark", "link": link})
-            continue
-        for row in rows[1:]:
-            cols = row.find_all("td")
-            if len(cols) < 3:
-                continue
-            title = cols[1].get_text(strip=True)
-            company = cols[2].get_text(strip=True)
-            a = row.find("a", href=True)
-            link = a["href"] if a else ""
-            if link and not link.startswith("http"):
-                link = urllib.parse.urljoin(url, link)
-            if looks_relevant(title):
-                jobs.append({"title": title, "company": company or "Infopark", "link": link})
+        title = cols[1].get_text(strip=True)
+        row_company = cols[2].get_text(strip=True)
+        a = row.find("a", href=True)
+        link = a["href"] if a else ""
+        if link and not link.startswith("http"):
+            link = urllib.parse.urljoin(url, link)
+        if postings is not None:
+            postings.append(posting_key(title, row_company, link))
+        jobs.append({"title": title, "company": row_company or company, "link": link})
     return jobs
 
-# 2) Technopark (Kerala)
-def fetch_technopark_jobs(pages=5):
+def parse_job_anchors(soup, url, company, selector=None, fallback_all=True):
+    """Careers pages: anchors/cards matching selector (or every link on the page)."""
     jobs = []
-    for page in range(1, pages+1):
-        url = f"https://technopark.in/job-search?page={page}"
-        soup = safe_get(url, wait_after=1.2)
-        if not soup:
-            continue
-        rows = soup.select("table tr")
-        if rows and len(rows) > 1:
-            for row in rows[1:]:
-                cols = row.find_all("td")
-                if len(cols) < 3:
-                    continue
-                title = cols[1].get_text(strip=True)
-                company = cols[2].get_text(strip=True)
-                a = row.find("a", href=True)
-                link = a["href"] if a else ""
-                if link and not link.startswith("http"):
-                    link = urllib.parse.urljoin(url, link)
-                if looks_relevant(title):
-                    jobs.append({"title": title, "company": company or "Technopark", "link": link})
-        else:
-            # fallback: find possible job tiles
-            anchors = soup.find_all("a", href=True)
-            for a in anchors:
-                t = a.get_text(strip=True)
-                if looks_relevant(t):
-                    link = a['href']
-                    if link and not link.startswith("http"):
-                        link = urllib.parse.urljoin(url, link)
-                    jobs.append({"title": t, "company": "Technopark", "link": link})
-    return jobs
-
-# 3) Cyberpark (Kozhikode)
-def fetch_cyberpark_jobs():
-    jobs = []
-    url = "https://cyberparks.in/careers"
-    soup = safe_get(url, wait_after=1.2)
-    if not soup:
-        return jobs
-    # find likely anchors/cards
-    anchors = soup.select("a[href*='job'], a[href*='career'], .job, .career, .vacancy, .job-card")
-    if not anchors:
+    anchors = soup.select(selector) if selector else []
+    if not anchors and (fallback_all or not selector):
         anchors = soup.find_all("a", href=True)
     for a in anchors:
         t = a.get_text(strip=True)
         if not t:
             continue
-        link = a['href']
+        link = a.get("href", "")
         if link and not link.startswith("http"):
             link = urllib.parse.urljoin(url, link)
-        if looks_relevant(t):
-            jobs.append({"title": t, "company": "Cyberpark", "link": link})
+        jobs.append({"title": t, "company": company, "link": link})
     return jobs
 
-# 4) SmartCity Kochi
-def fetch_smartcity_jobs():
+# Incremental pagination for the IT-park job-search tables
+# Sources whose crawl stopped early this run (their unread pages still count as listed)
+stopped_early = set()
+
+def crawl_job_table(url_fmt, company, pages=6, max_pages=MAX_TABLE_PAGES):
+    """
+    Walk url_fmt.format(page=n) pages. With crawl history, stop at the first
+    page whose postings were all seen in earlier runs, and keep going past
+    `pages` (up to max_pages) while every posting on a page is new. Without
+    history (first run) exactly `pages` pages are read, as before.
+    """
+    source = current_source() or company
+    known = crawl_state.known(source)
+    seen = []
     jobs = []
-    url = "https://smartcitykochi.in/careers"
-    soup = safe_get(url, wait_after=1.2)
-    if not soup:
-        return jobs
-    anchors = soup.select("a[href*='job'], a[href*='career'], .vacancy, .career-item, .job-card")
-    if not anchors:
-        anchors = soup.find_all("a", href=True)
-    for a in anchors:
-        t = a.get_text(strip=True)
-        if not t: continue
-        link = a['href']
-        if link and not link.startswith("http"):
-            link = urllib.parse.urljoin(url, link)
-        if looks_relevant(t):
-            jobs.append({"title": t, "company": "SmartCity Kochi", "link": link})
+    for page in range(1, max_pages + 1):
+        if not known and page > pages:
+            break
+        url = url_fmt.format(page=page)
+        postings = []
+        jobs += scrape_page(url, lambda soup, u: parse_job_table(soup, u, company, postings),
+                            wait_after=1.2, postings=postings)
+        seen += postings
+        if not postings:
+            break  # past the last page
+        new = [p for p in postings if p not in known]
+        if known and not new:
+            print(f"⏹️ {source}: page {page} has only known postings — stopping")
+            stopped_early.add(source)
+            break
+        if page >= pages and len(new) < len(postings):
+            break
+    crawl_state.update(source, seen)
     return jobs
 
+# 1) Infopark (Kerala)
+def fetch_infopark_jobs(pages=5):
+    return crawl_job_table("https://infopark.in/companies/job-search?page={page}", "Infopark", pages=pages)
+
+# 2) Technopark (Kerala)
+def fetch_technopark_jobs(pages=5):
+    return crawl_job_table("https://technopark.in/job-search?page={page}", "Technopark", pages=pages)
+
+# 3) Cyberpark (Kozhikode)
+def fetch_cyberpark_jobs():
+    # find likely anchors/cards
+    selector = "a[href*='job'], a[href*='career'], .job, .career, .vacancy, .job-card"
+    return scrape_page("https://cyberparks.in/careers",
+                       lambda soup, u: parse_job_anchors(soup, u, "Cyberpark", selector), wait_after=1.2)
+
+# 4) SmartCity Kochi
+def fetch_smartcity_jobs():
+    selector = "a[href*='job'], a[href*='career'], .vacancy, .career-item, .job-card"
+    return scrape_page("https://smartcitykochi.in/careers",
+                       lambda soup, u: parse_job_anchors(soup, u, "SmartCity Kochi", selector), wait_after=1.2)
+
 # 5) TIDEL Park (Chennai)
 def fetch_tidelpark_jobs():
-    jobs = []
-    url = "https://www.tidelpark.com/careers"
-    soup = safe_get(url, wait_after=1.2)
-    if not soup:
-        return jobs
-    anchors = soup.select("a[href*='career'], a[href*='job'], .career, .vacancy")
-    for a in anchors:
-        t = a.get_text(strip=True)
-        if not t: continue
-        link = a['href']
-        if link and not link.startswith("http"):
-            link = urllib.parse.urljoin(url, link)
-        if looks_relevant(t):
-            jobs.append({"title": t, "company": "TIDEL Park Chennai", "link": link})
-    return jobs
+    selector = "a[href*='career'], a[href*='job'], .career, .vacancy"
+    return scrape_page("https://www.tidelpark.com/careers",
+                       lambda soup, u: parse_job_anchors(soup, u, "TIDEL Park Chennai", selector, fallback_all=False),
+                       wait_after=1.2)
 
 # 6) STPI (India)
 def fetch_stpi_jobs():
-    jobs = []
-    url = "https://www.stpi.in/career"
-    soup = safe_get(url, wait_after=1.2)
-    if not soup:
-        return jobs
-    anchors = soup.select("a[href*='career'], a[href*='job'], .vacancy, .career")
-    for a in anchors:
-        t = a.get_text(strip=True)
-        if not t: continue
-        link = a['href']
-        if link and not link.startswith("http"):
-            link = urllib.parse.urljoin(url, link)
-        if looks_relevant(t):
-            jobs.append({"title": t, "company": "STPI India", "link": link})
-    return jobs
+    selector = "a[href*='career'], a[href*='job'], .vacancy, .career"
+    return scrape_page("https://www.stpi.in/career",
+                       lambda soup, u: parse_job_anchors(soup, u, "STPI India", selector, fallback_all=False),
+                       wait_after=1.2)
 
 # 7) Bengaluru parks — generic approach: Manyata / ITPB / Embassy / Ecospace (public pages vary)
 def fetch_bengaluru_generic(url):
@@ -375,11 +368,10 @@ def fetch_bengaluru_generic(url):
             for a2 in s2.find_all("a", href=True):
                 t2 = a2.get_text(strip=True)
                 if not t2: continue
-                if looks_relevant(t2):
-                    link2 = a2['href']
-                    if not link2.startswith("http"):
-                        link2 = urllib.parse.urljoin(link, link2)
-                    jobs.append({"title": t2, "company": url.split("//")[-1].split("/")[0], "link": link2})
+                link2 = a2['href']
+                if not link2.startswith("http"):
+                    link2 = urllib.parse.urljoin(link, link2)
+                jobs.append({"title": t2, "company": url.split("//")[-1].split("/")[0], "link": link2})
     return jobs
 
 # 8) Indeed (India) — search-based
@@ -392,10 +384,10 @@ def fetch_indeed_jobs(query_terms=None, pages=3):
         start = page * 10
         url = f"https://www.indeed.co.in/jobs?q={base_query}&l=India&start={start}"
         try:
-            driver.get(url)
-            time.sleep(2)
+            driver = open_url(url)
+            wait_ready(driver, fixed=2)
             scroll_page(pause=0.7, scrolls=5)
-            soup = BeautifulSoup(driver.page_source, "html.parser")
+            soup = page_soup(driver, url)
             cards = soup.select("a[data-jk], .job_seen_beacon, .result")
             if not cards:
                 cards = soup.select("a[href*='/rc/clk']")
@@ -423,8 +415,8 @@ def fetch_indeed_jobs(query_terms=None, pages=3):
                         link = urllib.parse.urljoin(url, link)
                 if not title:
                     title = c.get_text(strip=True)[:120]
-                if looks_relevant(title, company):
-                    jobs.append({"title": title, "company": company or "Indeed", "link": link})
+                # the company text doubles as the snippet the filter reads
+                jobs.append({"title": title, "company": company or "Indeed", "link": link, "snippet": company})
         except Exception as e:
             print(f"⚠️ Indeed fetch error page {page}: {e}")
             continue
@@ -439,10 +431,10 @@ def fetch_naukri_jobs(query_terms=None, pages=3):
     for page in range(1, pages+1):
         url = f"https://www.naukri.com/{base_query}-jobs-{page}"
         try:
-            driver.get(url)
-            time.sleep(2)
+            driver = open_url(url)
+            wait_ready(driver, fixed=2)
             scroll_page(pause=0.7, scrolls=4)
-            soup = BeautifulSoup(driver.page_source, "html.parser")
+            soup = page_soup(driver, url)
             cards = soup.select(".jobTuple, .jobTuple .title, .jobCard, .list")
             if not cards:
                 cards = soup.find_all("a", href=True)
@@ -459,8 +451,8 @@ def fetch_naukri_jobs(query_terms=None, pages=3):
                     link = c["href"]
                 if link and not link.startswith("http"):
                     link = urllib.parse.urljoin(url, link)
-                if looks_relevant(title, company):
-                    jobs.append({"title": title, "company": company or "Naukri", "link": link})
+                # the company text doubles as the snippet the filter reads
+                jobs.append({"title": title, "company": company or "Naukri", "link": link, "snippet": company})
         except Exception as e:
             print(f"⚠️ Naukri fetch error page {page}: {e}")
             continue
@@ -481,10 +473,10 @@ def fetch_linkedin_jobs(query_terms=None, pages=2):
         start = page * 25
         url = f"https://www.linkedin.com/jobs/search?keywords={q}&location=India&start={start}"
         try:
-            driver.get(url)
-            time.sleep(2.0)
+            driver = open_url(url)
+            wait_ready(driver, fixed=2.0)
             scroll_page(pause=0.7, scrolls=6)
-            soup = BeautifulSoup(driver.page_source, "html.parser")
+            soup = page_soup(driver, url)
             cards = soup.select(".result-card__contents, .jobs-search-results__list-item, .base-search-card__info")
             for c in cards:
                 title_el = c.select_one("h3, .base-search-card__title")
@@ -495,8 +487,8 @@ def fetch_linkedin_jobs(query_terms=None, pages=2):
                 link = link_el["href"] if link_el and link_el.has_attr("href") else ""
                 if link and not link.startswith("http"):
                     link = urllib.parse.urljoin(url, link)
-                if looks_relevant(title, company):
-                    jobs.append({"title": title, "company": company or "LinkedIn", "link": link})
+                # the company text doubles as the snippet the filter reads
+                jobs.append({"title": title, "company": company or "LinkedIn", "link": link, "snippet": company})
         except Exception as e:
             print(f"⚠️ LinkedIn fetch error (may be blocked): {e}")
             break
@@ -505,143 +497,99 @@ def fetch_linkedin_jobs(query_terms=None, pages=2):
 # -------------------------
 # MASTER FETCH (All sources)
 # -------------------------
-def fetch_all_jobs():
-    all_jobs = []
-    print("🌀 Starting multi-source scraping...")
-
-    # Kerala parks
-    all_jobs += fetch_infopark_jobs(pages=6)
-    all_jobs += fetch_technopark_jobs(pages=6)
-    all_jobs += fetch_cyberpark_jobs()
-    all_jobs += fetch_smartcity_jobs()
-
-    # Major hubs
-    all_jobs += fetch_tidelpark_jobs()
-    all_jobs += fetch_stpi_jobs()
-
+BENGALURU_URLS = [
+    # Replace/extend with actual hub pages you want to target
+    "https://manyata.com",      # placeholder/fallback
+    "https://itpbengaluru.org", # placeholder
+    "https://www.embassymanyata.com"  # placeholder
+]
+# A static careers page is only trusted if it already links to job/career pages
+CAREER_ANCHORS = "a[href*='job'], a[href*='career'], a[href*='vacanc']"
+INDEED_CARDS = "a[data-jk], .job_seen_beacon, .result"
+NAUKRI_CARDS = ".jobTuple, .jobCard, .srp-jobtuple-wrapper"
+LINKEDIN_CARDS = ".base-search-card__info, .jobs-search-results__list-item, .result-card__contents"
+PORTAL_QUERY = ["python", "data analyst", "data scientist", "machine learning", "react"]
+
+def build_sources():
+    """Every scraping task run by fetch_all_jobs, in merge order."""
+    sources = [
+        # Kerala parks (server-rendered: plain HTTP first, Chrome only as a fallback)
+        # cache_ttl: serve the cached copy without any request while younger than this
+        make_source("Infopark", fetch_infopark_jobs, mode="static", expect="table tr td",
+                    cache_ttl=6 * 3600, pages=6),
+        make_source("Technopark", fetch_technopark_jobs, mode="static", expect="table tr td",
+                    cache_ttl=6 * 3600, pages=6),
+        make_source("Cyberpark", fetch_cyberpark_jobs, mode="static", expect=CAREER_ANCHORS, cache_ttl=20 * 3600),
+        make_source("SmartCity Kochi", fetch_smartcity_jobs, mode="static", expect=CAREER_ANCHORS,
+                    cache_ttl=20 * 3600),
+        # Major hubs
+        make_source("TIDEL Park", fetch_tidelpark_jobs, mode="static", expect=CAREER_ANCHORS, cache_ttl=20 * 3600),
+        make_source("STPI", fetch_stpi_jobs, mode="static", expect=CAREER_ANCHORS, cache_ttl=20 * 3600),
+    ]
     # Bangalore—attempts using known resource pages (Manyata/ITPB/Ecospace may not host centralized job lists)
-    bgl_urls = [
-        # Replace/extend with actual hub pages you want to target
-        "https://manyata.com",      # placeholder/fallback
-        "https://itpbengaluru.org", # placeholder
-        "https://www.embassymanyata.com"  # placeholder
+    for u in BENGALURU_URLS:
+        host = u.split("//")[-1].split("/")[0]
+        sources.append(make_source(f"Bengaluru ({host})", fetch_bengaluru_generic, url=u))
+    # Big job portals (search-based); LinkedIn is best-effort
+    # Portals render with JavaScript: ready once the first result cards exist
+    sources += [
+        make_source("Indeed", fetch_indeed_jobs, cards=INDEED_CARDS,
+                    ready=readiness.any_of(readiness.selector_count(INDEED_CARDS, 5), readiness.network_idle()),
+                    query_terms=PORTAL_QUERY, pages=4),
+        make_source("Naukri", fetch_naukri_jobs, cards=NAUKRI_CARDS,
+                    ready=readiness.any_of(readiness.selector_count(NAUKRI_CARDS, 5), readiness.network_idle()),
+                    query_terms=PORTAL_QUERY, pages=3),
+        make_source("LinkedIn", fetch_linkedin_jobs, cards=LINKEDIN_CARDS,
+                    ready=readiness.any_of(readiness.selector_count(LINKEDIN_CARDS, 5), readiness.network_idle()),
+                    query_terms=PORTAL_QUERY, pages=1),
     ]
-    for u in bgl_urls:
-        try:
-            all_jobs += fetch_bengaluru_generic(u)
-        except Exception as e:
-            print(f"⚠️ Bangalore generic fetch failed for {u}: {e}")
-
-    # Big job portals (search-based)
-    all_jobs += fetch_indeed_jobs(query_terms=["python", "data analyst", "data scientist", "machine learning", "react"], pages=4)
-    all_jobs += fetch_naukri_jobs(query_terms=["python", "data analyst", "data scientist", "machine learning", "react"], pages=3)
-    # LinkedIn best-effort
-    all_jobs += fetch_linkedin_jobs(query_terms=["python", "data analyst", "data scientist", "machine learning", "react"], pages=1)
+    return sources
 
-    # Normalize and dedupe
-    all_jobs = [normalize_job(j) for j in all_jobs if j.get("title")]
-    all_jobs = dedupe_jobs(all_jobs)
+def fetch_all_jobs(max_workers=None):
+    print("🌀 Starting multi-source scraping...")
+    run_started = datetime.now().isoformat(timespec="seconds")
+    started = time.monotonic()
+    candidates, stats = run_sources(
+        build_sources(),
+        max_workers=max_workers or SCRAPER_WORKERS,
+        default_timeout=SOURCE_TIMEOUT,
+        after_task=release_driver,
+        on_timeout=kill_source_driver,
+    )
+    print(f"⏱️ Sources finished in {time.monotonic() - started:.1f}s "
+          f"(sequential total would be ~{sum(st['seconds'] for st in stats.values()):.1f}s)")
+    print(readiness.report())
+    replay = fixtures.store.replaying
+    if not replay:
+        # per-source scrape time, next to the CTR reports (digest.analytics)
+        analytics.record_scrape(stats)
+        push_analytics()
+    print(f"⚡ Pages via plain HTTP: {_fetch_counts['static']} parsed, {_fetch_counts['unchanged']} unchanged, "
+          f"browser fallbacks: {_fetch_counts['fallback']}, browser-only: {_fetch_counts['browser']}")
+    print(http_fetch.cache.report())
+    if fixtures.store.report():
+        print(fixtures.store.report())
+    if not replay:
+        crawl_state.save()
+
+    # Filter, normalize and dedupe every candidate in one batch
+    raw_path, log_path = batch_filter.RAW_CANDIDATES_PATH, DECISION_LOG_PATH
+    if replay:
+        raw_path = fixtures.store.output_path(os.path.basename(raw_path))
+        log_path = fixtures.store.output_path(os.path.basename(log_path))
+    batch = batch_filter.to_frame(candidates)
+    batch_filter.save_candidates(batch, raw_path)
+    all_jobs, classified = batch_filter.filter_candidates(batch)
+    batch_filter.save_decisions(classified, log_path)
+    print(f"📝 {len(batch)} raw candidates saved to {raw_path}, decisions written to {log_path}")
     print(f"✅ Scraping complete — unique jobs found: {len(all_jobs)}")
-    return all_jobs
-
-# -------------------------
-# EMAIL (unchanged; preserve your original styling & env usage)
-# -------------------------
-def send_email(jobs):
-    sender = os.getenv("EMAIL_USER")
-    password = os.getenv("EMAIL_PASS")
-    recipients = [x.strip() for x in os.getenv("EMAIL_TO", "").split(",") if x.strip()]
-
-    # Read STUDENT_NAMES from secrets/env
-    raw_names = os.getenv("STUDENT_NAMES", "")
-    student_names = [
-        x.strip() for x in raw_names.replace("\r", "")
-        .replace("\n", "")
-        .replace(" ,", ",")
-        .replace(", ", ",")
-        .split(",") if x.strip()
-    ]
-    tracker_url = os.getenv("TRACKER_URL")
-
-    subject = f"Acadeno Technologies | Latest Jobs Updates – {datetime.now().strftime('%d %b %Y')}"
-    logo_url = "https://drive.google.com/uc?export=view&id=1wLdjI3WqmmeZcCbsX8aADhP53mRXthtB"
-
-    if len(student_names) != len(recipients):
-        print(f"⚠️ Warning: STUDENT_NAMES count ({len(student_names)}) != EMAIL_TO count ({len(recipients)}). Proceeding by index.")
-
-    for index, student_email in enumerate(recipients):
-        student_name = student_names[index] if index < len(student_names) else "Student"
 
-        html = f"""
-        <html>
-        <body style="font-family:Arial, sans-serif; background:#f4f8f5; padding:25px; line-height:1.6;">
-
-        <!-- HEADER -->
-        <div style="background:linear-gradient(90deg, #5B00C2, #FF6B00); padding:25px; border-radius:15px; color:white; text-align:center;">
-            <img src="{logo_url}" alt="Acadeno Logo" style="width:120px; height:auto; margin-bottom:12px; border-radius:10px;">
-            <h2 style="margin:0; font-size:22px;">Acadeno Technologies Private Limited</h2>
-        </div>
-
-         <!-- BODY -->
-        <div style="background:white; padding:25px; border-radius:12px; margin-top:25px; box-shadow:0 2px 5px rgba(0,0,0,0.1);">
-            <p>Dear <b style="color:#5B00C2;">{student_name}</b>,</p>
-
-            <p>Every great career begins with a single step — a moment of courage, determination, and belief in yourself. 🌱</p>
-
-            <p>At Acadeno Technologies, we believe that your journey matters as much as your destination. The opportunities before you are not just job openings — they are doors to your future, waiting for you to knock with confidence, curiosity, and commitment. 💡</p>
-
-            <p><b>Remember:</b> You don’t need to be perfect to begin — you just need to begin.</p>
-
-            <p>Every interview you attend, every resume you refine, and every challenge you face brings you one step closer to your goal. Growth happens when you step out of your comfort zone and trust your own potential.</p>
-
-            <p>So take this chance, believe in your abilities, and give your best. The effort you put in today will become the story you’re proud to tell tomorrow. 🌟</p>
-
-            <p>Your future is not waiting to happen — it’s waiting for you to make it happen.</p>
-
-            <p>With best wishes,</p>
-            <p><b>Team Acadeno Technologies Pvt. Ltd.</b></p>
-        </div>
-        <!-- JOB LIST -->
-        <div style="margin-top:20px;">
-        """
-
-        # Add job cards
-        for job in jobs:
-            safe_link = urllib.parse.quote(job['link'], safe='')
-            safe_title = urllib.parse.quote(job['title'], safe='')
-            safe_email = urllib.parse.quote(student_email, safe='')
-            tracking_link = f"{tracker_url}?email={safe_email}&job={safe_title}&link={safe_link}"
-
-            html += f"""
-            <div style="border:1px solid #ddd; border-radius:10px; padding:15px; background:#ffffff; margin-bottom:12px;">
-                <h3 style="color:#5B00C2; margin:0;">{job['title']}</h3>
-                <p style="margin:6px 0;">🏢 {job['company']}</p>
-                <a href="{tracking_link}" style="display:inline-block; background:linear-gradient(90deg,#FF6B00,#5B00C2); color:white; padding:8px 14px; text-decoration:none; border-radius:6px; font-weight:bold;">🔗 View & Apply</a>
-            </div>
-            """
-
-        html += f"""
-        </div>
-        <p style="font-size:12px; color:#777; margin-top:25px; text-align:center;">
-            Generated by Maitexa Job Tracker © {datetime.now().year}
-        </p>
-        </body>
-        </html>
-        """
-
-        # Send mail
-        msg = MIMEMultipart("alternative")
-        msg["From"] = sender
-        msg["To"] = student_email
-        msg["Subject"] = subject
-        msg.attach(MIMEText(html, "html"))
-
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(sender, password)
-            server.send_message(msg)
-
-        print(f"✅ Email sent to {student_name} ({student_email})")
+    if replay:
+        print("📼 Replayed run: job store, crawl history and analytics left untouched")
+        return all_jobs
+    new = job_store.record_run(all_jobs, started_at=run_started, partial_sources=stopped_early)
+    print(f"🗃️ Job store updated ({job_store.path}) — {new} new since the previous run")
+    return all_jobs
 
 # -------------------------
 # MAIN
@@ -650,17 +598,12 @@ if __name__ == "__main__":
     try:
         jobs = fetch_all_jobs()
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        browser_pool.shutdown()
+        http_fetch.close_session()
 
     if jobs:
-        # Save CSV for record (GitHub Actions runner artifact if you upload it)
-        df = pd.DataFrame(jobs)
-        df.drop_duplicates(subset=["title","company"], inplace=True)
-        df.to_csv("jobs.csv", index=False)
-        print(f"✅ Found {len(df)} matching jobs. Saved to jobs.csv.")
+        # jobs are already deduped and recorded in the job store by fetch_all_jobs
+        print(f"✅ Found {len(jobs)} matching jobs.")
         # Send email (keeps your original mail settings)
         send_email(jobs)
     else:
@@ -2,16 +2,36 @@ from flask import Flask, request, jsonify, send_from_directory
 import requests
 from nacl import public
 import base64
+import csv
+import hmac
+import io
 import json
 import os
+import threading
+import time
+
+from roster import RegistrationQueue, Roster, RosterSync, validate
+from click_tracker import tracker_bp
 
 app = Flask(__name__)
+# bulk imports of a few thousand students are well under this
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_IMPORT_BYTES", str(5 * 1024 * 1024)))
+# /click: records "View & Apply" clicks and redirects to the job
+app.register_blueprint(tracker_bp)
 
 # Load GitHub credentials
 GITHUB_TOKEN = os.getenv("GITHUB_PAT")   # <-- FIXED
 REPO = os.getenv("GITHUB_REPO", "acadenocareers/Joblisting") 
-EMAIL_SECRET = "EMAIL_TO"
-NAMES_SECRET = "STUDENT_NAMES"
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+# Bearer token for the bulk import endpoint (disabled when unset)
+IMPORT_TOKEN = os.getenv("IMPORT_TOKEN", "")
+# The repo public key rarely changes; refetch it after this many seconds
+PUBLIC_KEY_TTL = float(os.getenv("GITHUB_PUBLIC_KEY_TTL", "3600"))
+
+# One keep-alive session for every GitHub API call
+session = requests.Session()
+_public_key = {"key": None, "key_id": None, "fetched_at": 0.0}
+_public_key_lock = threading.Lock()
 
 def encrypt(public_key: str, secret_value: str) -> str:
     public_key_bytes = base64.b64decode(public_key)
@@ -29,26 +49,56 @@ def github_headers() -> dict:
         "X-GitHub-Api-Version": "2022-11-28"
     }
 
-def fetch_public_key():
-    url = f"https://api.github.com/repos/{REPO}/actions/secrets/public-key"
-    response = requests.get(url, headers=github_headers())
-    response.raise_for_status()
-    payload = response.json()
-    return payload["key"], payload["key_id"]
+def fetch_public_key(refresh=False):
+    """The repo's secrets public key, cached for PUBLIC_KEY_TTL seconds."""
+    with _public_key_lock:
+        if refresh or time.monotonic() - _public_key["fetched_at"] > PUBLIC_KEY_TTL or not _public_key["key"]:
+            url = f"{GITHUB_API}/repos/{REPO}/actions/secrets/public-key"
+            response = session.get(url, headers=github_headers(), timeout=30)
+            response.raise_for_status()
+            payload = response.json()
+            _public_key.update(key=payload["key"], key_id=payload["key_id"], fetched_at=time.monotonic())
+        return _public_key["key"], _public_key["key_id"]
 
 def upsert_secret(secret_name: str, secret_value: str):
-    public_key, key_id = fetch_public_key()
-    encrypted_value = encrypt(public_key, secret_value)
-
-    url_secret = f"https://api.github.com/repos/{REPO}/actions/secrets/{secret_name}"
-    payload = {
-        "encrypted_value": encrypted_value,
-        "key_id": key_id
-    }
-
-    response = requests.put(url_secret, headers=github_headers(), json=payload)
+    url_secret = f"{GITHUB_API}/repos/{REPO}/actions/secrets/{secret_name}"
+    for refresh in (False, True):
+        public_key, key_id = fetch_public_key(refresh)
+        payload = {
+            "encrypted_value": encrypt(public_key, secret_value),
+            "key_id": key_id
+        }
+        response = session.put(url_secret, headers=github_headers(), json=payload, timeout=30)
+        # 422 = the cached key was rotated; fetch the new one and retry once
+        if response.status_code != 422:
+            break
     response.raise_for_status()
 
+# Registrations are validated and queued in the request; a worker writes
+# them to the local roster and the full EMAIL_TO / STUDENT_NAMES /
+# STUDENT_PROFILES secrets are pushed in the background, debounced
+roster = Roster()
+roster_sync = RosterSync(roster, upsert_secret)
+roster_sync.start()
+registrations = RegistrationQueue(roster, roster_sync)
+
+def parse_import(body: bytes, content_type: str) -> list:
+    """Student dicts from a JSON list ({"students": [...]} also works) or a CSV with a header row."""
+    if "json" in content_type:
+        data = json.loads(body or b"[]")
+        data = data.get("students", []) if isinstance(data, dict) else data
+        if not isinstance(data, list):
+            raise ValueError("expected a list of students")
+        return data
+    text = body.decode("utf-8-sig")
+    return list(csv.DictReader(io.StringIO(text)))
+
+def student_fields(row: dict) -> tuple:
+    # CSV exports name their columns either way
+    return (row.get("student_name") or row.get("name") or "",
+            row.get("student_mail") or row.get("email") or "",
+            row.get("skills") or "")
+
 @app.get("/")
 def serve_index():
     return send_from_directory(".", "index.html")
@@ -56,25 +106,56 @@ def serve_index():
 @app.post("/request-credentials")
 def request_credentials():
     data = request.get_json(silent=True) or {}
-    student_name = data.get("student_name", "").strip()
-    student_mail = data.get("student_mail", "").strip().lower()
-
-    if not student_name or not student_mail:
-        return jsonify({"error": "student_name and student_mail are required."}), 400
-
+    if not isinstance(data, dict):
+        return jsonify({"error": "expected a JSON object."}), 400
     try:
-        upsert_secret(EMAIL_SECRET, student_mail)
-        upsert_secret(NAMES_SECRET, student_name)
+        student = validate(data.get("student_name", ""), data.get("student_mail", ""), data.get("skills", ""))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    registrations.submit([student])
+    return jsonify({"status": "queued"}), 202
+
+@app.post("/students/import")
+def import_students():
+    """Bulk registration: CSV (student_name/name, student_mail/email, skills) or a JSON list."""
+    if not IMPORT_TOKEN:
+        return jsonify({"error": "bulk import is disabled (IMPORT_TOKEN is not set)"}), 503
+    given = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(IMPORT_TOKEN, given):
+        return jsonify({"error": "forbidden"}), 403
 
-    except requests.HTTPError as exc:
-        print("🔥 HTTP ERROR:", exc.response.text)
-        return jsonify({"error": "GitHub API error", "details": exc.response.text}), 502
-
-    except Exception as exc:
-        print("🔥 ERROR:", exc)
-        return jsonify({"error": str(exc)}), 500
-
-    return jsonify({"status": "success"}), 200
+    try:
+        rows = parse_import(request.get_data(), request.content_type or "")
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        return jsonify({"error": f"could not parse the import: {exc}"}), 400
+
+    students, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("each student must be an object")
+            students.append(validate(*student_fields(row)))
+        except ValueError as exc:
+            errors.append({"row": index + 1, "error": str(exc)})
+
+    queued = registrations.submit(students)
+    print(f"📥 Bulk import: {len(students)} students queued, {len(errors)} rejected")
+    return jsonify({"status": "queued", "accepted": len(students), "rejected": len(errors),
+                    "errors": errors[:100], "queue": queued}), 202
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # APP_DEBUG=1 for the Flask reloader/debugger; otherwise waitress if it is
+    # installed (pip install waitress), else the threaded built-in server
+    host, port = os.getenv("HOST", "127.0.0.1"), int(os.getenv("PORT", "5000"))
+    if os.getenv("APP_DEBUG") == "1":
+        app.run(host=host, port=port, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            serve = None
+        if serve:
+            serve(app, host=host, port=port, threads=int(os.getenv("APP_THREADS", "8")))
+        else:
+            app.run(host=host, port=port, threaded=True)
@@ -0,0 +1,145 @@
+# batch_filter.py
+# Filtering stage run once per scrape over every raw candidate at the same
+# time. Scrapers only parse pages into candidates (title, company, link,
+# source, snippet); relevance, the experience check, clean-up and dedupe
+# run here as whole-column pandas operations, followed by a near-duplicate
+# pass over the accepted jobs.
+#
+# The raw candidates of the last run are kept on disk, so they can be
+# re-filtered after the keyword lists change without scraping again:
+#
+#   python batch_filter.py [data/raw_candidates.csv.gz]
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from job_filters import TERM_LISTS, HIGH_EXPERIENCE_RE, MATCH_MODE
+from matcher import TOKEN_RE, category_regexes
+from url_canon import dedupe_key, link_key
+from fuzzy_dedupe import fuzzy_dedupe
+
+CANDIDATE_COLUMNS = ["title", "company", "link", "source", "snippet"]
+JOB_COLUMNS = ["title", "company", "link", "source"]
+RAW_CANDIDATES_PATH = os.getenv("RAW_CANDIDATES_PATH", os.path.join("data", "raw_candidates.csv.gz"))
+
+CATEGORY_RE = category_regexes(TERM_LISTS, mode=MATCH_MODE)
+# collapse the same role posted on several sites (see fuzzy_dedupe.py); FUZZY_DEDUPE=0 turns it off
+FUZZY_DEDUPE = os.getenv("FUZZY_DEDUPE", "1") != "0"
+
+
+def to_frame(candidates):
+    """Columnar batch of candidate dicts; missing fields become empty strings."""
+    df = pd.DataFrame.from_records(list(candidates), columns=CANDIDATE_COLUMNS)
+    return df.fillna("").astype(str)
+
+
+def _per_distinct(values, fn):
+    """Apply fn once per distinct value of an array and broadcast the results back (object array)."""
+    codes, uniques = pd.factorize(values)
+    return np.array([fn(u) for u in uniques], dtype=object)[codes] if len(uniques) else np.array([], dtype=object)
+
+
+def _flags(values, regex):
+    return np.array([regex.search(v) is not None for v in values], dtype=bool)
+
+
+def classify(df):
+    """
+    Add accepted / reason / terms columns to a candidate frame. Same rules as
+    job_filters.explain_relevance, evaluated for the whole column at once.
+
+    Pages repeat the same anchor texts ("Apply Now", nav links, ...), so each
+    regex runs once per distinct text and the results are broadcast back to
+    the rows with numpy indexing.
+    """
+    df = df.copy()
+    # strip like the old normalize_job did
+    for col in CANDIDATE_COLUMNS:
+        df[col] = _per_distinct(df[col].fillna("").astype(str).to_numpy(object), str.strip)
+
+    lowered = (df["title"] + " " + df["snippet"]).str.lower().to_numpy(object)
+    codes, uniques = pd.factorize(lowered)
+    if MATCH_MODE == "words":
+        texts = [" ".join(TOKEN_RE.findall(u)) for u in uniques]
+    else:
+        texts = list(uniques)
+
+    u_exclude = _flags(texts, CATEGORY_RE["exclude"])
+    u_include = _flags(texts, CATEGORY_RE["include"])
+    u_prefer = _flags(texts, CATEGORY_RE["prefer"])
+    exp_found = [HIGH_EXPERIENCE_RE.search(u) for u in uniques]
+    experience = np.array([m.group(0) if m else "" for m in exp_found], dtype=object)[codes]
+    exclude, include, prefer = u_exclude[codes], u_include[codes], u_prefer[codes]
+    high_exp = experience != ""
+    empty = (df["title"] == "").to_numpy(bool)
+
+    df["accepted"] = include & ~exclude & ~high_exp & ~empty
+    df["reason"] = np.select(
+        [empty, exclude, ~include, high_exp, prefer],
+        ["empty title", "exclude term", "no include term", "experience: " + experience, "fresher term"],
+        default="include term",
+    )
+    # matched terms, for the decision log (texts that matched nothing get [])
+    u_terms = np.empty(len(texts), dtype=object)
+    for i, t in enumerate(texts):
+        u_terms[i] = ((CATEGORY_RE["include"].findall(t) if u_include[i] else [])
+                      + (CATEGORY_RE["exclude"].findall(t) if u_exclude[i] else [])
+                      + (CATEGORY_RE["prefer"].findall(t) if u_prefer[i] else []))
+    df["terms"] = u_terms[codes]
+    return df
+
+
+def select_jobs(classified):
+    """
+    Accepted candidates as job dicts, deduped on url_canon.dedupe_key
+    (portal job id, else canonical link + title, else title|company)
+    keeping the first occurrence.
+    """
+    kept = classified[classified["accepted"]]
+    # links repeat a lot (careers pages, pagination), so canonicalize each distinct one once
+    link_keys = _per_distinct(kept["link"].to_numpy(object), link_key)
+    keys = [dedupe_key(t, c, l, key=k) for t, c, l, k in zip(kept["title"], kept["company"], kept["link"], link_keys)]
+    kept = kept[~pd.Series(keys, index=kept.index).duplicated().to_numpy()]
+    columns = [kept[c].to_numpy(object) for c in JOB_COLUMNS]
+    return [dict(zip(JOB_COLUMNS, row)) for row in zip(*columns)]
+
+
+def filter_candidates(candidates):
+    """Run the whole stage: candidates (dicts or frame) -> (jobs, classified frame)."""
+    df = candidates if isinstance(candidates, pd.DataFrame) else to_frame(candidates)
+    classified = classify(df)
+    jobs = select_jobs(classified)
+    if FUZZY_DEDUPE:
+        jobs = fuzzy_dedupe(jobs)
+    return jobs, classified
+
+
+def save_candidates(df, path=None):
+    path = path or RAW_CANDIDATES_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df[CANDIDATE_COLUMNS].to_csv(path, index=False)
+    return path
+
+
+def load_candidates(path=None):
+    return pd.read_csv(path or RAW_CANDIDATES_PATH, dtype=str, keep_default_na=False)
+
+
+def save_decisions(classified, path):
+    """JSON lines of every candidate with its accept/reject reason and matched terms."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    classified[["source", "title", "snippet", "accepted", "reason", "terms"]].to_json(
+        path, orient="records", lines=True, force_ascii=False)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else RAW_CANDIDATES_PATH
+    raw = load_candidates(path)
+    jobs, classified = filter_candidates(raw)
+    print(f"🔁 Re-filtered {len(raw)} stored candidates from {path} (MATCH_MODE={MATCH_MODE})")
+    print(classified["reason"].str.split(":").str[0].value_counts().to_string())
+    print(f"✅ {len(jobs)} unique jobs accepted")
+    for j in jobs:
+        print(f" - {j['title']} | {j['company']} | {j['source']}")
@@ -0,0 +1,128 @@
+# benchmarks/bench_analytics.py
+# Cost of CTR reports from the daily rollups (fold in the clicks since the
+# last refresh, then GROUP BY the small rollup tables) against aggregating
+# the raw click log from scratch for every report. Also checks that the
+# sends a runner records reach the tracker (POST /analytics/push), so one
+# Analytics instance holds both the sends and the clicks of a day.
+#
+#   python benchmarks/bench_analytics.py [--days 180] [--students 300]
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import urllib.parse
+from contextlib import closing
+from datetime import date, timedelta
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# the tracker module below opens its stores at these paths
+TMP = tempfile.mkdtemp()
+os.environ.update(CLICK_DB_PATH=os.path.join(TMP, "tracker-clicks.db"),
+                  ANALYTICS_DB_PATH=os.path.join(TMP, "tracker-analytics.db"),
+                  CLICK_INDEX_PATH=os.path.join(TMP, "click_index.db"),
+                  JOB_DB_PATH=os.path.join(TMP, "jobs.db"), CLICK_TOKEN_SECRET="bench-secret")
+
+import click_tracker  # noqa: E402
+from analytics import Analytics  # noqa: E402
+
+JOBS_PER_DAY = 40
+DIGEST = 30
+
+
+def simulate(stats, buffer, students, days, rng, start=0, clicks_per_student=8):
+    """Each day: new jobs, a digest per student, and some (repeat) clicks on that day's jobs."""
+    sources = ["Infopark", "Naukri", "Indeed", "LinkedIn", "Technopark"]
+    rows = []
+    for d in range(start, start + days):
+        day = (date(2025, 1, 1) + timedelta(days=d)).isoformat()
+        jobs = [{"id": d * JOBS_PER_DAY + k + 1, "title": f"Python Developer {d}-{k}", "company": f"Co {k}",
+                 "link": f"https://example.com/{d}/{k}", "source": rng.choice(sources)} for k in range(JOBS_PER_DAY)]
+        stats.record_jobs(jobs)
+        for s in students:
+            sent = rng.sample(jobs, DIGEST)
+            stats.record_send(s, sent, day=day)
+            for _ in range(rng.randrange(clicks_per_student)):
+                j = rng.choice(sent[:10])
+                rows.append((f"{day}T10:{rng.randrange(60):02d}:00", s, j["title"], j["link"], "", None, j["id"]))
+    with closing(buffer.connect()) as conn, conn:
+        conn.executemany(click_tracker.INSERT, rows)
+    return len(rows)
+
+
+def rescan(path):
+    """The naive report: aggregate every raw click (this still lacks the sends to divide by)."""
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT job_id, COUNT(*), COUNT(DISTINCT email) FROM clicks GROUP BY job_id").fetchall()
+
+
+class TrackerSession:
+    """Routes Analytics.push() to the tracker blueprint in this process instead of over HTTP."""
+    def __init__(self, client):
+        self.client = client
+
+    def post(self, url, data, timeout, headers):
+        got = self.client.post(urllib.parse.urlsplit(url).path, data=data, headers=headers)
+        resp = requests.Response()
+        resp.status_code, resp._content, resp.url = got.status_code, got.get_data(), url
+        return resp
+
+
+def check_push(rng, students=20):
+    """A runner records and pushes a day's sends; the tracker's report for that day has sends and clicks."""
+    from flask import Flask
+    app = Flask("tracker")
+    app.register_blueprint(click_tracker.tracker_bp)
+    runner = Analytics(os.path.join(TMP, "runner-analytics.db"), clicks_path=os.path.join(TMP, "runner-clicks.db"),
+                       push_url="https://tracker.example/analytics/push")
+    emails = [f"student{i}@example.com" for i in range(students)]
+    buffer = click_tracker.click_buffer
+    simulate(runner, buffer, emails, 1, rng)
+    t0 = time.perf_counter()
+    pushed = runner.push(TrackerSession(app.test_client()))
+    seconds = time.perf_counter() - t0
+    (day,) = click_tracker.analytics.report("day")
+    assert day["sends"] and day["clicks"] and day["ctr"] is not None, day
+    assert not runner.report("day")[0]["clicks"], "the runner has no clicks of its own"
+    print(f"📈 push: {pushed} records in {seconds * 1000:.1f} ms; tracker {day['day']}: "
+          f"{day['sends']} sends, {day['clicks']} clicks, CTR {day['ctr']:.1%}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=180)
+    ap.add_argument("--students", type=int, default=300)
+    args = ap.parse_args()
+
+    rng = random.Random(20)
+    tmp = tempfile.mkdtemp(dir=TMP)
+    students = [f"student{i}@example.com" for i in range(args.students)]
+    buffer = click_tracker.ClickBuffer(path=os.path.join(tmp, "clicks.db"))
+    stats = Analytics(os.path.join(tmp, "analytics.db"), clicks_path=buffer.path)
+
+    n = simulate(stats, buffer, students, args.days, rng)
+    t0 = time.perf_counter()
+    stats.refresh()
+    print(f"📊 {args.days} days, {args.students} students: {n:,} clicks folded in {time.perf_counter() - t0:.2f}s (once)")
+
+    new = simulate(stats, buffer, students, 1, rng, start=args.days)
+    t0 = time.perf_counter()
+    stats.refresh()
+    print(f"  next day's {new:,} clicks folded in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    for by in ("source", "job", "student", "day"):
+        t0 = time.perf_counter()
+        rows = stats.report(by, refresh=False)
+        rollup = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        rescan(buffer.path)
+        raw = time.perf_counter() - t0
+        print(f"  by {by:7s}: rollups {rollup * 1000:6.1f} ms ({len(rows):5d} rows) | raw rescan {raw * 1000:6.1f} ms")
+    check_push(rng)
+
+
+if __name__ == "__main__":
+    main()
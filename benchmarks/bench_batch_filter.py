@@ -0,0 +1,78 @@
+# benchmarks/bench_batch_filter.py
+# Time the vectorized batch filter against the per-candidate pipeline it
+# replaced (explain_relevance per row, then normalize + dedupe in Python),
+# and check both make the same decisions.
+#
+#   python benchmarks/bench_batch_filter.py [--candidates 50000] [raw_candidates.csv.gz]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import batch_filter  # noqa: E402
+from job_filters import explain_relevance  # noqa: E402
+from url_canon import dedupe_key  # noqa: E402
+from fuzzy_dedupe import fuzzy_dedupe  # noqa: E402
+from bench_matcher import synthetic_anchors  # noqa: E402
+
+
+def synthetic_candidates(n, seed=11):
+    rng = random.Random(seed)
+    sources = ["Infopark", "Technopark", "Cyberpark", "Indeed", "Naukri", "LinkedIn"]
+    out = []
+    for i, title in enumerate(synthetic_anchors(n, seed)):
+        src = rng.choice(sources)
+        company = rng.choice(["Techversant", "UST", "Experion", "Tata Elxsi", ""])
+        out.append({
+            "title": f"  {title} ",
+            "company": company,
+            "link": f"https://example.com/{src.lower()}/job/{i % (n // 3 + 1)}",
+            "source": src,
+            "snippet": company if src in ("Indeed", "Naukri", "LinkedIn") else "",
+        })
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candidates", type=int, default=50_000)
+    ap.add_argument("path", nargs="?")
+    args = ap.parse_args()
+
+    if args.path:
+        frame = batch_filter.load_candidates(args.path)
+    else:
+        frame = batch_filter.to_frame(synthetic_candidates(args.candidates))
+    rows = frame.to_dict("records")
+
+    start = time.perf_counter()
+    one_by_one = []
+    seen, kept = set(), []
+    for r in rows:
+        title, company = r["title"].strip(), r["company"].strip()
+        ok = bool(title) and explain_relevance(title, r["snippet"].strip())["accepted"]
+        one_by_one.append(ok)
+        key = dedupe_key(title, company, r["link"].strip())
+        if ok and key not in seen:
+            seen.add(key)
+            kept.append({"title": title, "company": company, "link": r["link"].strip(), "source": r["source"]})
+    if batch_filter.FUZZY_DEDUPE:
+        kept = fuzzy_dedupe(kept)
+    t_rows = time.perf_counter() - start
+
+    start = time.perf_counter()
+    jobs, classified = batch_filter.filter_candidates(frame)
+    t_batch = time.perf_counter() - start
+
+    diff = int((classified["accepted"].to_numpy() != one_by_one).sum())
+    print(f"candidates:          {len(frame):,} ({len(jobs):,} unique jobs accepted)")
+    print(f"one by one:          {t_rows:.3f}s  ({len(frame) / t_rows:,.0f}/s)")
+    print(f"batch stage:         {t_batch:.3f}s  ({len(frame) / t_batch:,.0f}/s)")
+    print(f"decisions differing: {diff}, same jobs kept: {kept == jobs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_click_tokens.py
+# Email size and SMTP transfer time with ?t=<token> tracking links against
+# the ?email=&job=&link= links, token generation in bulk, and how fast the
+# tracker resolves a token through the click index.
+#
+#   pip install aiosmtpd
+#   python benchmarks/bench_click_tokens.py [--students 200] [--jobs 30]
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import click_tokens  # noqa: E402
+import email_render  # noqa: E402
+from mail_pool import SMTPPool  # noqa: E402
+from bench_smtp_pool import Controller, Handler, USER, PASSWORD, authenticator, free_port  # noqa: E402
+
+SECRET = "bench-secret"
+EPOCH = (1 << 24) - 1  # largest epoch, so the sizes are worst case
+TRACKER = "https://tracker.example.com/click"
+logging.getLogger("mail.log").setLevel(logging.ERROR)
+
+
+def synthetic_jobs(n):
+    return [{"id": 10_000 + i, "title": f"Junior Python Developer #{i} (0-2 yrs)", "company": f"Company {i % 40}",
+             "link": f"https://www.naukri.com/job-listings-junior-python-developer-company-kochi-0-to-2-years-"
+                     f"{181024500000 + i}?src=jobsearchDesk&sid=17289{i}&xp=1&px=2"}
+            for i in range(n)]
+
+
+def build(students, jobs, tokens):
+    digest = email_render.compile_digest(jobs, TRACKER, year=2025, tokens=tokens)
+    out = []
+    for sid, email in students:
+        values = None
+        if tokens:
+            ids = [j["id"] for j in jobs]
+            values = dict(zip(map(email_render.token_field, ids), click_tokens.make_tokens(EPOCH, sid, ids, SECRET)))
+        msg = MIMEMultipart("alternative")
+        msg["From"] = "jobs@example.com"
+        msg["To"] = email
+        msg["Subject"] = "Latest Jobs Updates"
+        msg.attach(MIMEText(email_render.render_digest(digest, f"Student {sid}", email, values), "html"))
+        out.append(msg)
+    return out
+
+
+def send_all(msgs):
+    port = free_port()
+    controller = Controller(Handler(0, 0), hostname="127.0.0.1", port=port, authenticator=authenticator,
+                            auth_require_tls=False)
+    controller.start()
+    try:
+        with SMTPPool(USER, PASSWORD, host="127.0.0.1", port=port, size=2, starttls=False) as pool:
+            t0 = time.perf_counter()
+            pool.send_many(msgs)
+            return time.perf_counter() - t0
+    finally:
+        controller.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--students", type=int, default=200)
+    ap.add_argument("--jobs", type=int, default=30)
+    args = ap.parse_args()
+
+    students = [(i + 1, f"firstname.lastname{i}@student.acadeno.com") for i in range(args.students)]
+    jobs = synthetic_jobs(args.jobs)
+
+    print(f"🔑 {args.students} students × {args.jobs} jobs")
+    for name, tokens in (("?email=&job=&link=", False), ("?t=<token>", True)):
+        msgs = build(students, jobs, tokens)
+        size = sum(len(m.as_bytes()) for m in msgs) / len(msgs)
+        seconds = send_all(msgs)
+        print(f"  {name:20s} {size / 1024:6.1f} KB/email, SMTP {seconds:.2f}s for all")
+
+    t0 = time.perf_counter()
+    ids = [j["id"] for j in synthetic_jobs(500)]
+    n = sum(len(click_tokens.make_tokens(EPOCH, sid, ids, SECRET)) for sid in range(1, 1001))
+    print(f"  generate: {n:,} tokens in {time.perf_counter() - t0:.2f}s "
+          f"(e.g. {click_tokens.make_token(EPOCH, 1000, ids[-1], SECRET)!r})")
+
+    index = click_tokens.ClickIndex(os.path.join(tempfile.mkdtemp(), "index.db"))
+    index.register([e for _, e in students], jobs)
+    tokens = [click_tokens.make_token(index.epoch, sid, j["id"], SECRET) for sid, _ in students for j in jobs]
+    for t in tokens[:len(jobs)]:
+        index.resolve(t, SECRET)  # warm the in-memory cache like a running tracker
+    t0 = time.perf_counter()
+    for t in tokens:
+        index.resolve(t, SECRET)
+    per = (time.perf_counter() - t0) / len(tokens)
+    print(f"  resolve: {per * 1e6:.1f} µs/token over {len(tokens):,} tokens")
+
+
+if __name__ == "__main__":
+    main()
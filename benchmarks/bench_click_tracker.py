@@ -0,0 +1,111 @@
+# benchmarks/bench_click_tracker.py
+# Click-to-redirect latency of the /click endpoint with the buffered writer,
+# against the same endpoint writing each click to SQLite before answering,
+# sequentially and under a burst of concurrent clicks (the 10 AM email
+# blast) through a real local HTTP server.
+#
+#   python benchmarks/bench_click_tracker.py [--clicks 3000] [--concurrency 50]
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import Flask, redirect, request
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import click_tracker  # noqa: E402
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+def unbuffered_app(buffer):
+    """The naive variant: one SQLite transaction per click before redirecting."""
+    app = Flask("unbuffered")
+
+    @app.get("/click")
+    def click():
+        link = request.args.get("link", "")
+        with buffer.connect() as conn:
+            conn.execute(click_tracker.INSERT, (time.strftime("%Y-%m-%dT%H:%M:%S"), request.args.get("email"),
+                                                request.args.get("job"), link, "", None, None))
+        conn.close()
+        return redirect(link, code=302)
+    return app
+
+
+def buffered_app():
+    app = Flask("buffered")
+    app.register_blueprint(click_tracker.tracker_bp)
+    return app
+
+
+def click_urls(n, base):
+    return [f"{base}/click?email=student{i % 800}%40example.com&job=Junior%20Python%20Developer"
+            f"&link={urllib.parse.quote(f'https://example.com/jobs/{i % 300}', safe='')}" for i in range(n)]
+
+
+def percentiles(lat):
+    lat = sorted(lat)
+    return lat[len(lat) // 2] * 1000, lat[int(len(lat) * 0.99)] * 1000
+
+
+def run(app, n, concurrency):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    def hit(url):
+        t0 = time.perf_counter()
+        r = session.get(url, allow_redirects=False)
+        assert r.status_code == 302
+        return time.perf_counter() - t0
+
+    client = app.test_client()
+    seq = []
+    for url in click_urls(n, ""):
+        t0 = time.perf_counter()
+        client.get(url)
+        seq.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        burst = list(ex.map(hit, click_urls(n, base)))
+    wall = time.perf_counter() - t0
+    server.shutdown()
+    return percentiles(seq), percentiles(burst), n / wall
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clicks", type=int, default=3000)
+    ap.add_argument("--concurrency", type=int, default=50)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    buffer = click_tracker.ClickBuffer(path=os.path.join(tmp, "clicks.db"))
+    click_tracker.click_buffer = buffer
+    naive_store = click_tracker.ClickBuffer(path=os.path.join(tmp, "naive.db"))
+
+    print(f"🖱️ {args.clicks} clicks, burst concurrency {args.concurrency}")
+    for name, app in (("write per click", unbuffered_app(naive_store)), ("buffered", buffered_app())):
+        (s50, s99), (b50, b99), rate = run(app, args.clicks, args.concurrency)
+        print(f"  {name:16s} in-process p50 {s50:.2f} ms p99 {s99:.2f} ms | "
+              f"HTTP burst p50 {b50:.1f} ms p99 {b99:.1f} ms, {rate:.0f} clicks/s")
+    buffer.stop()
+    with buffer.connect() as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM clicks").fetchone()[0]
+    print(f"  buffered writer: {stored} clicks stored in {buffer.batches} batch(es)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_driver_cache.py
+# Time to get a chromedriver path: webdriver_manager on every start (what
+# app.py and store.py used to do) against driver_cache with a cold and a
+# warm cache. Needs Chrome installed; the webdriver_manager row needs
+# network access.
+#
+#   python benchmarks/bench_driver_cache.py [--runs 5]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import driver_cache  # noqa: E402
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"🧭 Chrome major version: {driver_cache.chrome_major() or 'not found'}")
+    try:
+        ms = timed(driver_cache._manager_install, args.runs)
+        print(f"  ChromeDriverManager().install() every start: {ms:8.1f} ms")
+    except Exception as e:
+        print(f"  ChromeDriverManager().install() every start: failed ({type(e).__name__}: {e})")
+
+    cache = os.path.join(tempfile.mkdtemp(), "chromedriver.json")
+    try:
+        t0 = time.perf_counter()
+        driver_cache.resolve(cache)
+        print(f"  driver_cache, cold cache:                    {(time.perf_counter() - t0) * 1000:8.1f} ms")
+        print(f"  driver_cache, warm cache:                    {timed(lambda: driver_cache.resolve(cache), args.runs):8.1f} ms")
+    except Exception as e:
+        print(f"  driver_cache: failed ({type(e).__name__}: {e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_email_render.py
+# Time rendering the digest for every student with the precompiled template
+# (jobs rendered once per run) against the per-recipient f-string + "+="
+# loop send_email used before, and check the HTML is byte-identical.
+#
+#   python benchmarks/bench_email_render.py [--students 1000] [--jobs 500]
+import argparse
+import os
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import email_render  # noqa: E402
+
+TRACKER_URL = "https://tracker.example.com/click"
+YEAR = 2025
+
+
+def legacy_render(jobs, student_name, student_email, tracker_url, logo_url=email_render.LOGO_URL):
+    """The old send_email body: header, one f-string per job appended with +=, footer."""
+    html = email_render.HEADER.replace("{{logo_url}}", logo_url).replace("{{student_name}}", student_name)
+    for job in jobs:
+        safe_link = urllib.parse.quote(job['link'], safe='')
+        safe_title = urllib.parse.quote(job['title'], safe='')
+        safe_email = urllib.parse.quote(student_email, safe='')
+        tracking_link = f"{tracker_url}?email={safe_email}&job={safe_title}&link={safe_link}"
+
+        html += f"""
+            <div style="border:1px solid #ddd; border-radius:10px; padding:15px; background:#ffffff; margin-bottom:12px;">
+                <h3 style="color:#5B00C2; margin:0;">{job['title']}</h3>
+                <p style="margin:6px 0;">🏢 {job['company']}</p>
+                <a href="{tracking_link}" style="display:inline-block; background:linear-gradient(90deg,#FF6B00,#5B00C2); color:white; padding:8px 14px; text-decoration:none; border-radius:6px; font-weight:bold;">🔗 View & Apply</a>
+            </div>
+            """
+    html += email_render.FOOTER.replace("{{year}}", str(YEAR))
+    return html
+
+
+def synthetic_jobs(n):
+    return [
+        {"title": f"Junior Python Developer #{i} (0-2 yrs) & Data/ML",
+         "company": f"Company {i % 37}",
+         "link": f"https://example.com/jobs/{i}?ref=mail&utm_source=x y"}
+        for i in range(n)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--students", type=int, default=1000)
+    ap.add_argument("--jobs", type=int, default=500)
+    args = ap.parse_args()
+
+    jobs = synthetic_jobs(args.jobs)
+    students = [(f"Student {i}", f"student.{i}+jobs@example.com") for i in range(args.students)]
+
+    t0 = time.perf_counter()
+    old_sizes = [len(legacy_render(jobs, name, email, TRACKER_URL)) for name, email in students]
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    digest = email_render.compile_digest(jobs, TRACKER_URL, year=YEAR)
+    compile_time = time.perf_counter() - t0
+    new_sizes = [len(email_render.render_digest(digest, name, email)) for name, email in students]
+    total = time.perf_counter() - t0
+
+    # full equality on a sample (and sizes everywhere) keeps the check cheap
+    identical = old_sizes == new_sizes and all(
+        legacy_render(jobs, n, e, TRACKER_URL) == email_render.render_digest(digest, n, e)
+        for n, e in students[:: max(1, len(students) // 20)]
+    )
+    mb = sum(new_sizes) / 1e6
+    print(f"📧 {args.students} students × {args.jobs} jobs ({mb:.1f} MB of HTML)")
+    print(f"  legacy f-string loop: {legacy:.2f}s ({legacy / len(students) * 1000:.2f} ms/student)")
+    print(f"  precompiled digest:   {total:.2f}s (compile {compile_time * 1000:.1f} ms, "
+          f"{(total - compile_time) / len(students) * 1000:.2f} ms/student)")
+    print(f"  speedup: {legacy / total:.1f}x, identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_fuzzy_dedupe.py
+# Pairwise precision / recall of the near-duplicate stage on a hand-labelled
+# fixture (jobs tagged with the cluster they belong to), next to the exact
+# dedupe key alone, and how its run time grows with the number of jobs
+# compared to checking every pair.
+#
+#   python benchmarks/bench_fuzzy_dedupe.py [--fixture benchmarks/fixtures/dedupe_labelled.json]
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import fuzzy_dedupe  # noqa: E402
+from url_canon import dedupe_key  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "dedupe_labelled.json")
+
+
+def pairs_of(groups):
+    return {tuple(sorted(p)) for g in groups for p in itertools.combinations(g, 2)}
+
+
+def score(predicted, truth):
+    tp = len(predicted & truth)
+    precision = tp / len(predicted) if predicted else 1.0
+    recall = tp / len(truth) if truth else 1.0
+    return precision, recall
+
+
+def exact_groups(jobs):
+    groups = {}
+    for pos, j in enumerate(jobs):
+        groups.setdefault(dedupe_key(j["title"], j["company"], j["link"]), []).append(pos)
+    return list(groups.values())
+
+
+def brute_force(jobs, threshold=fuzzy_dedupe.TITLE_THRESHOLD):
+    """Every pair compared: the quadratic baseline the LSH banding avoids."""
+    sets = [fuzzy_dedupe.shingles(j["title"]) for j in jobs]
+    companies = [fuzzy_dedupe.normalize_company(j["company"]) for j in jobs]
+    hits = 0
+    for i in range(len(jobs)):
+        for k in range(i + 1, len(jobs)):
+            if companies[i] == companies[k] and sets[i] and sets[k] and \
+                    len(sets[i] & sets[k]) / len(sets[i] | sets[k]) >= threshold:
+                hits += 1
+    return hits
+
+
+def synthetic_jobs(n, seed=8):
+    rng = random.Random(seed)
+    roles = ["Python Developer", "Data Analyst", "Flutter Developer", "React Developer", "ML Engineer",
+             "Power BI Developer", "SQL Developer", "Django Developer", "Business Analyst", "Data Engineer"]
+    levels = ["Junior", "Trainee", "Fresher", "Intern", ""]
+    suffix = ["", " Pvt Ltd", " Technologies", " Infotech Pvt. Ltd."]
+    jobs = []
+    for i in range(n):
+        company = f"Company{rng.randrange(n // 4 + 1)}"
+        title = f"{rng.choice(levels)} {rng.choice(roles)}".strip()
+        if rng.random() < 0.3:
+            title = title.replace(" ", " - ", 1)
+        source = rng.choice(["Infopark", "Naukri", "LinkedIn"])
+        link = {"Infopark": f"https://infopark.in/companies/job-details/{i}",
+                "Naukri": f"https://www.naukri.com/job-listings-{181024500000 + i}",
+                "LinkedIn": f"https://in.linkedin.com/jobs/view/{3712340000 + i}"}[source]
+        jobs.append({"title": title, "company": company + rng.choice(suffix), "link": link, "source": source})
+    return jobs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixture", default=FIXTURE)
+    ap.add_argument("--sizes", default="1000,4000,16000")
+    args = ap.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        jobs = json.load(f)
+    labels = {}
+    for pos, j in enumerate(jobs):
+        labels.setdefault(j["cluster"], []).append(pos)
+    truth = pairs_of(labels.values())
+
+    print(f"🔎 {len(jobs)} labelled jobs, {len(labels)} distinct roles, {len(truth)} duplicate pairs")
+    for name, groups in (("exact key only", exact_groups(jobs)), ("MinHash/LSH", fuzzy_dedupe.clusters(jobs))):
+        predicted = pairs_of(groups)
+        p, r = score(predicted, truth)
+        print(f"  {name:15s} precision {p:.2f}  recall {r:.2f}  ({len(groups)} clusters)")
+        for a, b in sorted(predicted - truth):
+            print(f"    false merge: {jobs[a]['title']!r} ({jobs[a]['company']}) ~ {jobs[b]['title']!r} ({jobs[b]['company']})")
+
+    print("⏱️ scaling")
+    for n in (int(s) for s in args.sizes.split(",")):
+        synthetic = synthetic_jobs(n)
+        t0 = time.perf_counter()
+        kept = fuzzy_dedupe.fuzzy_dedupe(synthetic)
+        t_lsh = time.perf_counter() - t0
+        line = f"  {n:6d} jobs: LSH {t_lsh:.2f}s ({len(kept)} kept)"
+        if n <= 4000:
+            t0 = time.perf_counter()
+            brute_force(synthetic)
+            line += f", all pairs {time.perf_counter() - t0:.2f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_matcher.py
+# Compare the compiled matcher behind looks_relevant with the original
+# per-term substring scan on a large synthetic anchor set. With the default
+# MATCH_MODE=words the decisions differ on purpose (whole-word matching);
+# run with MATCH_MODE=substring to check the fast path agrees exactly.
+#
+#   python benchmarks/bench_matcher.py [--anchors 200000] [page.html ...]
+#
+# HTML files given on the command line add their real <a> texts to the set.
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import batch_filter  # noqa: E402
+from job_filters import (  # noqa: E402
+    EXCLUDE_LOWER, INCLUDE_TERMS, PREFER_LOWER, HIGH_EXPERIENCE_RE, MATCH_MODE, looks_relevant,
+)
+
+
+def legacy_looks_relevant(title, snippet=""):
+    """looks_relevant as it was before the compiled matcher (reference implementation)."""
+    text = f"{title} {snippet}".lower()
+    if any(ex in text for ex in EXCLUDE_LOWER):
+        return False
+    if not any(term in text for term in INCLUDE_TERMS):
+        return False
+    if re.search(HIGH_EXPERIENCE_RE, text):
+        return False
+    if re.search(r"\b(senior|lead|manager|director|principal|head|vp)\b", text):
+        return False
+    if any(p in text for p in PREFER_LOWER):
+        return True
+    return True
+
+
+NAV_WORDS = [
+    "home", "about us", "contact", "gallery", "events", "news", "privacy policy", "login",
+    "register", "companies", "facilities", "tenders", "downloads", "sitemap", "careers",
+    "read more", "view details", "apply now", "email us", "maintenance", "archive",
+]
+ROLE_WORDS = ["developer", "engineer", "analyst", "intern", "trainee", "executive", "associate", "consultant"]
+LEVELS = ["", "junior", "senior", "lead", "fresher", "0-2 years", "5+ years", "3 years exp"]
+
+
+def synthetic_anchors(n, seed=7):
+    rng = random.Random(seed)
+    skills = [t.lower() for t in INCLUDE_TERMS] + EXCLUDE_LOWER
+    out = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.45:
+            out.append(rng.choice(NAV_WORDS).title())
+        else:
+            parts = [rng.choice(LEVELS), rng.choice(skills), rng.choice(ROLE_WORDS)]
+            if rng.random() < 0.3:
+                parts.append("- " + rng.choice(["Kochi", "Trivandrum", "Infopark Phase II", "Remote"]))
+            out.append(" ".join(p for p in parts if p).title())
+    return out
+
+
+def html_anchors(paths):
+    from bs4 import BeautifulSoup
+    out = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        out += [a.get_text(strip=True) for a in soup.find_all("a") if a.get_text(strip=True)]
+    return out
+
+
+def timed(fn, anchors):
+    start = time.perf_counter()
+    results = [fn(a) for a in anchors]
+    return time.perf_counter() - start, results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--anchors", type=int, default=200_000)
+    ap.add_argument("html", nargs="*")
+    args = ap.parse_args()
+
+    anchors = synthetic_anchors(args.anchors) + html_anchors(args.html)
+    t_old, old = timed(legacy_looks_relevant, anchors)
+    t_new, new = timed(looks_relevant, anchors)
+    # the same rules over the whole column, as the scraper runs them (with the decision log's reasons)
+    start = time.perf_counter()
+    classified = batch_filter.classify(batch_filter.to_frame({"title": a} for a in anchors))
+    t_batch = time.perf_counter() - start
+    assert classified["accepted"].tolist() == new, "batch_filter.classify disagrees with looks_relevant"
+    diffs = [(a, o) for a, o, n in zip(anchors, old, new) if o != n]
+
+    print(f"anchors:            {len(anchors):,} ({sum(new):,} accepted)")
+    print(f"substring scan:     {t_old:.3f}s  ({len(anchors) / t_old:,.0f} anchors/s)")
+    print(f"compiled matcher:   {t_new:.3f}s  ({len(anchors) / t_new:,.0f} anchors/s, MATCH_MODE={MATCH_MODE})")
+    print(f"speedup:            {t_old / t_new:.2f}x")
+    print(f"batch classify:     {t_batch:.3f}s  ({len(anchors) / t_batch:,.0f} anchors/s)")
+    print("decision reasons:   " + ", ".join(
+        f"{k} {v:,}" for k, v in classified["reason"].str.split(":").str[0].value_counts().items()))
+    print(f"decisions differing: {len(diffs)}")
+    for text, was in list(dict(diffs).items())[:10]:
+        print(f"   {'rejected' if was else 'accepted'} now: {text!r}")
+
+
+if __name__ == "__main__":
+    main()
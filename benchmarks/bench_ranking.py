@@ -0,0 +1,79 @@
+# benchmarks/bench_ranking.py
+# Time the ranking stage (inverted index + matrix scoring + top-K) for many
+# students x jobs, and check its top-K lists against a plain per-student,
+# per-job Python scorer on a sample of students.
+#
+#   python benchmarks/bench_ranking.py [--students 1000] [--jobs 2000] [--k 30]
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ranking  # noqa: E402
+from job_filters import INCLUDE_TERMS  # noqa: E402
+from bench_matcher import synthetic_anchors  # noqa: E402
+
+
+def synthetic_profiles(n, seed=5):
+    rng = random.Random(seed)
+    skills = [t for t in INCLUDE_TERMS if " / " not in t]
+    return [rng.sample(skills, rng.randint(0, 6)) for _ in range(n)]
+
+
+def naive_top_k(index, skills, k, eligible):
+    """Score every job by summing the idf of each skill term it mentions."""
+    wanted = {t for t in ranking.include_terms(" , ".join(skills)) if t in index.term_ids}
+    scored = []
+    for pos, job in enumerate(index.jobs):
+        if not eligible[pos]:
+            continue
+        terms = set(ranking.include_terms(f"{job['title']} {job['company']}"))
+        score = sum(float(index.idf[index.term_ids[t]]) for t in wanted & terms)
+        scored.append((-score, pos))
+    scored.sort()
+    return [pos for _, pos in scored[:k]]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--students", type=int, default=1000)
+    ap.add_argument("--jobs", type=int, default=2000)
+    ap.add_argument("--k", type=int, default=30)
+    ap.add_argument("--check", type=int, default=25, help="students compared with the naive scorer")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(3)
+    jobs = [{"title": t, "company": f"Company {i % 50}", "link": f"https://example.com/{i}"}
+            for i, t in enumerate(synthetic_anchors(args.jobs, seed=21))]
+    profiles = synthetic_profiles(args.students)
+    eligible = rng.random((args.students, args.jobs)) > 0.2   # ~20% already sent
+
+    t0 = time.perf_counter()
+    index = ranking.JobIndex(jobs)
+    t_index = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scores = index.scores(profiles)
+    t_score = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    top = ranking.top_k(scores, args.k, eligible)
+    t_top = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sample = range(0, args.students, max(1, args.students // args.check))
+    mismatches = sum(list(top[s]) != naive_top_k(index, profiles[s], args.k, eligible[s]) for s in sample)
+    t_naive = (time.perf_counter() - t0) / len(sample) * args.students
+
+    total = t_index + t_score + t_top
+    print(f"🎯 {args.students} students × {args.jobs} jobs, top {args.k}, {len(index.terms)} index terms")
+    print(f"  index {t_index:.2f}s, scoring {t_score:.2f}s, top-K {t_top:.2f}s -> {total:.2f}s total")
+    print(f"  naive per-student scorer (extrapolated): {t_naive:.1f}s -> {t_naive / total:.0f}x")
+    print(f"  top-K lists differing from naive on {len(sample)} sampled students: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
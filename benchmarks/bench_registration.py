@@ -0,0 +1,98 @@
+# benchmarks/bench_registration.py
+# Load test of the registration API served over HTTP, with a local stub of
+# the GitHub secrets API behind it: sustained registrations/sec and latency
+# under concurrent clients, then one bulk CSV import, and how long until
+# the whole roster has reached the (stub) secrets.
+#
+#   python benchmarks/bench_registration.py [--requests 3000] [--concurrency 32] [--bulk 5000]
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_roster_sync import GitHubStub  # noqa: E402
+
+
+def percentiles(lat):
+    lat = sorted(lat)
+    return lat[len(lat) // 2] * 1000, lat[int(len(lat) * 0.99)] * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=3000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--bulk", type=int, default=5000)
+    ap.add_argument("--latency", type=float, default=0.15, help="seconds per GitHub API call")
+    args = ap.parse_args()
+
+    stub = GitHubStub(args.latency)
+    os.environ.update(GITHUB_PAT="stub", GITHUB_API_URL=stub.url, IMPORT_TOKEN="bench",
+                      ROSTER_DB_PATH=os.path.join(tempfile.mkdtemp(), "roster.db"), ROSTER_SYNC_DELAY="1", EMAIL_TO="")  # a fresh roster: nothing to seed
+    import appCred  # noqa: E402  (reads the env above)
+
+    server = make_server("127.0.0.1", 0, appCred.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+
+    def register(i):
+        t0 = time.perf_counter()
+        r = session.post(f"{base}/request-credentials", json={
+            "student_name": f"Student {i}", "student_mail": f"student{i}@example.com", "skills": "python, sql"})
+        assert r.status_code == 202, r.text
+        return time.perf_counter() - t0
+
+    client = appCred.app.test_client()
+    handler = []
+    for i in range(200):
+        t1 = time.perf_counter()
+        client.post("/request-credentials", json={"student_name": f"Warmup {i}", "student_mail": f"w{i}@example.com"})
+        handler.append(time.perf_counter() - t1)
+    h50, h99 = percentiles(handler)
+    print(f"📝 handler (in-process): p50 {h50:.2f} ms p99 {h99:.2f} ms")
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as ex:
+        lat = list(ex.map(register, range(args.requests)))
+    wall = time.perf_counter() - t0
+    p50, p99 = percentiles(lat)
+    print(f"🚀 {args.requests} registrations over HTTP, {args.concurrency} clients: {args.requests / wall:.0f} req/s, "
+          f"p50 {p50:.1f} ms p99 {p99:.1f} ms")
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["name", "email", "skills"])
+    writer.writerows([f"Bulk {i}", f"bulk{i}@example.com", "python;django"] for i in range(args.bulk))
+    writer.writerow(["Broken", "not-an-email", ""])
+    t0 = time.perf_counter()
+    r = session.post(f"{base}/students/import", data=out.getvalue().encode(),
+                     headers={"Content-Type": "text/csv", "Authorization": "Bearer bench"})
+    body = r.json()
+    print(f"📥 bulk import of {args.bulk + 1} CSV rows: HTTP {r.status_code} in {(time.perf_counter() - t0) * 1000:.0f} ms, "
+          f"{body['accepted']} accepted, {body['rejected']} rejected")
+
+    expected = 200 + args.requests + args.bulk
+    t0 = time.perf_counter()
+    while len((stub.secrets.get("EMAIL_TO") or "").split(",")) < expected and time.perf_counter() - t0 < 120:
+        time.sleep(0.1)
+    synced = len((stub.secrets.get("EMAIL_TO") or "").split(","))
+    print(f"🔐 {synced} students in EMAIL_TO {time.perf_counter() - t0:.1f}s after the import, "
+          f"{sum(stub.calls.values())} GitHub API calls in total ({dict(stub.calls)})")
+    server.shutdown()
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
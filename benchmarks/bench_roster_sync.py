@@ -0,0 +1,114 @@
+# benchmarks/bench_roster_sync.py
+# Registration latency and GitHub API calls for a burst of sign-ins,
+# against a local stub of the GitHub secrets API with a realistic round
+# trip delay: the previous handler (public key fetch + PUT per secret, a new
+# connection each time) against the roster store with the debounced sync.
+#
+#   python benchmarks/bench_roster_sync.py [--students 100] [--latency 0.15]
+import argparse
+import base64
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import requests
+from flask import Flask, request
+from nacl import public
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+class GitHubStub:
+    """Just enough of the Actions secrets API: public-key and PUT secret, with a fixed delay."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.private_key = public.PrivateKey.generate()
+        self.secrets = {}
+        self.calls = Counter()
+        app = Flask("github-stub")
+
+        @app.get("/repos/<owner>/<repo>/actions/secrets/public-key")
+        def public_key(owner, repo):
+            self._hit("public-key")
+            return {"key_id": "k1", "key": base64.b64encode(bytes(self.private_key.public_key)).decode()}
+
+        @app.put("/repos/<owner>/<repo>/actions/secrets/<name>")
+        def put_secret(owner, repo, name):
+            self._hit("put")
+            sealed = base64.b64decode(request.get_json()["encrypted_value"])
+            self.secrets[name] = public.SealedBox(self.private_key).decrypt(sealed).decode()
+            return "", 204
+
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _hit(self, kind):
+        self.calls[kind] += 1
+        time.sleep(self.latency)
+
+    def shutdown(self):
+        self.server.shutdown()
+
+
+def legacy_register(api, name, mail):
+    """The previous /request-credentials: key fetch + PUT for each secret, no session."""
+    import appCred
+    headers = appCred.github_headers()
+    profiles = json.dumps({mail: {"name": name, "skills": ["python", "sql"]}})
+    for secret, value in (("EMAIL_TO", mail), ("STUDENT_NAMES", name), ("STUDENT_PROFILES", profiles)):
+        r = requests.get(f"{api}/repos/{appCred.REPO}/actions/secrets/public-key", headers=headers)
+        key = r.json()
+        requests.put(f"{api}/repos/{appCred.REPO}/actions/secrets/{secret}", headers=headers,
+                     json={"encrypted_value": appCred.encrypt(key["key"], value), "key_id": key["key_id"]})
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--students", type=int, default=100)
+    ap.add_argument("--latency", type=float, default=0.15, help="seconds per GitHub API call")
+    args = ap.parse_args()
+
+    stub = GitHubStub(args.latency)
+    os.environ.update(GITHUB_PAT="stub", GITHUB_API_URL=stub.url, ROSTER_DB_PATH=os.path.join(tempfile.mkdtemp(), "r.db"),
+                      ROSTER_SYNC_DELAY="0.5", EMAIL_TO="")  # a fresh roster: nothing to seed
+    import appCred  # noqa: E402  (reads the env above)
+
+    students = [(f"Student {i}", f"student{i}@example.com") for i in range(args.students)]
+    print(f"🔐 {args.students} registrations, GitHub API round trip {args.latency * 1000:.0f} ms")
+
+    t0 = time.perf_counter()
+    for name, mail in students:
+        legacy_register(stub.url, name, mail)
+    legacy = time.perf_counter() - t0
+    print(f"  per-request secrets: {legacy / len(students) * 1000:7.1f} ms/registration, {sum(stub.calls.values())} "
+          f"API calls, roster afterwards: {len(stub.secrets['EMAIL_TO'].split(','))} student(s)")
+
+    stub.calls.clear()
+    client = appCred.app.test_client()
+    t0 = time.perf_counter()
+    for name, mail in students:
+        r = client.post("/request-credentials", json={"student_name": name, "student_mail": mail,
+                                                      "skills": "python, sql"})
+        assert r.status_code < 300, r.data
+    latency = (time.perf_counter() - t0) / len(students)
+    appCred.registrations.stop()
+    appCred.roster_sync.stop()
+    emails = stub.secrets["EMAIL_TO"].split(",")
+    print(f"  roster + debounced sync: {latency * 1000:7.1f} ms/registration, {sum(stub.calls.values())} API calls "
+          f"({dict(stub.calls)}), roster afterwards: {len(emails)} "
+          f"students, {len(json.loads(stub.secrets['STUDENT_PROFILES']))} profiles")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# benchmarks/bench_scrapers.py
+# Every source in app.build_sources(), run offline against recorded pages
+# (fixtures.py): parse time, candidates/sec, jobs accepted by the batch
+# filter and peak Python memory per source. No network and no Chrome, so
+# changes to the parsers, selectors, looks_relevant or dedupe can be
+# measured (and their accepted counts compared with --json) on any machine.
+#
+# Without --fixtures the pages are synthetic: tables, careers pages and
+# result cards shaped like the real ones, at the URLs the fetchers request.
+#
+#   python cli.py scrape --record-fixtures data/fixtures/2025-11-14
+#   python benchmarks/bench_scrapers.py [--fixtures data/fixtures/2025-11-14] [--rows 200] [--json out.json]
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_matcher import synthetic_anchors  # noqa: E402
+
+
+def table_page(titles, rng):
+    rows = "".join(f"<tr><td>{i}</td><td><a href='/job/{rng.randrange(10 ** 6)}'>{t}</a></td>"
+                   f"<td>{rng.choice(['UST', 'Experion', 'Tata Elxsi', 'Techversant'])}</td><td>2 days</td></tr>"
+                   for i, t in enumerate(titles, 1))
+    return f"<html><body><nav><a href='/'>Home</a></nav><table><tr><th>#</th><th>Title</th><th>Company</th>" \
+           f"<th>Posted</th></tr>{rows}</table></body></html>"
+
+
+def careers_page(titles, rng):
+    links = "".join(f"<div class='vacancy'><a href='/careers/job-{rng.randrange(10 ** 6)}'>{t}</a></div>"
+                    for t in titles)
+    return f"<html><body><nav><a href='/'>Home</a><a href='/about'>About</a></nav>{links}</body></html>"
+
+
+def card_page(source, titles, rng):
+    cards = []
+    for t in titles:
+        company = rng.choice(["UST", "Experion", "Tata Elxsi", "Freshworks", "Zoho"])
+        jk = f"{rng.getrandbits(48):012x}"
+        if source == "Indeed":
+            cards.append(f"<a data-jk='{jk}'><h2 class='jobTitle'>{t}</h2><span class='companyName'>{company}</span></a>")
+        elif source == "Naukri":
+            cards.append(f"<article class='jobTuple'><a class='title' href='/job-listings-{jk}'>{t}</a>"
+                         f"<a class='orgName'>{company}</a></article>")
+        else:
+            cards.append(f"<div class='base-search-card__info'><h3>{t}</h3><h4>{company}</h4>"
+                         f"<a href='/jobs/view/{jk}'>view</a></div>")
+    return f"<html><body>{''.join(cards)}</body></html>"
+
+
+def write_synthetic(store, app, rows, seed=5):
+    """Record synthetic pages at every URL the fetchers of app.build_sources() load."""
+    rng = random.Random(seed)
+    titles = synthetic_anchors(rows * 40, seed)
+    pick = lambda: rng.sample(titles, rows)  # noqa: E731
+    for source in app.build_sources():
+        name, kw = source["name"], source["kwargs"]
+        if name in ("Infopark", "Technopark"):
+            fmt = {"Infopark": "https://infopark.in/companies/job-search?page={page}",
+                   "Technopark": "https://technopark.in/job-search?page={page}"}[name]
+            for page in range(1, kw.get("pages", 5) + 1):
+                store.save(fmt.format(page=page), table_page(pick(), rng), name)
+        elif name in ("Cyberpark", "SmartCity Kochi", "TIDEL Park", "STPI"):
+            url = {"Cyberpark": "https://cyberparks.in/careers", "SmartCity Kochi": "https://smartcitykochi.in/careers",
+                   "TIDEL Park": "https://www.tidelpark.com/careers", "STPI": "https://www.stpi.in/career"}[name]
+            store.save(url, careers_page(pick(), rng), name)
+        elif name.startswith("Bengaluru"):
+            url = kw["url"]
+            store.save(url, "<html><body><a href='/about'>About</a><a href='/careers'>Careers</a></body></html>", name)
+            store.save(urllib.parse.urljoin(url, "/careers"), careers_page(pick(), rng), name)
+        else:
+            q = kw["query_terms"]
+            if name == "Indeed":
+                base = "+".join(urllib.parse.quote_plus(t) for t in q)
+                urls = [f"https://www.indeed.co.in/jobs?q={base}&l=India&start={p * 10}" for p in range(kw["pages"])]
+            elif name == "Naukri":
+                base = "%20".join(urllib.parse.quote_plus(t) for t in q)
+                urls = [f"https://www.naukri.com/{base}-jobs-{p}" for p in range(1, kw["pages"] + 1)]
+            else:
+                base = "%20".join(urllib.parse.quote_plus(t) for t in q)
+                urls = [f"https://www.linkedin.com/jobs/search?keywords={base}&location=India&start={p * 25}"
+                        for p in range(kw["pages"])]
+            for url in urls:
+                store.save(url, card_page(name, pick(), rng), name)
+
+
+def _fetch(source):
+    from scrape_engine import _task
+    _task.source = source
+    try:
+        return source["fetch"](**source["kwargs"]) or []
+    finally:
+        _task.source = None
+
+
+def run_source(app, batch_filter, source):
+    """Parse time (untraced), then peak memory in a second pass with a fresh crawl history."""
+    from crawl_state import CrawlState
+    t0 = time.perf_counter()
+    candidates = _fetch(source)
+    seconds = time.perf_counter() - t0
+    app.crawl_state = CrawlState()  # otherwise the second pass stops at the first known page
+    tracemalloc.start()
+    _fetch(source)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    for c in candidates:
+        c["source"] = source["name"]
+    t0 = time.perf_counter()
+    jobs, _ = batch_filter.filter_candidates(candidates) if candidates else ([], None)
+    return {"source": source["name"], "seconds": round(seconds, 4), "candidates": len(candidates),
+            "accepted": len(jobs), "filter_seconds": round(time.perf_counter() - t0, 4),
+            "peak_kb": round(peak / 1024, 1)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixtures", help="recorded fixture directory (default: synthetic pages)")
+    ap.add_argument("--rows", type=int, default=200, help="postings per synthetic page")
+    ap.add_argument("--json", help="also write the per-source results here")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    # the harness must not touch the real crawl history, caches or job store
+    os.environ.update(SCRAPE_FIXTURES="replay", SCRAPE_FIXTURE_DIR=args.fixtures or os.path.join(tmp, "fixtures"),
+                      CRAWL_STATE_PATH=os.path.join(tmp, "crawl.json"), HTTP_CACHE_DIR=os.path.join(tmp, "http"),
+                      JOB_DB_PATH=os.path.join(tmp, "jobs.db"), ANALYTICS_DB_PATH=os.path.join(tmp, "a.db"),
+                      FILTER_LOG_PATH=os.path.join(tmp, "decisions.jsonl"))
+    import app  # noqa: E402  (reads the env above)
+    import batch_filter  # noqa: E402
+    import fixtures  # noqa: E402
+
+    if not args.fixtures:
+        write_synthetic(fixtures.FixtureStore(mode="record"), app, args.rows)
+    print(f"📼 {len(fixtures.store.index())} pages from {fixtures.store.directory}")
+
+    results = []
+    for source in app.build_sources():
+        r = run_source(app, batch_filter, source)
+        results.append(r)
+        rate = r["candidates"] / r["seconds"] if r["seconds"] else 0
+        print(f"  {r['source']:<34} {r['seconds'] * 1000:8.1f} ms  {r['candidates']:6d} candidates "
+              f"({rate:8.0f}/s)  {r['accepted']:5d} accepted  filter {r['filter_seconds'] * 1000:6.1f} ms  "
+              f"peak {r['peak_kb'] / 1024:6.1f} MB")
+    total = sum(r["seconds"] for r in results)
+    print(f"  {'total':<34} {total * 1000:8.1f} ms  {sum(r['candidates'] for r in results):6d} candidates, "
+          f"{sum(r['accepted'] for r in results)} accepted")
+    print(fixtures.store.report())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
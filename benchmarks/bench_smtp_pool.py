@@ -0,0 +1,141 @@
+# benchmarks/bench_smtp_pool.py
+# Deliver the digest to N students through a local aiosmtpd server, once with
+# a new connection + login per message (the old send_email) and once through
+# mail_pool.SMTPPool, and report throughput and per-message latency.
+#
+# The stand-in server requires AUTH, can add a delay to every EHLO to mimic
+# the TLS/auth round trips of a real provider, and can answer every Nth
+# message with "421 4.7.0 Try again later" to exercise the reconnect path.
+#
+#   pip install aiosmtpd
+#   python benchmarks/bench_smtp_pool.py [--students 200] [--handshake-ms 40] [--throttle-every 50]
+import argparse
+import asyncio
+import os
+import smtplib
+import socket
+import sys
+import threading
+import logging
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+from mail_pool import SMTPPool  # noqa: E402
+
+USER, PASSWORD = "bench", "secret"
+logging.getLogger("mail.log").setLevel(logging.ERROR)  # aiosmtpd logs a deprecation per AUTH
+
+
+class Handler:
+    def __init__(self, handshake_delay, throttle_every):
+        self.handshake_delay = handshake_delay
+        self.throttle_every = throttle_every
+        self.received = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.received += 1
+            throttle = self.throttle_every and self.received % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+        if throttle:
+            return "421 4.7.0 Try again later, closing connection"
+        return "250 OK"
+
+
+def authenticator(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=auth_data.login == USER.encode() and auth_data.password == PASSWORD.encode())
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def messages(n, size_kb):
+    line = "<div><h3>Junior Python Developer</h3><p>Company</p><a href=\"https://t.example.com/c\">Apply</a></div>\n"
+    body = line * (size_kb * 1024 // len(line))
+    out = []
+    for i in range(n):
+        msg = MIMEMultipart("alternative")
+        msg["From"] = "jobs@example.com"
+        msg["To"] = f"student{i}@example.com"
+        msg["Subject"] = "Latest Jobs Updates"
+        msg.attach(MIMEText(body, "html"))
+        out.append(msg)
+    return out
+
+
+def legacy_send(msgs, port):
+    """New connection, EHLO and login for every message, like the old send_email."""
+    latencies, failed = [], 0
+    for msg in msgs:
+        t0 = time.perf_counter()
+        try:
+            with smtplib.SMTP("127.0.0.1", port) as server:
+                server.login(USER, PASSWORD)
+                server.send_message(msg)
+        except smtplib.SMTPException:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+    return latencies, failed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--students", type=int, default=200)
+    ap.add_argument("--size-kb", type=int, default=150, help="HTML body size per message")
+    ap.add_argument("--handshake-ms", type=float, default=40.0)
+    ap.add_argument("--throttle-every", type=int, default=50)
+    ap.add_argument("--pool-size", type=int, default=2)
+    args = ap.parse_args()
+
+    port = free_port()
+    handler = Handler(args.handshake_ms / 1000, args.throttle_every)
+    controller = Controller(handler, hostname="127.0.0.1", port=port, authenticator=authenticator,
+                            auth_require_tls=False)
+    controller.start()
+    msgs = messages(args.students, args.size_kb)
+    try:
+        t0 = time.perf_counter()
+        legacy, legacy_failed = legacy_send(msgs, port)
+        legacy_time = time.perf_counter() - t0
+
+        handler.received = 0
+        pool = SMTPPool(USER, PASSWORD, host="127.0.0.1", port=port, size=args.pool_size,
+                        starttls=False, backoff=0.05)
+        t0 = time.perf_counter()
+        results = pool.send_many(msgs)
+        pool.close()
+        pooled_time = time.perf_counter() - t0
+    finally:
+        controller.stop()
+
+    pooled_failed = sum(isinstance(r, Exception) for _, r in results)
+    print(f"📧 {args.students} messages of ~{args.size_kb} KB, {args.handshake_ms:.0f} ms handshake, "
+          f"421 every {args.throttle_every or '-'} messages")
+    print(f"  connection per message: {legacy_time:.2f}s ({args.students / legacy_time:.0f} msg/s), "
+          f"{legacy_failed} failed (not retried)")
+    print(f"  SMTPPool x{args.pool_size}:           {pooled_time:.2f}s ({args.students / pooled_time:.0f} msg/s), "
+          f"{pooled_failed} failed")
+    print(f"  {pool.report()}")
+    print(f"  speedup: {legacy_time / pooled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_startup.py
+# Start-up cost of each CLI command: a fresh interpreter per sample, so
+# import time is measured the way a scheduled job or a shell user pays it.
+# The last rows show what every command used to import up front (and
+# app.py also ran ChromeDriverManager().install(), a network call, on
+# import, which is not included here).
+#
+#   python benchmarks/bench_startup.py [--runs 5]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = [
+    ("python (empty)", ["-c", "pass"]),
+    ("cli.py --help", ["cli.py", "--help"]),
+    ("cli.py report", ["cli.py", "report"]),
+    ("import digest (send path)", ["-c", "import digest"]),
+    ("import app (scrape path)", ["-c", "import app"]),
+    ("selenium + webdriver_manager", ["-c", "import selenium.webdriver, webdriver_manager.chrome"]),
+    ("pandas", ["-c", "import pandas"]),
+    ("numpy", ["-c", "import numpy"]),
+]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    data = tempfile.mkdtemp()
+    env = dict(os.environ, JOB_DB_PATH=os.path.join(data, "jobs.db"), OUTBOX_DB_PATH=os.path.join(data, "outbox.db"),
+               ANALYTICS_DB_PATH=os.path.join(data, "analytics.db"), CLICK_DB_PATH=os.path.join(data, "clicks.db"))
+    print(f"🚀 median of {args.runs} fresh interpreters")
+    for name, cmd in CASES:
+        samples = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, *cmd], cwd=ROOT, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            samples.append(time.perf_counter() - t0)
+        print(f"  {name:30s} {statistics.median(samples) * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# browser_pool.py
+# A small pool of headless Chrome instances shared by the scrapers.
+# Instances are started lazily, handed out one per scraping task, recycled
+# after a number of page loads (Chrome's memory keeps growing otherwise) or
+# when they crash, and all shut down together at the end of a run.
+# Selenium is only imported once a browser is actually needed, so importing
+# the scrapers (or replaying fixtures) stays cheap.
+import threading
+import time
+
+
+def chromedriver_path():
+    """The chromedriver matching the installed Chrome (pinned, cached, or downloaded; see driver_cache)."""
+    import driver_cache
+    return driver_cache.resolve()
+
+
+def chrome_factory(options, driver_path, page_load_timeout=60):
+    """
+    Return a callable that starts one Chrome instance with the given options.
+    options and driver_path may be functions (e.g. chromedriver_path); they
+    are called once, when the first instance starts.
+    """
+    resolved = []
+
+    def start():
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        if not resolved:
+            resolved.append(options() if callable(options) else options)
+            resolved.append(driver_path() if callable(driver_path) else driver_path)
+        drv = webdriver.Chrome(service=Service(resolved[1]), options=resolved[0])
+        drv.set_page_load_timeout(page_load_timeout)
+        return drv
+    return start
+
+
+class BrowserPool:
+    def __init__(self, factory, size=4, max_page_loads=40, acquire_timeout=None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_page_loads = max_page_loads
+        self.acquire_timeout = acquire_timeout
+        self._idle = []
+        self._loads = {}      # id(driver) -> page loads served by that instance
+        self._leased = {}     # id(driver) -> driver
+        self._cond = threading.Condition()
+        self._closed = False
+        self.started = 0
+        self.recycled = 0
+
+    def _live_count(self):
+        return len(self._idle) + len(self._leased)
+
+    def acquire(self):
+        """Hand out an idle browser, starting a new one if the pool is not full yet."""
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is shut down")
+                if self._idle:
+                    drv = self._idle.pop()
+                    self._leased[id(drv)] = drv
+                    return drv
+                if self._live_count() < self.size:
+                    # reserve the slot while Chrome starts outside the lock
+                    placeholder = object()
+                    self._leased[id(placeholder)] = placeholder
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No browser became available in time")
+                self._cond.wait(remaining)
+        try:
+            drv = self.factory()
+        except Exception:
+            with self._cond:
+                self._leased.pop(id(placeholder), None)
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._leased.pop(id(placeholder), None)
+            self._leased[id(drv)] = drv
+            self._loads[id(drv)] = 0
+            self.started += 1
+        return drv
+
+    def record_page_load(self, drv):
+        with self._cond:
+            if id(drv) in self._loads:
+                self._loads[id(drv)] += 1
+
+    def is_worn_out(self, drv):
+        """True once an instance has served max_page_loads pages and should be replaced."""
+        return bool(self.max_page_loads) and self._loads.get(id(drv), 0) >= self.max_page_loads
+
+    def release(self, drv, broken=False):
+        """Return a browser to the pool; crashed or worn-out instances are quit instead."""
+        with self._cond:
+            if self._leased.pop(id(drv), None) is None:
+                return  # already released (e.g. force-recycled after a timeout)
+            retire = broken or self._closed or self.is_worn_out(drv)
+            if retire:
+                self._loads.pop(id(drv), None)
+                self.recycled += 1
+            else:
+                self._idle.append(drv)
+            self._cond.notify()
+        if retire:
+            _quit(drv)
+
+    def recycle(self, drv):
+        """Quit an instance now and free its slot; the next acquire starts a fresh one."""
+        self.release(drv, broken=True)
+
+    @staticmethod
+    def is_alive(drv):
+        from selenium.common.exceptions import WebDriverException
+        try:
+            drv.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            drivers = self._idle + [d for d in self._leased.values() if hasattr(d, "quit")]
+            self._idle = []
+            self._leased = {}
+            self._loads = {}
+            self._cond.notify_all()
+        for drv in drivers:
+            _quit(drv)
+        if self.started:
+            print(f"🧹 Browser pool closed — {self.started} Chrome instance(s) started, {self.recycled} recycled")
+
+
+def _quit(drv):
+    try:
+        drv.quit()
+    except Exception:
+        pass
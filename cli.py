@@ -0,0 +1,129 @@
+# cli.py
+# One entry point for the daily pipeline and its pieces:
+#
+#   python cli.py scrape [--workers 4]     scrape every source, filter, update the job store
+#                 [--record-fixtures DIR | --replay-fixtures DIR]   save pages / run offline (fixtures.py)
+#   python cli.py filter [path] [--record] re-run the filters over the saved raw candidates
+#   python cli.py send [--dry-run]         email the jobs of the latest run
+#   python cli.py report [source|job|student|day] [--since ...]
+#   python cli.py run                      scrape + send (what the scheduled workflow does)
+#
+# Modules are imported inside each command, so only `scrape` loads Selenium
+# (chromedriver is resolved and Chrome started only once a page actually
+# needs a browser), only `filter` and `scrape` load pandas, and `report`
+# needs neither. benchmarks/bench_startup.py measures the difference.
+import argparse
+import os
+import sys
+import time
+
+_started = time.perf_counter()
+
+
+def scrape(args):
+    # fixtures.py reads these when app.py imports it
+    if getattr(args, "record_fixtures", None):
+        os.environ.update(SCRAPE_FIXTURES="record", SCRAPE_FIXTURE_DIR=args.record_fixtures)
+    elif getattr(args, "replay_fixtures", None):
+        os.environ.update(SCRAPE_FIXTURES="replay", SCRAPE_FIXTURE_DIR=args.replay_fixtures)
+    import app
+    import http_fetch
+    try:
+        jobs = app.fetch_all_jobs(max_workers=args.workers)
+    finally:
+        app.browser_pool.shutdown()
+        http_fetch.close_session()
+    print(f"✅ Found {len(jobs)} matching jobs.")
+    return jobs
+
+
+def filter_saved(args):
+    import batch_filter
+    path = args.path or batch_filter.RAW_CANDIDATES_PATH
+    raw = batch_filter.load_candidates(path)
+    jobs, classified = batch_filter.filter_candidates(raw)
+    print(f"🔁 Re-filtered {len(raw)} stored candidates from {path} (MATCH_MODE={batch_filter.MATCH_MODE})")
+    print(classified["reason"].str.split(":").str[0].value_counts().to_string())
+    print(f"✅ {len(jobs)} unique jobs accepted")
+    if args.record:
+        from job_store import JobStore
+        store = JobStore()
+        new = store.record_run(jobs)
+        print(f"🗃️ Job store updated ({store.path}) — {new} new since the previous run")
+
+
+def send(args):
+    import digest
+    jobs = digest.job_store.still_open()
+    if not jobs:
+        print("⚠️ No jobs in the latest run, nothing to send.")
+        return
+    print(f"📦 {len(jobs)} jobs from the run of {digest.job_store.last_run()['started_at']}")
+    digest.send_email(jobs, dry_run=args.dry_run)
+
+
+def report(args):
+    import analytics
+    from job_store import JobStore
+    from outbox import Outbox
+    if not args.json:
+        run = JobStore().last_run()
+        if run:
+            print(f"🗃️ Latest run {run['started_at']}: {run['jobs_found']} jobs, {run['jobs_new']} new")
+        print(f"📤 Outbox: {Outbox().counts()}")
+    argv = [args.by] + [f"--{k}={v}" for k, v in (("since", args.since), ("until", args.until),
+                                                  ("limit", args.limit)) if v]
+    analytics.main(argv + (["--json"] if args.json else []))
+
+
+def run(args):
+    jobs = scrape(args)
+    if not jobs:
+        print("⚠️ No matching jobs found.")
+        return
+    import digest
+    digest.send_email(jobs, dry_run=args.dry_run)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="cli.py", description="Acadeno job tracker")
+    ap.add_argument("--timing", action="store_true", help="print how long the command took")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scrape", help="scrape, filter and store today's jobs")
+    p.add_argument("--workers", type=int, help="sources scraped in parallel (default SCRAPER_WORKERS)")
+    fx = p.add_mutually_exclusive_group()
+    fx.add_argument("--record-fixtures", metavar="DIR", help="save every page loaded as an offline fixture")
+    fx.add_argument("--replay-fixtures", metavar="DIR", help="serve recorded pages instead of the network")
+    p.set_defaults(func=scrape)
+
+    p = sub.add_parser("filter", help="re-run the filters over saved raw candidates")
+    p.add_argument("path", nargs="?", help="raw candidates file (default RAW_CANDIDATES_PATH)")
+    p.add_argument("--record", action="store_true", help="record the accepted jobs as a run in the job store")
+    p.set_defaults(func=filter_saved)
+
+    p = sub.add_parser("send", help="email the jobs of the latest run")
+    p.add_argument("--dry-run", action="store_true", help="render the digests without queueing or sending")
+    p.set_defaults(func=send)
+
+    p = sub.add_parser("report", help="latest run, outbox and click-through rates")
+    p.add_argument("by", nargs="?", default="source", choices=("student", "job", "source", "day"))
+    p.add_argument("--since")
+    p.add_argument("--until")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=report)
+
+    p = sub.add_parser("run", help="scrape, then send")
+    p.add_argument("--workers", type=int)
+    p.add_argument("--dry-run", action="store_true")
+    p.set_defaults(func=run)
+
+    args = ap.parse_args(argv)
+    args.func(args)
+    if args.timing:
+        print(f"⏱️ {args.command} took {time.perf_counter() - _started:.2f}s (imports included)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
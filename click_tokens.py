@@ -0,0 +1,255 @@
+# click_tokens.py
+# Short signed tokens for tracking links. Instead of ?email=...&job=...&link=...
+# (long, and it puts the student's address in every URL) each "View & Apply"
+# link carries ?t=<token>, where the token packs the index epoch, the
+# student's and the job's numeric ids plus a truncated HMAC:
+#
+#   base64url(varint(epoch) + varint(student_id) + varint(job_id) + HMAC-SHA256(secret, ids)[:6])
+#
+# which is ~20 characters. The tracker decodes the ids, checks the MAC and
+# looks both up in the click index (student id -> email, job id -> title and
+# link) by primary key. The sending run registers its students and jobs in
+# the index, and can push the new entries to a tracker on another host.
+#
+# The epoch is a random number drawn when an index is created. The index
+# lives in data/, which the scheduled run only keeps through a best-effort
+# cache; if it is lost, ids start again from 1 under a new epoch, the
+# tracker drops its old entries when the first push of the new epoch
+# arrives, and tokens of the old epoch are rejected instead of resolving to
+# whatever job now has their id.
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import sqlite3
+import threading
+from contextlib import closing
+
+DEFAULT_PATH = os.path.join("data", "click_index.db")
+MAC_BYTES = 6
+CLICK_TOKEN_SECRET = os.getenv("CLICK_TOKEN_SECRET", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,               -- "epoch"
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,             -- the job store id
+    title TEXT,
+    company TEXT,
+    link TEXT NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_link ON jobs(link);
+"""
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        if pos >= len(data) or shift > 63:
+            raise InvalidToken("truncated token")
+        byte = data[pos]
+        n |= (byte & 0x7F) << shift
+        pos += 1
+        if not byte & 0x80:
+            return n, pos
+        shift += 7
+
+
+def _mac(secret, payload):
+    return hmac.new(secret, payload, hashlib.sha256).digest()[:MAC_BYTES]
+
+
+def _key(secret):
+    secret = secret if secret is not None else CLICK_TOKEN_SECRET
+    if not secret:
+        raise RuntimeError("CLICK_TOKEN_SECRET is not set")
+    return secret.encode() if isinstance(secret, str) else secret
+
+
+def make_token(epoch, student_id, job_id, secret=None):
+    payload = _varint(epoch) + _varint(student_id) + _varint(job_id)
+    return base64.urlsafe_b64encode(payload + _mac(_key(secret), payload)).rstrip(b"=").decode()
+
+
+def make_tokens(epoch, student_id, job_ids, secret=None):
+    """Tokens for one student and many jobs, reusing one keyed HMAC state."""
+    base = hmac.new(_key(secret), digestmod=hashlib.sha256)
+    prefix = _varint(epoch) + _varint(student_id)
+    out = []
+    for job_id in job_ids:
+        payload = prefix + _varint(job_id)
+        mac = base.copy()
+        mac.update(payload)
+        out.append(base64.urlsafe_b64encode(payload + mac.digest()[:MAC_BYTES]).rstrip(b"=").decode())
+    return out
+
+
+def parse_token(token, secret=None):
+    """(epoch, student_id, job_id) from a token; raises InvalidToken if it is malformed or forged."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
+        raise InvalidToken("not base64")
+    if len(raw) <= MAC_BYTES:
+        raise InvalidToken("too short")
+    payload, mac = raw[:-MAC_BYTES], raw[-MAC_BYTES:]
+    epoch, pos = _read_varint(payload, 0)
+    student_id, pos = _read_varint(payload, pos)
+    job_id, pos = _read_varint(payload, pos)
+    if pos != len(payload) or not hmac.compare_digest(mac, _mac(_key(secret), payload)):
+        raise InvalidToken("bad signature")
+    return epoch, student_id, job_id
+
+
+def sign_body(body, secret=None):
+    """Hex HMAC of a request body, for pushing index entries to the tracker."""
+    return hmac.new(_key(secret), body, hashlib.sha256).hexdigest()
+
+
+class ClickIndex:
+    """Student and job lookup tables behind the tokens, cached in memory by id."""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("CLICK_INDEX_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._students = {}   # id -> email
+        self._jobs = {}       # id -> {"title", "company", "link", "source"}
+        self._epoch = None
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)",
+                         (str(random.SystemRandom().randrange(1, 1 << 24)),))
+            conn.commit()
+            self._ready = True
+        return conn
+
+    @property
+    def epoch(self):
+        """Random id of this index's id allocation (fixed when the index is created)."""
+        if self._epoch is None:
+            with closing(self.connect()) as conn:
+                self._epoch = int(conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0])
+        return self._epoch
+
+    def register(self, emails, jobs):
+        """
+        Add this run's students and jobs (job dicts with their store "id").
+        Returns ({email: student_id}, entries) where entries is the JSON-able
+        batch for ClickIndex.load() on a tracker running elsewhere.
+        """
+        emails = list(dict.fromkeys(e.strip().lower() for e in emails))
+        job_rows = [(j["id"], j.get("title", ""), j.get("company", ""), j["link"], j.get("source"))
+                    for j in jobs if j.get("id") is not None and j.get("link")]
+        with self._lock, closing(self.connect()) as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO students (email) VALUES (?)", [(e,) for e in emails])
+            ids = {}
+            for i in range(0, len(emails), 500):
+                chunk = emails[i:i + 500]
+                ids.update(conn.execute(
+                    f"SELECT email, id FROM students WHERE email IN ({','.join('?' * len(chunk))})", chunk))
+            conn.executemany(
+                "INSERT INTO jobs (id, title, company, link, source) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                "link = excluded.link, source = excluded.source", job_rows)
+        entries = {
+            "epoch": self.epoch,
+            "students": [[sid, email] for email, sid in ids.items()],
+            "jobs": [list(r) for r in job_rows],
+        }
+        return ids, entries
+
+    def load(self, entries):
+        """
+        Store index entries produced by register() on the sending side. Entries
+        of a new epoch replace everything indexed under the old one.
+        """
+        epoch = entries.get("epoch")
+        if not isinstance(epoch, int) or isinstance(epoch, bool):
+            raise ValueError("index entries without an epoch")
+        with self._lock, closing(self.connect()) as conn, conn:
+            if epoch != self.epoch:
+                conn.execute("DELETE FROM students")
+                conn.execute("DELETE FROM jobs")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('epoch', ?)", (str(epoch),))
+                self._epoch = epoch
+                self._students.clear()
+                self._jobs.clear()
+            conn.executemany("INSERT OR REPLACE INTO students (id, email) VALUES (?, ?)", entries.get("students", []))
+            conn.executemany("INSERT OR REPLACE INTO jobs (id, title, company, link, source) VALUES (?, ?, ?, ?, ?)",
+                             entries.get("jobs", []))
+            for sid, _ in entries.get("students", []):
+                self._students.pop(sid, None)
+            for row in entries.get("jobs", []):
+                self._jobs.pop(row[0], None)
+
+    def student(self, student_id):
+        if student_id not in self._students:
+            with closing(self.connect()) as conn:
+                row = conn.execute("SELECT email FROM students WHERE id = ?", (student_id,)).fetchone()
+            if row is None:
+                return None
+            self._students[student_id] = row[0]
+        return self._students[student_id]
+
+    def job(self, job_id):
+        if job_id not in self._jobs:
+            with closing(self.connect()) as conn:
+                row = conn.execute("SELECT title, company, link, source FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            self._jobs[job_id] = dict(zip(("title", "company", "link", "source"), row))
+        return self._jobs[job_id]
+
+    def has_link(self, link):
+        """True if some indexed job points at exactly this link (the only targets /click redirects to)."""
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT 1 FROM jobs WHERE link = ? LIMIT 1", (link,)).fetchone() is not None
+
+    def resolve(self, token, secret=None):
+        """(student_id, email, job_id, job) for a token; raises InvalidToken for bad, old or unknown ones."""
+        epoch, student_id, job_id = parse_token(token, secret)
+        if epoch != self.epoch:
+            raise InvalidToken("token from an earlier index epoch")
+        job = self.job(job_id)
+        if job is None:
+            raise InvalidToken("unknown job")
+        return student_id, self.student(student_id), job_id, job
+
+
+def push_entries(url, entries, session, secret=None):
+    """POST index entries to a tracker's /click-index endpoint, signed with the token secret."""
+    body = json.dumps(entries).encode()
+    resp = session.post(url, data=body, timeout=30, headers={
+        "Content-Type": "application/json", "X-Signature": sign_body(body, secret)})
+    resp.raise_for_status()
@@ -0,0 +1,263 @@
+# click_tracker.py
+# Click tracking for the "View & Apply" links, served by the Flask app
+# (appCred.py registers the blueprint). A click is appended to an
+# in-memory buffer and answered with the redirect right away; a background
+# thread flushes the buffer in batches to SQLite (and, if configured, to an
+# append-only JSON lines log and the Google Sheet behind the Apps Script).
+#
+# Point TRACKER_URL at https://<host>/click to use it instead of the Apps
+# Script. Links are either ?t=<token> (see click_tokens.py) or the older
+# ?email=...&job=...&link=... form. GET /analytics serves the click-through
+# reports of analytics.py as JSON to callers holding ANALYTICS_TOKEN; the
+# sending run pushes its sends to POST /analytics/push so the reports here
+# have both sides of the CTR.
+import atexit
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+import requests
+from flask import Blueprint, abort, make_response, redirect, request
+
+from analytics import Analytics
+from click_tokens import ClickIndex, InvalidToken, sign_body
+from job_store import JobStore
+
+DEFAULT_PATH = os.path.join("data", "clicks.db")
+CLICK_FLUSH_SIZE = int(os.getenv("CLICK_FLUSH_SIZE", "200"))
+CLICK_FLUSH_INTERVAL = float(os.getenv("CLICK_FLUSH_INTERVAL", "2"))
+CLICK_LOG_PATH = os.getenv("CLICK_LOG_PATH")           # optional append-only JSON lines log
+CLICK_SHEETS_URL = os.getenv("CLICK_SHEETS_URL")       # optional Apps Script endpoint taking a JSON batch
+CLICK_SHEETS_INTERVAL = float(os.getenv("CLICK_SHEETS_INTERVAL", "60"))
+ANALYTICS_TOKEN = os.getenv("ANALYTICS_TOKEN", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clicks (
+    id INTEGER PRIMARY KEY,
+    clicked_at TEXT NOT NULL,
+    email TEXT,
+    job TEXT,
+    link TEXT,
+    user_agent TEXT,
+    synced INTEGER NOT NULL DEFAULT 0,   -- 1 once pushed to Sheets
+    student_id INTEGER,                  -- from a token link (NULL for ?email= links)
+    job_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_clicks_clicked_at ON clicks(clicked_at);
+CREATE INDEX IF NOT EXISTS idx_clicks_unsynced ON clicks(synced) WHERE synced = 0;
+"""
+
+INSERT = ("INSERT INTO clicks (clicked_at, email, job, link, user_agent, student_id, job_id) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+CLICK_COLUMNS = ("clicked_at", "email", "job", "link", "user_agent", "student_id", "job_id")
+
+
+class ClickBuffer:
+    """
+    Collects clicks in memory and writes them in batches from one
+    background thread, so the request path never waits on the disk.
+    """
+
+    def __init__(self, path=None, flush_size=CLICK_FLUSH_SIZE, flush_interval=CLICK_FLUSH_INTERVAL,
+                 log_path=CLICK_LOG_PATH, sheets_url=CLICK_SHEETS_URL, sheets_interval=CLICK_SHEETS_INTERVAL):
+        self.path = path or os.getenv("CLICK_DB_PATH", DEFAULT_PATH)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.log_path = log_path
+        self.sheets_url = sheets_url
+        self.sheets_interval = sheets_interval
+        self._pending = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._last_sync = time.monotonic()
+        self._ready = False
+        self.flushed = 0
+        self.batches = 0
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            have = {r[1] for r in conn.execute("PRAGMA table_info(clicks)")}
+            for col in ("student_id", "job_id"):
+                if col not in have:
+                    conn.execute(f"ALTER TABLE clicks ADD COLUMN {col} INTEGER")
+            self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="click-flusher", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def record(self, email, job, link, user_agent="", student_id=None, job_id=None):
+        """Queue one click (O(1), no I/O); wakes the flusher once a batch is full."""
+        row = (datetime.now().isoformat(timespec="seconds"), email, job, link, user_agent, student_id, job_id)
+        with self._cond:
+            self._pending.append(row)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify()
+        if self._thread is None:
+            self.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopped and len(self._pending) < self.flush_size:
+                    self._cond.wait(self.flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if self.sheets_url and time.monotonic() - self._last_sync >= self.sheets_interval:
+                self.sync_sheets()
+            if stopped:
+                return
+
+    def flush(self):
+        """Write every buffered click in one transaction (and to the log, if any)."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                with closing(self.connect()) as conn, conn:
+                    conn.executemany(INSERT, batch)
+            except sqlite3.Error as e:
+                print(f"⚠️ Click flush failed, keeping {len(batch)} clicks buffered: {e}")
+                with self._cond:
+                    self._pending[:0] = batch
+                return 0
+            if self.log_path:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(dict(zip(CLICK_COLUMNS, r)), ensure_ascii=False) + "\n" for r in batch)
+            self.flushed += len(batch)
+            self.batches += 1
+            return len(batch)
+
+    def sync_sheets(self, limit=500):
+        """Push unsynced clicks to the Sheets endpoint as one JSON batch."""
+        self._last_sync = time.monotonic()
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, clicked_at, email, job, link FROM clicks WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,)).fetchall()
+            if not rows:
+                return 0
+            payload = [dict(zip(("clicked_at", "email", "job", "link"), r[1:])) for r in rows]
+            try:
+                resp = requests.post(self.sheets_url, json={"clicks": payload}, timeout=30)
+                resp.raise_for_status()
+            except requests.RequestException as e:
+                print(f"⚠️ Sheets sync failed, will retry: {e}")
+                return 0
+            with conn:
+                conn.executemany("UPDATE clicks SET synced = 1 WHERE id = ?", [(r[0],) for r in rows])
+        return len(rows)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+
+click_buffer = ClickBuffer()
+click_index = ClickIndex()
+# jobs found by the scraper, when it runs on the same host as the tracker
+job_store = JobStore()
+analytics = Analytics(clicks_path=click_buffer.path)
+tracker_bp = Blueprint("click_tracker", __name__)
+
+
+@tracker_bp.get("/click")
+def track_click():
+    user_agent = request.headers.get("User-Agent", "")[:200]
+    token = request.args.get("t")
+    if token:
+        try:
+            student_id, email, job_id, job = click_index.resolve(token)
+        except (InvalidToken, RuntimeError):
+            abort(404)
+        click_buffer.record(email, job["title"], job["link"], user_agent, student_id, job_id)
+        return redirect(job["link"], code=302)
+
+    # ?link= emails: only links of jobs we know, so /click is not an open redirect
+    link = request.args.get("link", "")
+    if not link.startswith(("http://", "https://")) or not (click_index.has_link(link) or job_store.has_link(link)):
+        abort(400)
+    click_buffer.record(request.args.get("email", ""), request.args.get("job", ""), link, user_agent)
+    return redirect(link, code=302)
+
+
+def _signed_json():
+    """The request body as JSON, if signed with CLICK_TOKEN_SECRET; aborts otherwise."""
+    body = request.get_data()
+    try:
+        expected = sign_body(body)
+    except RuntimeError:
+        abort(503)
+    if not hmac.compare_digest(expected, request.headers.get("X-Signature", "")):
+        abort(403)
+    try:
+        return json.loads(body or b"{}")
+    except ValueError:
+        abort(make_response({"error": "body is not valid JSON"}, 400))
+
+
+@tracker_bp.post("/click-index")
+def load_click_index():
+    """Index entries pushed by the sending run, signed with CLICK_TOKEN_SECRET."""
+    entries = _signed_json()
+    if not isinstance(entries, dict) or not all(isinstance(entries.get(k, []), list) for k in ("students", "jobs")):
+        return {"error": "expected an object with \"students\" and \"jobs\" lists"}, 400
+    try:
+        click_index.load(entries)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        return {"error": f"malformed index entries: {e}"}, 400
+    return {"students": len(entries.get("students", [])), "jobs": len(entries.get("jobs", []))}, 200
+
+
+@tracker_bp.post("/analytics/push")
+def load_analytics():
+    """Jobs, sends and scrape times recorded by the sending run (Analytics.push), signed like /click-index."""
+    entries = _signed_json()
+    if not isinstance(entries, dict):
+        return {"error": "expected an object with \"jobs\", \"sends\" and \"scrapes\" lists"}, 400
+    try:
+        analytics.load(entries)
+    except (sqlite3.Error, AttributeError, KeyError, TypeError, ValueError) as e:
+        return {"error": f"malformed analytics entries: {e!r}"}, 400
+    return {k: len(entries.get(k, [])) for k in ("jobs", "sends", "scrapes")}, 200
+
+
+@tracker_bp.get("/analytics")
+def engagement():
+    """CTR rows: /analytics?by=student|job|source|day&since=YYYY-MM-DD&until=...&limit=N"""
+    if not ANALYTICS_TOKEN:
+        abort(503)
+    given = request.headers.get("Authorization", "").removeprefix("Bearer ") or request.args.get("key", "")
+    if not hmac.compare_digest(ANALYTICS_TOKEN, given):
+        abort(403)
+    click_buffer.flush()
+    by = request.args.get("by", "source")
+    try:
+        rows = analytics.report(by, request.args.get("since"), request.args.get("until"),
+                                request.args.get("limit", type=int))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return {"by": by, "rows": rows}, 200
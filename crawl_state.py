@@ -0,0 +1,64 @@
+# crawl_state.py
+# Remembers which postings each paginated source has already shown us, so the
+# next run can stop paginating once it reaches postings it has seen before.
+import json
+import os
+import threading
+import time
+
+from url_canon import link_key
+
+DEFAULT_PATH = os.path.join(".cache", "crawl_state.json")
+MAX_KEYS_PER_SOURCE = 5000
+
+
+def posting_key(title, company, link):
+    """Stable identity of a posting: its canonical link / portal job id, or title|company when there is none."""
+    key = link_key(link)
+    if key:
+        return key
+    return f"{(title or '').strip().lower()}|{(company or '').strip().lower()}"
+
+
+class CrawlState:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("CRAWL_STATE_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._sources = None
+        self._dirty = False
+
+    def _load(self):
+        if self._sources is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._sources = json.load(f)
+            except (OSError, ValueError):
+                self._sources = {}
+        return self._sources
+
+    def known(self, source):
+        """Set of posting keys seen for source in previous runs (empty on the first run)."""
+        with self._lock:
+            return set(self._load().get(source, {}).get("keys", []))
+
+    def update(self, source, keys):
+        """Record the keys seen this run; the most recent ones are kept first."""
+        with self._lock:
+            entry = self._load().setdefault(source, {"keys": []})
+            fresh = list(dict.fromkeys(keys))
+            fresh_set = set(fresh)
+            merged = fresh + [k for k in entry["keys"] if k not in fresh_set]
+            entry["keys"] = merged[:MAX_KEYS_PER_SOURCE]
+            entry["updated"] = time.time()
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._sources, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
@@ -0,0 +1,176 @@
+# digest.py
+# The daily email: ranks the jobs for each student, renders the digests and
+# hands them to the outbox for delivery. Kept apart from the scrapers in
+# app.py so sending (cli.py send) does not import Selenium or start Chrome.
+import os
+import time
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import numpy as np
+
+import click_tokens
+import email_render
+import http_fetch
+import ranking
+import analytics as analytics_db
+from job_store import JobStore, job_key
+from outbox import Outbox, dispatch
+from send_history import SendHistory, sent_flags
+from student_profiles import load_profiles
+
+job_store = JobStore()
+# Digests waiting to be delivered, and which jobs each student has been sent already
+outbox = Outbox()
+send_history = SendHistory()
+# Weekday (e.g. "mon") on which digests also list earlier jobs that are still open; empty = never
+STILL_OPEN_ROLLUP_DAY = os.getenv("STILL_OPEN_ROLLUP_DAY", "").strip().lower()[:3]
+STILL_OPEN_MAX = int(os.getenv("STILL_OPEN_MAX", "20"))
+# Jobs per digest after ranking against the student's profile skills (0 = all)
+DIGEST_TOP_K = int(os.getenv("DIGEST_TOP_K", "30"))
+# Students and jobs behind the short tracking tokens; pushed to the tracker's
+# /click-index endpoint when it runs elsewhere
+click_index = click_tokens.ClickIndex()
+CLICK_INDEX_URL = os.getenv("CLICK_INDEX_URL")
+# Daily send / click rollups behind the CTR reports (python analytics.py);
+# sends are also pushed to the tracker, where the clicks arrive
+analytics = analytics_db.Analytics(push_url=analytics_db.PUSH_URL)
+
+
+# -------------------------
+# EMAIL (original styling & env usage preserved)
+# -------------------------
+def send_email(jobs, dry_run=False):
+    """Rank, render and queue today's digests, then deliver them through the outbox (dry_run: render only)."""
+    sender = os.getenv("EMAIL_USER")
+    password = os.getenv("EMAIL_PASS")
+    recipients = [x.strip() for x in os.getenv("EMAIL_TO", "").split(",") if x.strip()]
+
+    # Read STUDENT_NAMES from secrets/env
+    raw_names = os.getenv("STUDENT_NAMES", "")
+    student_names = [
+        x.strip() for x in raw_names.replace("\r", "")
+        .replace("\n", "")
+        .replace(" ,", ",")
+        .replace(", ", ",")
+        .split(",") if x.strip()
+    ]
+    tracker_url = os.getenv("TRACKER_URL")
+
+    subject = f"Acadeno Technologies | Latest Jobs Updates – {datetime.now().strftime('%d %b %Y')}"
+    logo_url = "https://drive.google.com/uc?export=view&id=1wLdjI3WqmmeZcCbsX8aADhP53mRXthtB"
+
+    if len(student_names) != len(recipients):
+        print(f"⚠️ Warning: STUDENT_NAMES count ({len(student_names)}) != EMAIL_TO count ({len(recipients)}). Proceeding by index.")
+
+    # Each student only gets the jobs they have not been emailed before (plus,
+    # on the roll-up day, earlier ones that are still open), ranked against
+    # their profile skills and cut to the top DIGEST_TOP_K. Students with the
+    # same selection share one pre-rendered digest; per student only the name
+    # and tracking-link email are filled in.
+    # jobs not in the store yet (e.g. from `cli.py filter` without --record) get an
+    # id too, so they can be recorded in the send history like every other job
+    ids = job_store.ids_for(jobs, create=not dry_run)
+    job_ids = [ids.get(job_key(j)) for j in jobs]
+    rollup = STILL_OPEN_ROLLUP_DAY and datetime.now().strftime("%a").lower() == STILL_OPEN_ROLLUP_DAY
+    still_open = job_store.still_open() if rollup else []
+    digests, card_cache = {}, {}
+
+    profiles = load_profiles()
+    sent_before = [send_history.sent_bitmap(e) for e in recipients]
+    eligible = ~np.array([sent_flags(bits, job_ids) for bits in sent_before],
+                         dtype=bool).reshape(len(recipients), len(jobs))
+    index_started = time.monotonic()
+    job_index = ranking.JobIndex(jobs)
+    scores = job_index.scores([profiles.get(e.lower(), {}).get("skills", []) for e in recipients])
+    ranked = ranking.top_k(scores, DIGEST_TOP_K, eligible)
+    print(f"🎯 Ranked {len(jobs)} jobs for {len(recipients)} students over {len(job_index.terms)} terms "
+          f"in {time.monotonic() - index_started:.2f}s ({sum(e.lower() in profiles for e in recipients)} with profiles)")
+
+    # Short signed per-(student, job) tokens instead of ?email=&job=&link= links
+    use_tokens = bool(click_tokens.CLICK_TOKEN_SECRET)
+    if use_tokens:
+        jobs = [dict(j, id=i) for j, i in zip(jobs, job_ids)]
+        epoch = click_index.epoch
+        if dry_run:
+            # throwaway ids, only so the rendered digests have realistic tokens
+            student_ids = {e.strip().lower(): n for n, e in enumerate(recipients, 1)}
+        else:
+            student_ids, entries = click_index.register(recipients, jobs + still_open)
+            if CLICK_INDEX_URL:
+                click_tokens.push_entries(CLICK_INDEX_URL, entries, http_fetch.get_session())
+            print(f"🔑 Click index updated: {len(entries['students'])} students, {len(entries['jobs'])} jobs")
+
+    if not dry_run:
+        analytics.record_jobs([dict(j, id=i) for j, i in zip(jobs, job_ids)] + still_open)
+
+    messages, names, delivered_ids, carried = [], {}, {}, {}
+    for index, student_email in enumerate(recipients):
+        student_name = student_names[index] if index < len(student_names) else "Student"
+        fresh = [int(k) for k in ranked[index]]
+        fresh_ids = {job_ids[k] for k in fresh}
+        reminders = [j for j in still_open if (sent_before[index] >> j["id"]) & 1 and j["id"] not in fresh_ids]
+        reminders = reminders[-STILL_OPEN_MAX:] if STILL_OPEN_MAX else []
+        if not fresh and not reminders:
+            print(f"⏭️ Nothing new for {student_name} ({student_email}), skipping")
+            continue
+
+        key = (tuple(fresh), tuple(j["id"] for j in reminders))
+        if key not in digests:
+            digests[key] = email_render.compile_digest(
+                [jobs[k] for k in fresh], tracker_url, logo_url=logo_url,
+                still_open=reminders, card_cache=card_cache, tokens=use_tokens)
+        tokens = None
+        if use_tokens:
+            linked = [i for i in [job_ids[k] for k in fresh] + [j["id"] for j in reminders] if i is not None]
+            sid = student_ids[student_email.strip().lower()]
+            tokens = dict(zip(map(email_render.token_field, linked), click_tokens.make_tokens(epoch, sid, linked)))
+        html = email_render.render_digest(digests[key], student_name, student_email, tokens)
+
+        msg = MIMEMultipart("alternative")
+        msg["From"] = sender
+        msg["To"] = student_email
+        msg["Subject"] = subject
+        msg.attach(MIMEText(html, "html"))
+        messages.append(msg)
+        names[student_email] = student_name
+        delivered_ids[student_email] = [i for i in fresh_ids if i is not None]
+        carried[student_email] = [dict(jobs[k], id=job_ids[k]) for k in fresh] + reminders
+
+    print(f"🧮 {len(messages)} digests from {len(digests)} distinct job selection(s)"
+          f"{', with still-open roll-up' if rollup else ''}")
+    if dry_run:
+        size = sum(len(m.as_bytes()) for m in messages) / max(1, len(messages))
+        print(f"🧪 Dry run: nothing queued or sent ({size / 1024:.1f} KB per email on average)")
+        return
+
+    # Messages are queued in the outbox first, so a failed send is retried
+    # later and a rerun of today's batch skips students already mailed.
+    batch = os.getenv("OUTBOX_BATCH") or f"digest-{datetime.now():%Y-%m-%d}"
+    pending = outbox.enqueue(batch, messages, job_ids=delivered_ids)
+    print(f"📤 {len(messages)} emails queued in {outbox.path} (batch {batch}), {pending} still to send")
+
+    def sent(row, result):
+        name = names.get(row["recipient"], "Student")
+        if isinstance(result, Exception):
+            print(f"❌ Email to {name} ({row['recipient']}) failed, attempt {row['attempts']}: {result}")
+        else:
+            analytics.record_send(row["recipient"], carried.get(row["recipient"], []))
+            print(f"✅ Email sent to {name} ({row['recipient']}) in {result * 1000:.0f} ms")
+
+    counts = dispatch(outbox, sender, password, batch=batch, on_result=sent, send_history=send_history)
+    print(f"📬 Outbox batch {batch}: {counts}")
+    push_analytics()
+
+
+def push_analytics():
+    """Send the jobs, sends and scrape times recorded this run to the tracker's /analytics/push."""
+    if not analytics.push_url:
+        return
+    try:
+        pushed = analytics.push(http_fetch.get_session())
+    except Exception as e:
+        print(f"⚠️ Analytics push to {analytics.push_url} failed: {e}")
+        return
+    print(f"📈 {pushed} analytics records pushed to {analytics.push_url}")
@@ -0,0 +1,125 @@
+# driver_cache.py
+# Finds a chromedriver for the installed Chrome without asking
+# webdriver_manager (a network round trip, and a failure when offline) on
+# every run. In order:
+#   1. CHROMEDRIVER_PATH, if set: a pinned driver, used as is;
+#   2. the cache manifest (data/chromedriver.json), keyed by the installed
+#      Chrome major version;
+#   3. a chromedriver already on the machine (CHROMEWEBDRIVER on GitHub's
+#      runners, or PATH) whose major version matches;
+#   4. ChromeDriverManager().install(), whose result is then cached.
+# If all of that fails (e.g. offline with a new Chrome), the newest cached
+# driver is tried as a last resort.
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+CACHE_PATH = os.getenv("CHROMEDRIVER_CACHE", os.path.join("data", "chromedriver.json"))
+CHROME_CANDIDATES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+                     "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+VERSION_RE = re.compile(r"(\d+)\.\d+\.\d+")
+
+_lock = threading.Lock()
+
+
+def _major(binary):
+    """Major version printed by `<binary> --version`, or None."""
+    try:
+        out = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    m = VERSION_RE.search(out)
+    return m.group(1) if m else None
+
+
+def chrome_major(binary=None):
+    """Major version of the Chrome that Selenium will start (CHROME_BINARY or the first one found)."""
+    for candidate in [binary or os.getenv("CHROME_BINARY")] + CHROME_CANDIDATES:
+        path = candidate and shutil.which(candidate)
+        if path:
+            major = _major(path)
+            if major:
+                return major
+    return None
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _load(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(cache_path, manifest):
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp = cache_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, cache_path)
+
+
+def _local_driver(major):
+    """A chromedriver already installed on this machine with the same major version."""
+    candidates = []
+    if os.getenv("CHROMEWEBDRIVER"):
+        candidates.append(os.path.join(os.environ["CHROMEWEBDRIVER"], "chromedriver"))
+    candidates.append(shutil.which("chromedriver"))
+    for path in candidates:
+        if _usable(path) and _major(path) == major:
+            return path
+    return None
+
+
+def _manager_install():
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve(cache_path=None, install=_manager_install):
+    """Path to a chromedriver; prints where it came from and how long resolving took."""
+    cache_path = cache_path or CACHE_PATH
+    started = time.perf_counter()
+    with _lock:
+        path, how = _resolve(cache_path, install)
+    print(f"🧭 chromedriver {path} ({how}) resolved in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return path
+
+
+def _resolve(cache_path, install):
+    pinned = os.getenv("CHROMEDRIVER_PATH")
+    if pinned:
+        if not _usable(pinned):
+            raise RuntimeError(f"CHROMEDRIVER_PATH={pinned} is not an executable file")
+        return pinned, "pinned by CHROMEDRIVER_PATH"
+
+    manifest = _load(cache_path)
+    major = chrome_major()
+    key = major or "unknown"
+    cached = manifest.get(key, {}).get("path")
+    if _usable(cached):
+        return cached, f"cached for Chrome {key}"
+
+    path, how = (_local_driver(major) if major else None), "installed locally"
+    if not path:
+        try:
+            path, how = install(), "downloaded by webdriver_manager"
+        except Exception as e:
+            fallback = max((v for v in manifest.values() if _usable(v.get("path"))),
+                           key=lambda v: v.get("resolved_at", ""), default=None)
+            if fallback is None:
+                raise
+            print(f"⚠️ webdriver_manager failed ({e}); trying the cached driver for Chrome {fallback['chrome']}")
+            return fallback["path"], "stale cache fallback"
+
+    manifest[key] = {"path": path, "chrome": major, "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    _save(cache_path, manifest)
+    return path, how
@@ -0,0 +1,183 @@
+# email_render.py
+# Renders the daily job digest. Everything that is the same for every student
+# (header, motivational text, job cards, footer) is rendered once per run into
+# a precompiled template; per recipient only the student's name and the
+# email parameter of the tracking links are filled in, with a single join.
+import re
+import urllib.parse
+from datetime import datetime
+
+LOGO_URL = "https://drive.google.com/uc?export=view&id=1wLdjI3WqmmeZcCbsX8aADhP53mRXthtB"
+
+HEADER = """
+        <html>
+        <body style="font-family:Arial, sans-serif; background:#f4f8f5; padding:25px; line-height:1.6;">
+
+        <!-- HEADER -->
+        <div style="background:linear-gradient(90deg, #5B00C2, #FF6B00); padding:25px; border-radius:15px; color:white; text-align:center;">
+            <img src="{{logo_url}}" alt="Acadeno Logo" style="width:120px; height:auto; margin-bottom:12px; border-radius:10px;">
+            <h2 style="margin:0; font-size:22px;">Acadeno Technologies Private Limited</h2>
+        </div>
+
+         <!-- BODY -->
+        <div style="background:white; padding:25px; border-radius:12px; margin-top:25px; box-shadow:0 2px 5px rgba(0,0,0,0.1);">
+            <p>Dear <b style="color:#5B00C2;">{{student_name}}</b>,</p>
+
+            <p>Every great career begins with a single step — a moment of courage, determination, and belief in yourself. 🌱</p>
+
+            <p>At Acadeno Technologies, we believe that your journey matters as much as your destination. The opportunities before you are not just job openings — they are doors to your future, waiting for you to knock with confidence, curiosity, and commitment. 💡</p>
+
+            <p><b>Remember:</b> You don’t need to be perfect to begin — you just need to begin.</p>
+
+            <p>Every interview you attend, every resume you refine, and every challenge you face brings you one step closer to your goal. Growth happens when you step out of your comfort zone and trust your own potential.</p>
+
+            <p>So take this chance, believe in your abilities, and give your best. The effort you put in today will become the story you’re proud to tell tomorrow. 🌟</p>
+
+            <p>Your future is not waiting to happen — it’s waiting for you to make it happen.</p>
+
+            <p>With best wishes,</p>
+            <p><b>Team Acadeno Technologies Pvt. Ltd.</b></p>
+        </div>
+        <!-- JOB LIST -->
+        <div style="margin-top:20px;">
+        """
+
+JOB_CARD = """
+            <div style="border:1px solid #ddd; border-radius:10px; padding:15px; background:#ffffff; margin-bottom:12px;">
+                <h3 style="color:#5B00C2; margin:0;">{{title}}</h3>
+                <p style="margin:6px 0;">🏢 {{company}}</p>
+                <a href="{{tracker_url}}?email={{email}}&job={{safe_title}}&link={{safe_link}}" style="display:inline-block; background:linear-gradient(90deg,#FF6B00,#5B00C2); color:white; padding:8px 14px; text-decoration:none; border-radius:6px; font-weight:bold;">🔗 View & Apply</a>
+            </div>
+            """
+
+# with CLICK_TOKEN_SECRET set, links carry one short signed token per (student, job) instead
+JOB_CARD_TOKEN = JOB_CARD.replace(
+    "{{tracker_url}}?email={{email}}&job={{safe_title}}&link={{safe_link}}", "{{tracker_url}}?t={{token}}")
+
+FOOTER = """
+        </div>
+        <p style="font-size:12px; color:#777; margin-top:25px; text-align:center;">
+            Generated by Maitexa Job Tracker © {{year}}
+        </p>
+        </body>
+        </html>
+        """
+
+# weekly roll-up of postings a student was sent before that are still listed
+STILL_OPEN_HEADING = """
+            <h3 style="color:#FF6B00; margin:25px 0 10px;">📌 Still open from earlier emails</h3>
+            """
+
+_FIELD_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+class PrecompiledTemplate:
+    """
+    A template split once into literal text and {{field}} slots. partial()
+    fills some fields ahead of time; render() fills the rest and joins.
+    """
+
+    def __init__(self, text=None, parts=None):
+        if parts is None:
+            parts = []
+            for i, piece in enumerate(_FIELD_RE.split(text or "")):
+                parts.append(("field", piece) if i % 2 else ("text", piece))
+        # merge neighbouring literals so render() has as few pieces as possible
+        merged = []
+        for kind, value in parts:
+            if kind == "text" and merged and merged[-1][0] == "text":
+                merged[-1] = ("text", merged[-1][1] + value)
+            elif not (kind == "text" and value == ""):
+                merged.append((kind, value))
+        self.parts = merged
+        self._pieces = [value if kind == "text" else "" for kind, value in merged]
+        self._slots = [(i, value) for i, (kind, value) in enumerate(merged) if kind == "field"]
+
+    @property
+    def fields(self):
+        return {name for _, name in self._slots}
+
+    def partial(self, **values):
+        """New template with the given fields filled in permanently."""
+        return PrecompiledTemplate(parts=[
+            ("text", values[v]) if kind == "field" and v in values else (kind, v) for kind, v in self.parts
+        ])
+
+    def rename(self, old, new):
+        """Same template with field `old` called `new`."""
+        return PrecompiledTemplate(parts=[
+            (kind, new if kind == "field" and v == old else v) for kind, v in self.parts
+        ])
+
+    @classmethod
+    def concat(cls, templates):
+        return cls(parts=[p for t in templates for p in t.parts])
+
+    def render(self, **values):
+        pieces = list(self._pieces)
+        for i, name in self._slots:
+            pieces[i] = values[name]
+        return "".join(pieces)
+
+
+_HEADER_T = PrecompiledTemplate(HEADER)
+_CARD_T = PrecompiledTemplate(JOB_CARD)
+_TOKEN_CARD_T = PrecompiledTemplate(JOB_CARD_TOKEN)
+_FOOTER_T = PrecompiledTemplate(FOOTER)
+_STILL_OPEN_T = PrecompiledTemplate(STILL_OPEN_HEADING)
+
+
+def token_field(job_id):
+    return f"t{job_id}"
+
+
+def job_card(job, tracker_url, tokens=False):
+    """
+    One job card with everything but the recipient's email filled in, or,
+    with tokens=True (and a job store "id"), everything but the card's
+    token, in a field named token_field(job["id"]).
+    """
+    if tokens and job.get("id") is not None:
+        return _TOKEN_CARD_T.partial(
+            title=job["title"], company=job["company"], tracker_url=str(tracker_url),
+        ).rename("token", token_field(job["id"]))
+    return _CARD_T.partial(
+        title=job["title"],
+        company=job["company"],
+        tracker_url=str(tracker_url),  # same text the f-string produced, even if unset
+        safe_title=urllib.parse.quote(job["title"], safe=""),
+        safe_link=urllib.parse.quote(job["link"], safe=""),
+    )
+
+
+def compile_digest(jobs, tracker_url, logo_url=LOGO_URL, year=None, still_open=(), card_cache=None,
+                   tokens=False):
+    """
+    Pre-render the digest for a list of jobs (plus an optional "still open"
+    section). The result only has the student_name and email (URL-quoted)
+    fields left, plus one token field per job when tokens=True; see
+    render_digest(). Pass the same card_cache dict when compiling several
+    digests in a run so each job card is built once.
+    """
+    year = year or datetime.now().year
+    cache = {} if card_cache is None else card_cache
+
+    def cards(items):
+        out = []
+        for job in items:
+            key = (job["title"], job["company"], job["link"], tokens and job.get("id"))
+            if key not in cache:
+                cache[key] = job_card(job, tracker_url, tokens)
+            out.append(cache[key])
+        return out
+
+    parts = [_HEADER_T.partial(logo_url=logo_url)] + cards(jobs)
+    if still_open:
+        parts += [_STILL_OPEN_T] + cards(still_open)
+    return PrecompiledTemplate.concat(parts + [_FOOTER_T.partial(year=str(year))])
+
+
+def render_digest(digest, student_name, student_email, tokens=None):
+    """tokens: {token_field(job_id): token} for digests compiled with tokens=True."""
+    return digest.render(student_name=student_name, email=urllib.parse.quote(student_email, safe=""),
+                         **(tokens or {}))
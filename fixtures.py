@@ -0,0 +1,117 @@
+# fixtures.py
+# Recorded pages for offline scraper runs. With SCRAPE_FIXTURES=record every
+# page a source loads (plain HTTP or Chrome, after scrolling) is saved under
+# SCRAPE_FIXTURE_DIR, one directory per source plus an index by URL. With
+# SCRAPE_FIXTURES=replay, app.py serves those pages instead: static fetches
+# and driver.get never touch the network or start Chrome, and a URL that was
+# not recorded behaves like a failed load. A replay crawls with an empty
+# history of its own and writes its raw candidates and filter decisions
+# under <SCRAPE_FIXTURE_DIR>/replay-output, leaving the live data/ and
+# .cache/ files alone. That makes parser, filter and
+# dedupe changes testable and measurable (benchmarks/bench_scrapers.py) on a
+# machine without network access.
+#
+#   python cli.py scrape --record-fixtures data/fixtures/2025-11-14
+#   python cli.py scrape --replay-fixtures data/fixtures/2025-11-14
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from response_cache import CachedPage
+
+DEFAULT_DIR = os.path.join("data", "fixtures")
+INDEX = "index.json"
+OUTPUT_DIR = "replay-output"
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", (name or "unknown").lower()).strip("-") or "unknown"
+
+
+class FixtureStore:
+    def __init__(self, directory=None, mode=None):
+        self.directory = directory or os.getenv("SCRAPE_FIXTURE_DIR", DEFAULT_DIR)
+        self.mode = (mode if mode is not None else os.getenv("SCRAPE_FIXTURES", "")).lower()
+        self._lock = threading.Lock()
+        self._index = None
+        self.served = 0
+        self.missing = 0
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def index(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, INDEX), encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def save(self, url, html, source=None, via="http"):
+        """Store one page (and its index entry) for `source`."""
+        name = f"{_slug(source)}/{hashlib.sha1(url.encode()).hexdigest()[:16]}.html"
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        with self._lock:
+            index = self.index()
+            index[url] = {"file": name, "source": source, "via": via,
+                          "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            tmp = os.path.join(self.directory, INDEX + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=1, ensure_ascii=False)
+            os.replace(tmp, os.path.join(self.directory, INDEX))
+
+    def load(self, url):
+        """Recorded HTML for url, or None."""
+        entry = self.index().get(url)
+        if entry is None:
+            with self._lock:
+                self.missing += 1
+            return None
+        with open(os.path.join(self.directory, entry["file"]), encoding="utf-8") as f:
+            html = f.read()
+        with self._lock:
+            self.served += 1
+        return html
+
+    def page(self, url):
+        """A CachedPage for the static fetch path (never "unchanged", so it is always parsed)."""
+        html = self.load(url)
+        if html is None:
+            return None
+        return CachedPage(url, html, hashlib.sha256(html.encode("utf-8", "replace")).hexdigest(), "fixture",
+                          time.time())
+
+    def output_path(self, name):
+        """Where a replay writes `name` instead of the live file."""
+        return os.path.join(self.directory, OUTPUT_DIR, name)
+
+    def report(self):
+        if self.replaying:
+            return f"📼 Fixtures ({self.directory}): {self.served} pages replayed, {self.missing} not recorded"
+        if self.recording:
+            return f"📼 Fixtures ({self.directory}): {len(self.index())} pages recorded"
+        return None
+
+
+class ReplayDriver:
+    """Stands in for a Chrome driver in replay mode: page_source is the recorded page."""
+
+    def __init__(self, url, html):
+        self.current_url = url
+        self.page_source = html
+
+
+store = FixtureStore()
@@ -0,0 +1,217 @@
+# fuzzy_dedupe.py
+# Near-duplicate stage after the exact dedupe: the same role posted on
+# Infopark, Naukri and LinkedIn with slightly different titles and company
+# strings ("Techversant Infotech Pvt Ltd" vs "Techversant") is collapsed
+# into one job, keeping the best link of the cluster.
+#
+# Titles are shingled into character n-grams and summarised as MinHash
+# signatures; LSH banding only compares jobs that share a band bucket (and,
+# inside a bucket, the same normalized company), so the stage stays
+# sub-quadratic as the job count grows. Candidate pairs are confirmed on
+# the shingle-set similarity of their titles and clustered with union-find,
+# which never lets a cluster span two named employers or two different
+# direct (non-portal) links: those are separate openings however alike the
+# titles are.
+import os
+import re
+import urllib.parse
+import zlib
+
+import numpy as np
+
+from matcher import tokenize
+from url_canon import canonical_url, source_job_id
+
+NUM_PERM = 64
+BANDS = 16                       # 16 bands x 4 rows: pairs around 0.5 similarity start to collide
+SHINGLE = 3
+TITLE_THRESHOLD = float(os.getenv("FUZZY_TITLE_THRESHOLD", "0.6"))
+# a job with no usable company only joins a cluster on a near-identical title
+UNKNOWN_COMPANY_THRESHOLD = 0.85
+
+# legal suffixes and generic words that vary between listings of one employer
+COMPANY_STOPWORDS = {
+    "pvt", "private", "ltd", "limited", "llp", "llc", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "the", "india", "technologies", "technology", "tech", "infotech",
+    "solutions", "software", "softwares", "systems", "services", "labs", "global", "consulting",
+    "consultancy", "it", "infosystems", "digital", "group", "and",
+}
+# what the scrapers write when a posting has no company: the portal name, or
+# the park whose careers page listed it (a bare host for the Bengaluru pages)
+UNKNOWN_COMPANIES = {
+    "", "indeed", "naukri", "linkedin",
+    "infopark", "technopark", "cyberpark", "smartcity kochi", "tidel park", "tidel park chennai",
+    "stpi", "stpi india",
+}
+HOST_RE = re.compile(r"(?:[\w-]+\.)+[a-z]{2,}")
+PORTALS = {"Indeed", "Naukri", "LinkedIn"}
+PORTAL_HOSTS = ("indeed.", "naukri.com", "linkedin.com")
+# level words that make two otherwise identical titles different openings
+# ("Python Developer Intern" is not "Python Developer")
+LEVELS = {"intern": "intern", "internship": "intern", "trainee": "trainee", "apprentice": "apprentice",
+          "senior": "senior", "sr": "senior", "lead": "lead", "principal": "principal"}
+
+_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(1234)
+_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+
+def normalize_company(name):
+    """'Techversant Infotech Pvt. Ltd.' -> 'techversant'; placeholders and empties -> ''."""
+    name = (name or "").strip().lower()
+    tokens = tokenize(re.sub(r"[^\w\s]", " ", name))
+    if " ".join(tokens) in UNKNOWN_COMPANIES or HOST_RE.fullmatch(name):
+        return ""
+    core = [t for t in tokens if t not in COMPANY_STOPWORDS]
+    return " ".join(core or tokens)
+
+
+def shingles(title):
+    text = " ".join(tokenize(title or ""))
+    if len(text) <= SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def levels(title):
+    return frozenset(LEVELS[t] for t in tokenize(title or "") if t in LEVELS)
+
+
+def direct_link(link):
+    """Canonical link when it points at the employer's or park's own page (not a job portal), else ''."""
+    link = canonical_url(link)
+    host = urllib.parse.urlsplit(link).netloc
+    return "" if not link or any(p in host for p in PORTAL_HOSTS) else link
+
+
+def signature(shingle_set):
+    """MinHash signature (NUM_PERM values) of a set of shingles."""
+    if not shingle_set:
+        return np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    h = np.fromiter((zlib.crc32(s.encode()) for s in shingle_set), dtype=np.uint64)
+    # universal hashing (a*x + b) mod p for every permutation at once; values stay below 2^63
+    return ((np.outer(_A, h) + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def link_quality(job):
+    """Higher is better: a link at all, not a redirect, the employer's own listing, then shorter."""
+    link = job.get("link") or ""
+    redirect = any(p in link for p in ("/rc/clk", "/pagead/", "/redirect"))
+    direct = job.get("source") not in PORTALS
+    return (bool(link), not redirect, direct, bool(source_job_id(link)), -len(link))
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+        return min(ri, rj)
+
+
+def clusters(jobs, threshold=TITLE_THRESHOLD):
+    """Lists of job positions that are near-duplicates of each other (singletons included), in job order."""
+    n = len(jobs)
+    if n == 0:
+        return []
+    sets = [shingles(j.get("title")) for j in jobs]
+    sigs = np.vstack([signature(s) for s in sets])
+    companies = [normalize_company(j.get("company")) for j in jobs]
+    job_levels = [levels(j.get("title")) for j in jobs]
+    rows = NUM_PERM // BANDS
+    # per cluster root: its named company and direct link ('' = none yet)
+    named = list(companies)
+    direct = [direct_link(j.get("link")) for j in jobs]
+
+    buckets = {}
+    for b in range(BANDS):
+        band = sigs[:, b * rows:(b + 1) * rows]
+        for pos, key in enumerate(map(bytes, band)):
+            buckets.setdefault((b, key), []).append(pos)
+
+    uf = _UnionFind(n)
+    checked = set()
+    best_named = {}  # job without a company -> (similarity, position) of its closest named job
+
+    def similarity(i, j, need):
+        key = (i, j) if i < j else (j, i)
+        if key in checked:
+            return None
+        checked.add(key)
+        si, sj = sets[i], sets[j]
+        if not (si and sj) or job_levels[i] != job_levels[j]:
+            return None
+        sim = len(si & sj) / len(si | sj)
+        return sim if sim >= need else None
+
+    def merge(i, j):
+        """Union unless the two clusters have different named companies or different direct links."""
+        ri, rj = uf.find(i), uf.find(j)
+        if ri == rj:
+            return
+        if named[ri] and named[rj] and named[ri] != named[rj]:
+            return
+        if direct[ri] and direct[rj] and direct[ri] != direct[rj]:
+            return
+        root = uf.union(ri, rj)
+        named[root] = named[ri] or named[rj]
+        direct[root] = direct[ri] or direct[rj]
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        by_company = {}
+        for pos in members:
+            by_company.setdefault(companies[pos], []).append(pos)
+        unknown = by_company.pop("", [])
+        for same in by_company.values():
+            for x in range(len(same)):
+                for y in range(x + 1, len(same)):
+                    if similarity(same[x], same[y], threshold) is not None:
+                        merge(same[x], same[y])
+        # jobs without a company may belong to anyone, but need a near-identical title
+        for x, i in enumerate(unknown):
+            for j in unknown[x + 1:]:
+                if similarity(i, j, UNKNOWN_COMPANY_THRESHOLD) is not None:
+                    merge(i, j)
+            for j in (p for same in by_company.values() for p in same):
+                sim = similarity(i, j, UNKNOWN_COMPANY_THRESHOLD)
+                if sim is not None and (sim, -j) > best_named.get(i, (0, 0)):
+                    best_named[i] = (sim, -j)
+
+    # each job without a company joins (at most) the one named cluster it matches best
+    for i, (_, j) in sorted(best_named.items()):
+        merge(i, -j)
+
+    groups = {}
+    for pos in range(n):
+        groups.setdefault(uf.find(pos), []).append(pos)
+    return list(groups.values())
+
+
+def fuzzy_dedupe(jobs, threshold=TITLE_THRESHOLD):
+    """
+    One job per near-duplicate cluster, in the order clusters first appear:
+    the member with the best link, with the most specific company name of
+    the cluster when its own is a placeholder.
+    """
+    out = []
+    for members in clusters(jobs, threshold):
+        best = dict(jobs[max(members, key=lambda p: link_quality(jobs[p]))])
+        if not normalize_company(best.get("company")):
+            named = [jobs[p]["company"] for p in members if normalize_company(jobs[p].get("company"))]
+            if named:
+                best["company"] = max(named, key=len)
+        out.append((members[0], best))
+    out.sort(key=lambda e: e[0])
+    return [job for _, job in out]
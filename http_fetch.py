@@ -0,0 +1,55 @@
+# http_fetch.py
+# Plain-HTTP page fetching for sources that do not need JavaScript.
+# One keep-alive session is shared by all scraper threads so repeated pages
+# from the same site reuse the TCP/TLS connection.
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from response_cache import ResponseCache
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+POOL_SIZE = 16
+DEFAULT_TIMEOUT = 20  # seconds
+
+_session = None
+_session_lock = threading.Lock()
+cache = ResponseCache()
+
+
+def get_session():
+    """Return the shared requests.Session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-IN,en;q=0.9",
+            })
+            _session = s
+        return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def fetch_page(url, ttl=0, timeout=DEFAULT_TIMEOUT):
+    """GET a page through the on-disk response cache (see response_cache.py)."""
+    return cache.fetch(get_session(), url, ttl=ttl, timeout=timeout)
@@ -0,0 +1,167 @@
+# job_filters.py
+# Keyword lists and the relevance filter applied to every scraped title.
+import os
+import re
+
+from matcher import PhraseMatcher, TermMatcher
+
+# -------------------------
+# FILTERS
+# -------------------------
+EXCLUDE_KEYWORDS = [
+    "php","laravel","wordpress","drupal",".net","c#","java","spring","hibernate",
+    "senior","lead","manager","architect","director","principal","vp","head",
+    "3 year","3 years","4 year","4 years","5 year","5 years","5+","6 year","6 years"
+]
+EXCLUDE_LOWER = [e.lower() for e in EXCLUDE_KEYWORDS]
+
+PREFER_TERMS = [
+    "fresher","freshers","intern","internship","trainee","entry level",
+    "0-1","0 - 1","0-2","0 - 2","0 to 2","1 year","below 2","junior"
+]
+PREFER_LOWER = [p.lower() for p in PREFER_TERMS]
+
+INCLUDE_TERMS = [
+    "python","django","flask","fastapi","react","angular","vue","javascript","typescript",
+    "full stack","backend","frontend","web developer","backend developer",
+    "machine learning","ml","ai","artificial intelligence","deep learning",
+    "data science","data scientist","data analyst","analytics","business intelligence",
+    "power bi","tableau","excel","sql","dashboard","bi developer","data engineer",
+    "nlp","llm","pandas","numpy","scikit-learn","tensorflow","pytorch","rest api","Data Analyst","Junior Data Analyst","Senior Data Analyst","Business Data Analyst",
+"Business Analyst","Reporting Analyst","Data Reporting Analyst","Operations Analyst","Product Analyst","Marketing Analyst","Financial Analyst","BI Analyst / Business Intelligence Analyst","Data Quality Analyst","Data Visualization Analyst",
+"Quantitative Analyst / Quant Analyst","Statistical Analyst","Data Science Analyst","Insights Analyst","Data Operations Analyst","Risk Analyst","Fraud Analyst","Workforce Analyst",
+"Revenue Analyst","Research Analyst","Analytics Specialist","Decision Support Analyst","flutter",
+    "dart",
+    "flutter developer",
+    "mobile developer",
+    "android developer",
+    "ios developer",
+    "cross platform developer",
+    "mobile app developer",
+
+    # Flutter frameworks / tools
+    "flutter bloc",
+    "bloc pattern",
+    "provider",
+    "riverpod",
+    "getx",
+    "flutter mobx",
+    "flutter cubit",
+    "flutter hooks",
+    "clean architecture flutter",
+
+    # Backend API integration (common in Flutter roles)
+    "rest api",
+    "graphql",
+    "firebase",
+    "supabase",
+    "appwrite",
+    "backend integration",
+
+    # Database keywords
+    "sqlite",
+    "hive",
+    "moor",
+    "isar",
+    "shared preferences",
+
+    # UI / UX keywords used in job posts
+    "ui design",
+    "ux",
+    "material design",
+    "responsive ui",
+    "widget development",
+    "state management",
+
+    # Extra skills often expected
+    "git",
+    "github",
+    "devops",
+    "ci cd",
+    "play store",
+    "app store",
+    "deployment",
+    "version control",
+
+    # Cloud integrations common in Flutter jobs
+    "aws",
+    "gcp",
+    "google cloud",
+    "azure",
+    "cloud functions",
+
+    # Testing
+    "unit testing",
+    "integration testing",
+    "flutter test",
+    "widget testing",
+
+    # Other frontend/mobile tech often listed in job descriptions
+    "react native",
+    "kotlin",
+    "swift",
+    "java android",
+    "objective c",
+
+]
+
+# Regex to detect high experience mentions (to be excluded)
+HIGH_EXPERIENCE_RE = re.compile(r"\b([3-9]|[1-9]\d)\+?\s*(year|years|yrs|yr)\b", flags=re.IGNORECASE)
+
+# MATCH_MODE "words" (default) matches terms as whole words/phrases, so "ml"
+# no longer fires inside "html" or "ai" inside "maintain". "substring" keeps
+# the original behaviour of matching terms anywhere in the lowercased text.
+MATCH_MODE = os.getenv("MATCH_MODE", "words").lower()
+
+# Every list is compiled once into a single matcher, so each title is scanned
+# one time instead of running a substring test per term.
+TERM_LISTS = {
+    "exclude": EXCLUDE_LOWER,
+    "include": INCLUDE_TERMS,
+    "prefer": PREFER_LOWER,
+}
+MATCHER = PhraseMatcher(TERM_LISTS) if MATCH_MODE == "words" else TermMatcher(TERM_LISTS)
+
+# -------------------------
+# RELEVANCE
+# -------------------------
+def explain_relevance(title, snippet=""):
+    """
+    Decide whether a title is relevant and say why (batch_filter applies the
+    same rules to a whole column of candidates at once):
+    {"accepted": bool, "reason": str, "include": [...], "exclude": [...], "prefer": [...]}.
+    """
+    text = f"{title} {snippet}".lower()
+    found = MATCHER.scan(text)
+    verdict = {
+        "accepted": False,
+        "include": found.get("include", []),
+        "exclude": found.get("exclude", []),
+        "prefer": found.get("prefer", []),
+    }
+
+    # exclude if explicit exclude tokens present (this covers the managerial
+    # words senior/lead/manager/director/principal/head/vp too)
+    if verdict["exclude"]:
+        verdict["reason"] = "exclude term"
+        return verdict
+
+    # must contain at least one include term
+    if not verdict["include"]:
+        verdict["reason"] = "no include term"
+        return verdict
+
+    # explicit high experience -> exclude
+    m = HIGH_EXPERIENCE_RE.search(text)
+    if m:
+        verdict["reason"] = f"experience: {m.group(0)}"
+        return verdict
+
+    # prefer fresher/trainee terms but not mandatory; otherwise accept general
+    # relevant roles (non-senior)
+    verdict["accepted"] = True
+    verdict["reason"] = "fresher term" if verdict["prefer"] else "include term"
+    return verdict
+
+def looks_relevant(title, snippet=""):
+    return explain_relevance(title, snippet)["accepted"]
@@ -0,0 +1,202 @@
+# job_store.py
+# SQLite (WAL) store of every job the scraper has found, with first/last
+# seen timestamps, so runs can be compared without re-reading CSV dumps.
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+from url_canon import canonical_url, dedupe_key
+
+DEFAULT_PATH = os.path.join("data", "jobs.db")
+BATCH_SIZE = 500
+# PRAGMA user_version of the current key scheme; older stores are re-keyed on open
+KEY_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,       -- url_canon.dedupe_key: portal job id / canonical link + title
+    canonical_link TEXT,
+    title TEXT NOT NULL,
+    company TEXT,
+    link TEXT,
+    source TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_canonical_link ON jobs(canonical_link);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
+CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs(first_seen);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    jobs_found INTEGER,
+    jobs_new INTEGER
+);
+"""
+
+UPSERT = """
+INSERT INTO jobs (job_key, canonical_link, title, company, link, source, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(job_key) DO UPDATE SET
+    last_seen = excluded.last_seen,
+    link = CASE WHEN excluded.link != '' THEN excluded.link ELSE jobs.link END,
+    canonical_link = COALESCE(excluded.canonical_link, jobs.canonical_link),
+    source = COALESCE(excluded.source, jobs.source)
+"""
+
+COLUMNS = "id, title, company, link, source, first_seen, last_seen"
+
+
+def job_key(job):
+    return dedupe_key(job.get("title", ""), job.get("company", ""), job.get("link", ""))
+
+
+def canonical_link(link):
+    """url_canon.canonical_url of the link; empty links become NULL."""
+    return canonical_url(link) or None
+
+
+def _rekey(conn):
+    """
+    Move rows keyed by lower(title)|lower(company) to the current dedupe key.
+    Rows that now share a key are merged into the oldest one, keeping the
+    earliest first_seen and the latest last_seen.
+    """
+    rows = conn.execute("SELECT id, title, company, link, first_seen, last_seen FROM jobs ORDER BY id").fetchall()
+    merged = {}  # new key -> [id, first_seen, last_seen, link]
+    drop = []
+    for r in rows:
+        key = dedupe_key(r["title"], r["company"], r["link"])
+        if key in merged:
+            m = merged[key]
+            m[1], m[2] = min(m[1], r["first_seen"]), max(m[2], r["last_seen"])
+            drop.append((r["id"],))
+        else:
+            merged[key] = [r["id"], r["first_seen"], r["last_seen"], r["link"]]
+    with conn:
+        conn.executemany("DELETE FROM jobs WHERE id = ?", drop)
+        # temporary keys first so swapping keys between rows cannot hit the UNIQUE constraint
+        conn.execute("UPDATE jobs SET job_key = '~' || id")
+        conn.executemany(
+            "UPDATE jobs SET job_key = ?, canonical_link = ?, first_seen = ?, last_seen = ? WHERE id = ?",
+            [(k, canonical_link(link), first, last, i) for k, (i, first, last, link) in merged.items()],
+        )
+        conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+    if drop:
+        print(f"🗃️ Job store re-keyed: {len(drop)} duplicate job(s) merged")
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobStore:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("JOB_DB_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                if conn.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+                    _rekey(conn)
+                self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_run(self, jobs, started_at=None, partial_sources=()):
+        """
+        Upsert this run's jobs in batches and log the run. New jobs get
+        first_seen = started_at; every job seen gets last_seen = started_at.
+        Returns the number of jobs seen for the first time.
+
+        partial_sources are sources whose crawl stopped early at postings
+        seen before: their jobs that were still open in the previous run are
+        on pages this run skipped, so they keep last_seen = started_at too.
+        """
+        started_at = started_at or _now()
+        rows = [
+            (job_key(j), canonical_link(j.get("link")), j.get("title", ""), j.get("company", ""),
+             j.get("link", ""), j.get("source") or None, started_at, started_at)
+            for j in jobs if j.get("title")
+        ]
+        partial = list(partial_sources)
+        with closing(self.connect()) as conn, conn:
+            previous = conn.execute("SELECT MAX(started_at) FROM runs").fetchone()[0]
+            if partial and previous:
+                conn.execute(
+                    f"UPDATE jobs SET last_seen = ? WHERE last_seen >= ? AND source IN ({','.join('?' * len(partial))})",
+                    [started_at, previous] + partial)
+            for i in range(0, len(rows), BATCH_SIZE):
+                conn.executemany(UPSERT, rows[i:i + BATCH_SIZE])
+            new = conn.execute("SELECT COUNT(*) FROM jobs WHERE first_seen = ?", (started_at,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO runs (started_at, finished_at, jobs_found, jobs_new) VALUES (?, ?, ?, ?)",
+                (started_at, _now(), len(rows), new),
+            )
+        return new
+
+    def ids_for(self, jobs, create=False):
+        """
+        {job_key: id} for the given jobs that are in the store. With create,
+        jobs not stored yet are added first (first_seen = last_seen = now).
+        """
+        keys = list({job_key(j) for j in jobs})
+        ids = {}
+        with closing(self.connect()) as conn:
+            if create:
+                now = _now()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO jobs (job_key, canonical_link, title, company, link, source, first_seen, last_seen) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(job_key) DO NOTHING",
+                        [(job_key(j), canonical_link(j.get("link")), j.get("title", ""), j.get("company", ""),
+                          j.get("link", ""), j.get("source") or None, now, now) for j in jobs if j.get("title")])
+            for i in range(0, len(keys), BATCH_SIZE):
+                chunk = keys[i:i + BATCH_SIZE]
+                cur = conn.execute(
+                    f"SELECT job_key, id FROM jobs WHERE job_key IN ({','.join('?' * len(chunk))})", chunk)
+                ids.update(cur.fetchall())
+        return ids
+
+    def has_link(self, link):
+        """True if a stored job has this link (compared in canonical form)."""
+        key = canonical_link(link)
+        if key is None:
+            return False
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT 1 FROM jobs WHERE canonical_link = ? LIMIT 1", (key,)).fetchone() is not None
+
+    def new_since(self, since):
+        """Jobs first seen at or after `since` (datetime or ISO string), newest first."""
+        since = since.isoformat(timespec="seconds") if hasattr(since, "isoformat") else since
+        with closing(self.connect()) as conn:
+            cur = conn.execute(
+                f"SELECT {COLUMNS} FROM jobs WHERE first_seen >= ? ORDER BY first_seen DESC, id", (since,))
+            return [dict(r) for r in cur]
+
+    def still_open(self):
+        """Jobs that were still listed in the most recent run."""
+        with closing(self.connect()) as conn:
+            last = conn.execute("SELECT MAX(started_at) FROM runs").fetchone()[0]
+            if last is None:
+                return []
+            cur = conn.execute(f"SELECT {COLUMNS} FROM jobs WHERE last_seen >= ? ORDER BY id", (last,))
+            return [dict(r) for r in cur]
+
+    def last_run(self):
+        with closing(self.connect()) as conn:
+            row = conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+            return dict(row) if row else None
@@ -0,0 +1,177 @@
+# mail_pool.py
+# A small pool of authenticated SMTP sessions used to deliver the daily
+# digests. Each session does the connect / STARTTLS / login handshake once
+# and then sends many messages; sessions that drop, hit the per-session
+# message cap or get a rate-limit reply are closed and replaced
+# transparently, and the message is retried on a fresh session.
+import os
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Replies that mean "not now" rather than "never": the server is closing the
+# channel or throttling us (Gmail answers 421 4.7.0 / 454 4.7.0 when it does).
+RETRY_CODES = {421, 450, 451, 452, 454}
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+# Gmail drops a connection after ~100 messages; start a new session before that
+SMTP_MAX_PER_SESSION = int(os.getenv("SMTP_MAX_PER_SESSION", "90"))
+
+
+class SMTPPool:
+    """
+    pool = SMTPPool(user, password)
+    latency = pool.send(msg)           # seconds spent on this message
+    pool.send_many(msgs)               # -> [(msg, latency or exception), ...]
+    pool.close()
+    """
+
+    def __init__(self, user, password, host=SMTP_HOST, port=SMTP_PORT, size=SMTP_POOL_SIZE,
+                 starttls=SMTP_STARTTLS, max_per_session=SMTP_MAX_PER_SESSION,
+                 timeout=30, retries=3, backoff=2.0):
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.size = max(1, size)
+        self.starttls = starttls
+        self.max_per_session = max_per_session
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._sent = {}       # id(session) -> messages sent on that session
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+        self.latencies = []
+
+    # ---- sessions ----
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            _close(server)
+            raise
+        with self._lock:
+            self.connects += 1
+            self._sent[id(server)] = 0
+        return server
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, server, broken=False):
+        with self._lock:
+            worn_out = self.max_per_session and self._sent.get(id(server), 0) >= self.max_per_session
+            if broken or worn_out:
+                self._sent.pop(id(server), None)
+        if broken or worn_out:
+            _close(server)
+        else:
+            self._idle.put(server)
+        self._slots.release()
+
+    # ---- sending ----
+    def send(self, msg):
+        """Send one message, reconnecting on drops / throttling. Returns the latency in seconds."""
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            server = self._acquire()
+            try:
+                server.send_message(msg)
+            except Exception as e:
+                self._release(server, broken=True)
+                attempt += 1
+                if not is_retryable(e) or attempt > self.retries:
+                    raise
+                with self._lock:
+                    self.reconnects += 1
+                # throttled: back off before the next session; a plain drop retries at once
+                if getattr(e, "smtp_code", None) in RETRY_CODES:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)))
+                continue
+            with self._lock:
+                self._sent[id(server)] = self._sent.get(id(server), 0) + 1
+            self._release(server)
+            latency = time.perf_counter() - started
+            with self._lock:
+                self.latencies.append(latency)
+            return latency
+
+    def send_many(self, msgs, on_result=None):
+        """
+        Send messages over up to `size` sessions at once. Returns a list of
+        (msg, latency or the exception that stopped it) in input order;
+        on_result(msg, result) is called as each one finishes.
+        """
+        def one(msg):
+            try:
+                result = self.send(msg)
+            except Exception as e:
+                result = e
+            if on_result:
+                on_result(msg, result)
+            return msg, result
+
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            return list(ex.map(one, msgs))
+
+    def report(self):
+        if not self.latencies:
+            return "no messages sent"
+        lat = sorted(self.latencies)
+        p50 = lat[len(lat) // 2]
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        return (f"{len(lat)} sent over {self.connects} session(s), {self.reconnects} reconnect(s); "
+                f"latency p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, max {lat[-1] * 1000:.0f} ms")
+
+    def close(self):
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                server.quit()
+            except Exception:
+                _close(server)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_retryable(e):
+    if isinstance(e, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)):
+        return True
+    return getattr(e, "smtp_code", None) in RETRY_CODES
+
+
+def _close(server):
+    try:
+        server.close()
+    except Exception:
+        pass
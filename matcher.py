@@ -0,0 +1,193 @@
+# matcher.py
+# Multi-pattern keyword matchers: every term list (include / exclude / prefer
+# ...) is compiled once, and one scan of the text reports which terms of
+# which lists occur in it.
+#
+# TermMatcher matches terms as substrings (optionally with word boundaries)
+# through a single trie-shaped regex. PhraseMatcher tokenizes the text and
+# matches terms as whole words / multi-word phrases.
+#
+# TermMatcher's regex is a zero-width lookahead, so it is tried at every position of
+# the text and overlapping terms are all found: at each position it captures
+# the longest term starting there, and the shorter terms that are prefixes
+# of that term are credited from a precomputed table.
+import re
+
+
+def _trie(terms):
+    root = {}
+    for t in terms:
+        node = root
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return root
+
+
+def _trie_regex(node):
+    """Regex matching exactly the terms in the trie, preferring the longest one."""
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+class TermMatcher:
+    """
+    Match several named term lists in one pass.
+
+        m = TermMatcher({"include": [...], "exclude": [...]})
+        m.scan("junior python developer")  # -> {"include": ["python"]}
+
+    With word_boundaries=True a term only matches when it is not glued to
+    other letters/digits (so "ml" does not match inside "html").
+    """
+
+    def __init__(self, categories, word_boundaries=False):
+        self.word_boundaries = word_boundaries
+        self.term_categories = {}
+        for cat, terms in categories.items():
+            for t in terms:
+                if t:
+                    self.term_categories.setdefault(t, []).append(cat)
+        terms = sorted(self.term_categories)
+        # for every term, the terms that are prefixes of it (itself included), shortest first
+        self.prefixes = {
+            t: [t[:i] for i in range(1, len(t) + 1) if t[:i] in self.term_categories]
+            for t in terms
+        }
+        # categories of a term plus those of its prefix terms, for the fast path
+        self.prefix_categories = {
+            t: frozenset(c for p in self.prefixes[t] for c in self.term_categories[p]) for t in terms
+        }
+        body = _trie_regex(_trie(terms)) if terms else "(?!)"
+        if word_boundaries:
+            self.regex = re.compile(r"(?=(?<!\w)(" + body + r")(?!\w))")
+        else:
+            self.regex = re.compile("(?=(" + body + "))")
+
+    def _credited(self, text, start, term):
+        if not self.word_boundaries:
+            return self.prefixes[term]
+        credited = []
+        for p in self.prefixes[term]:
+            end = start + len(p)
+            if end == len(text) or not (text[end].isalnum() or text[end] == "_"):
+                credited.append(p)
+        return credited
+
+    def categories(self, text):
+        """Set of categories with at least one term in text (no term lists — the fast path)."""
+        if self.word_boundaries:
+            return set(self.scan(text))
+        found = set()
+        for term in self.regex.findall(text):
+            found |= self.prefix_categories[term]
+        return found
+
+    def scan(self, text):
+        """Return {category: [matched terms in order of first appearance]} for the categories found."""
+        found = {}
+        seen = set()
+        if self.word_boundaries:
+            hits = (self._credited(text, m.start(), m.group(1)) for m in self.regex.finditer(text))
+        else:
+            hits = (self.prefixes[t] for t in self.regex.findall(text))
+        for credited in hits:
+            for term in credited:
+                if term in seen:
+                    continue
+                seen.add(term)
+                for cat in self.term_categories[term]:
+                    found.setdefault(cat, []).append(term)
+        return found
+
+
+# Words are runs of letters/digits; "#", "+" and "." are kept as their own
+# tokens so ".net", "c#" and "5+" stay matchable. Everything else separates
+# words, so "ci/cd" matches "ci cd" and "0-2" matches "0 - 2".
+TOKEN_RE = re.compile(r"[a-z0-9]+|[#+.]")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Whole-word matching of single words and multi-word phrases, same API as
+    TermMatcher. A term written as "A / B" is treated as two alternatives.
+    """
+
+    def __init__(self, categories):
+        self.term_categories = {}
+        phrase_terms = {}  # phrase -> the first term spelling it (case variants share one entry)
+        for cat, terms in categories.items():
+            for term in terms:
+                for alt in term.split(" / "):
+                    phrase = tuple(tokenize(alt))
+                    if not phrase:
+                        continue
+                    term_ = phrase_terms.setdefault(phrase, term)
+                    cats = self.term_categories.setdefault(term_, [])
+                    if cat not in cats:
+                        cats.append(cat)
+        by_first = {}
+        for phrase, term in phrase_terms.items():
+            by_first.setdefault(phrase[0], []).append((phrase, term))
+        # phrases starting with a token, longest first
+        self.index = {tok: sorted(entries, key=lambda e: -len(e[0])) for tok, entries in by_first.items()}
+
+    def scan(self, text):
+        """Return {category: [matched terms in order of first appearance]} for the categories found."""
+        found = {}
+        seen = set()
+        tokens = tokenize(text)
+        n = len(tokens)
+        for i, tok in enumerate(tokens):
+            for phrase, term in self.index.get(tok, ()):
+                if term in seen:
+                    continue
+                size = len(phrase)
+                if size == 1 or (i + size <= n and tuple(tokens[i:i + size]) == phrase):
+                    seen.add(term)
+                    for cat in self.term_categories[term]:
+                        found.setdefault(cat, []).append(term)
+        return found
+
+    def categories(self, text):
+        return set(self.scan(text))
+
+
+# -------------------------
+# WHOLE-COLUMN MATCHING (pandas .str methods)
+# -------------------------
+def trie_pattern(strings):
+    """Regex source matching any of the strings, shaped as a trie so it stays fast with many terms."""
+    strings = sorted({s for s in strings if s})
+    return _trie_regex(_trie(strings)) if strings else "(?!)"
+
+
+def normalize_for_match(text, mode="words"):
+    """The form of the text the column regexes run against: space-joined tokens, or just lowercased."""
+    text = (text or "").lower()
+    return " ".join(tokenize(text)) if mode == "words" else text
+
+
+def category_regexes(categories, mode="words"):
+    """
+    One compiled regex per category for matching a whole column of texts
+    prepared with normalize_for_match. Decisions agree with PhraseMatcher
+    ("words") / TermMatcher ("substring") on whether a category occurs.
+    """
+    out = {}
+    for cat, terms in categories.items():
+        if mode == "words":
+            phrases = [" ".join(tokenize(alt)) for t in terms for alt in t.split(" / ")]
+            out[cat] = re.compile(r"(?<!\S)(?:" + trie_pattern(phrases) + r")(?!\S)")
+        else:
+            out[cat] = re.compile("(?:" + trie_pattern(terms) + ")")
+    return out
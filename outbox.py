@@ -0,0 +1,265 @@
+# outbox.py
+# Durable outbox for the daily digests. send_email renders every message and
+# queues it in SQLite first; a dispatcher then drains the queue with a few
+# concurrent SMTP sessions, a per-provider rate limit and exponential-backoff
+# retries. Messages are keyed by (batch, recipient), so a rerun of the same
+# batch only sends what has not been delivered yet instead of mailing
+# everyone again. Each row also carries the job ids of its digest, which go
+# into the send history (send_history.py) whenever and wherever the row is
+# delivered. Undelivered messages can be drained later with:
+#
+#   python outbox.py
+import email
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime
+
+from mail_pool import SMTPPool, SMTP_HOST, is_retryable
+from send_history import SendHistory
+
+DEFAULT_PATH = os.path.join("data", "outbox.db")
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF = float(os.getenv("OUTBOX_BACKOFF", "30"))          # seconds before the first retry
+OUTBOX_MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", "900"))
+# messages per second per provider, e.g. "smtp.gmail.com=1,default=5"
+OUTBOX_RATE_LIMITS = os.getenv("OUTBOX_RATE_LIMITS", "smtp.gmail.com=1,default=5")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,                -- one digest run, e.g. the send date
+    recipient TEXT NOT NULL,
+    provider TEXT NOT NULL,             -- SMTP host the message goes through
+    subject TEXT,
+    message TEXT NOT NULL,              -- the full rendered MIME message
+    job_ids TEXT,                       -- JSON list of the job-store ids in the digest
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending | sending | sent | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    latency_ms INTEGER,
+    created_at TEXT NOT NULL,
+    sent_at TEXT,
+    UNIQUE (batch, recipient)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+"""
+
+ENQUEUE = """
+INSERT INTO outbox (batch, recipient, provider, subject, message, job_ids, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(batch, recipient) DO UPDATE SET
+    subject = excluded.subject,
+    message = excluded.message,
+    job_ids = excluded.job_ids,
+    provider = excluded.provider,
+    -- a message that was given up on gets a fresh set of attempts on a rerun
+    attempts = CASE WHEN outbox.status = 'failed' THEN 0 ELSE outbox.attempts END,
+    next_attempt_at = CASE WHEN outbox.status = 'failed' THEN 0 ELSE outbox.next_attempt_at END,
+    last_error = CASE WHEN outbox.status = 'failed' THEN NULL ELSE outbox.last_error END,
+    status = CASE WHEN outbox.status = 'failed' THEN 'pending' ELSE outbox.status END
+WHERE outbox.status != 'sent'
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def parse_rate_limits(spec):
+    """"host=rate,default=rate" -> {host: messages per second}."""
+    limits = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            host, rate = part.split("=", 1)
+            limits[host.strip()] = float(rate)
+    return limits
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Outbox:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("OUTBOX_DB_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                if "job_ids" not in {r["name"] for r in conn.execute("PRAGMA table_info(outbox)")}:
+                    conn.execute("ALTER TABLE outbox ADD COLUMN job_ids TEXT")
+                self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def enqueue(self, batch, messages, provider=SMTP_HOST, job_ids=None):
+        """
+        Queue rendered messages (email.message objects) for a batch, with the
+        job ids each recipient's digest carries ({recipient: [id, ...]}).
+        Recipients already delivered in this batch are left alone; messages
+        that had failed for good are queued again with fresh attempts.
+        Returns how many of the batch's messages still need sending.
+        """
+        now = _now()
+        job_ids = job_ids or {}
+        rows = [(batch, msg["To"], provider, msg["Subject"], msg.as_string(),
+                 json.dumps(job_ids.get(msg["To"], [])), now) for msg in messages]
+        with closing(self.connect()) as conn, conn:
+            conn.executemany(ENQUEUE, rows)
+            return conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE batch = ? AND status != 'sent'", (batch,)).fetchone()[0]
+
+    def recover(self):
+        """Messages left 'sending' by a crashed dispatcher go back to pending."""
+        with closing(self.connect()) as conn, conn:
+            return conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'").rowcount
+
+    def claim(self, batch=None):
+        """
+        Take the next due message (marking it 'sending'). Returns the row, the
+        number of seconds until the next one is due when none is due yet, or
+        None when nothing is left to send.
+        """
+        where = "status = 'pending'" + (" AND batch = ?" if batch else "")
+        args = (batch,) if batch else ()
+        with self._lock, closing(self.connect()) as conn, conn:
+            row = conn.execute(
+                f"SELECT * FROM outbox WHERE {where} ORDER BY next_attempt_at, id LIMIT 1", args).fetchone()
+            if row is None:
+                return None
+            wait = row["next_attempt_at"] - time.time()
+            if wait > 0:
+                return wait
+            conn.execute("UPDATE outbox SET status = 'sending', attempts = attempts + 1 WHERE id = ?", (row["id"],))
+            return dict(row, attempts=row["attempts"] + 1)
+
+    def mark_sent(self, row_id, latency):
+        with closing(self.connect()) as conn, conn:
+            conn.execute("UPDATE outbox SET status = 'sent', sent_at = ?, latency_ms = ?, last_error = NULL "
+                         "WHERE id = ?", (_now(), int(latency * 1000), row_id))
+
+    def mark_failed(self, row_id, error, retry_in=None):
+        """Schedule a retry in retry_in seconds, or give up on the message when retry_in is None."""
+        with closing(self.connect()) as conn, conn:
+            if retry_in is None:
+                conn.execute("UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?",
+                             (str(error)[:500], row_id))
+            else:
+                conn.execute("UPDATE outbox SET status = 'pending', last_error = ?, next_attempt_at = ? "
+                             "WHERE id = ?", (str(error)[:500], time.time() + retry_in, row_id))
+
+    def counts(self, batch=None):
+        where, args = ("WHERE batch = ?", (batch,)) if batch else ("", ())
+        with closing(self.connect()) as conn:
+            return dict(conn.execute(f"SELECT status, COUNT(*) FROM outbox {where} GROUP BY status", args).fetchall())
+
+
+def dispatch(outbox, user, password, batch=None, concurrency=OUTBOX_CONCURRENCY, rate_limits=None,
+             max_attempts=OUTBOX_MAX_ATTEMPTS, backoff=OUTBOX_BACKOFF, max_backoff=OUTBOX_MAX_BACKOFF,
+             on_result=None, pool_factory=SMTPPool, send_history=None):
+    """
+    Drain the outbox (or one batch of it) with `concurrency` workers sharing
+    an SMTP pool per provider. Failed sends are retried after backoff * 2^n
+    seconds (capped at max_backoff) until max_attempts; permanent SMTP errors
+    fail the message at once. Each delivered row's job ids are marked sent in
+    send_history (a SendHistory, if given). on_result(row, latency or
+    exception) is called after every attempt. Returns the final status counts.
+    """
+    outbox.recover()
+    limits = parse_rate_limits(OUTBOX_RATE_LIMITS) if rate_limits is None else rate_limits
+    limiters, pools = {}, {}
+    lock = threading.Lock()
+
+    def resources(provider):
+        with lock:
+            if provider not in pools:
+                rate = limits.get(provider, limits.get("default", 0))
+                limiters[provider] = RateLimiter(rate, burst=concurrency)
+                # the outbox does the retrying; the pool only reconnects once
+                pools[provider] = pool_factory(user, password, host=provider, size=concurrency, retries=1)
+            return limiters[provider], pools[provider]
+
+    def worker():
+        while True:
+            row = outbox.claim(batch)
+            if row is None:
+                return
+            if not isinstance(row, dict):
+                time.sleep(min(row, 5))
+                continue
+            limiter, pool = resources(row["provider"])
+            limiter.acquire()
+            try:
+                latency = pool.send(email.message_from_string(row["message"]))
+            except Exception as e:
+                if is_retryable(e) and row["attempts"] < max_attempts:
+                    outbox.mark_failed(row["id"], e, retry_in=min(max_backoff, backoff * 2 ** (row["attempts"] - 1)))
+                else:
+                    outbox.mark_failed(row["id"], e)
+                if on_result:
+                    on_result(row, e)
+                continue
+            outbox.mark_sent(row["id"], latency)
+            if send_history is not None:
+                send_history.mark_sent(row["recipient"], json.loads(row.get("job_ids") or "[]"))
+            if on_result:
+                on_result(row, latency)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+            for f in [ex.submit(worker) for _ in range(max(1, concurrency))]:
+                f.result()
+    finally:
+        for pool in pools.values():
+            pool.close()
+    return outbox.counts(batch)
+
+
+if __name__ == "__main__":
+    box = Outbox()
+    print(f"📤 Outbox {box.path}: {box.counts()}")
+
+    def report(row, result):
+        if isinstance(result, Exception):
+            print(f"❌ {row['recipient']} (attempt {row['attempts']}): {result}")
+        else:
+            print(f"✅ Email sent to {row['recipient']} in {result * 1000:.0f} ms")
+
+    counts = dispatch(box, os.getenv("EMAIL_USER"), os.getenv("EMAIL_PASS"), on_result=report,
+                      send_history=SendHistory())
+    print(f"📬 Outbox drained: {counts}")
@@ -0,0 +1,78 @@
+# ranking.py
+# Ranks the run's jobs for every student against their profile skills.
+#
+# Once per run, every job's title/company is scanned with the same matcher
+# the filter uses and an inverted index term -> jobs is built over the
+# INCLUDE_TERMS it mentions. Student skills are mapped onto the same terms,
+# and all students are scored against all jobs at once as a matrix product
+# (students x terms) @ (terms x jobs), each term weighted by its rarity in
+# this run. Top-K per student is an argpartition over the score rows.
+import math
+
+import numpy as np
+
+from job_filters import MATCHER
+
+
+def include_terms(text):
+    return MATCHER.scan((text or "").lower()).get("include", [])
+
+
+class JobIndex:
+    """Inverted index of INCLUDE_TERMS over one run's jobs."""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.postings = {}   # term -> [job positions]
+        for pos, job in enumerate(self.jobs):
+            text = f"{job.get('title', '')} {job.get('snippet') or job.get('company', '')}"
+            for term in include_terms(text):
+                self.postings.setdefault(term, []).append(pos)
+        self.terms = sorted(self.postings)
+        self.term_ids = {t: i for i, t in enumerate(self.terms)}
+        n = len(self.jobs)
+        # rarer terms say more about a match than ones most jobs mention
+        self.idf = np.array([math.log(1 + n / len(self.postings[t])) for t in self.terms], dtype=np.float32)
+        self.matrix = np.zeros((len(self.terms), n), dtype=np.float32)   # terms x jobs
+        for t, positions in self.postings.items():
+            self.matrix[self.term_ids[t], positions] = 1.0
+
+    def profile_vector(self, skills):
+        """Weights over the index terms for a list of skills (terms no job mentions are dropped)."""
+        vec = np.zeros(len(self.terms), dtype=np.float32)
+        for term in include_terms(" , ".join(skills or [])):
+            i = self.term_ids.get(term)
+            if i is not None:
+                vec[i] = self.idf[i]
+        return vec
+
+    def scores(self, skill_lists):
+        """students x jobs score matrix for a list of skill lists."""
+        if not self.terms:
+            return np.zeros((len(skill_lists), len(self.jobs)), dtype=np.float32)
+        students = np.vstack([self.profile_vector(s) for s in skill_lists]) if skill_lists else \
+            np.zeros((0, len(self.terms)), dtype=np.float32)
+        return students @ self.matrix
+
+
+def top_k(scores, k, eligible=None):
+    """
+    Column indices of the k best jobs per row, best first; ties (and
+    students without matching skills) keep scrape order. Jobs where
+    eligible is False are left out. Returns a list of index arrays.
+    """
+    n_students, n_jobs = scores.shape
+    # a tiny position penalty makes every score distinct and breaks ties by scrape order
+    keyed = scores.astype(np.float64) - np.arange(n_jobs) * 1e-9
+    if eligible is not None:
+        keyed = np.where(eligible, keyed, -np.inf)
+    k = n_jobs if not k else min(k, n_jobs)
+    if 0 < k < n_jobs:
+        part = np.argpartition(-keyed, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(n_jobs), (n_students, 1))
+    rows = np.arange(n_students)[:, None]
+    order = np.argsort(-keyed[rows, part], axis=1, kind="stable")
+    best = part[rows, order]
+    ok = np.isfinite(keyed[rows, best])
+    return [best[i][ok[i]] for i in range(n_students)]
@@ -0,0 +1,148 @@
+# readiness.py
+# Condition-based page readiness for Selenium pages. Instead of sleeping a
+# fixed time after driver.get / each scroll, poll until the page is "loaded"
+# by a rule the source declares, with a hard deadline.
+#
+# A condition is a callable check(driver, state) -> bool; `state` is a dict
+# that lives for one wait so conditions like dom_stable can remember what
+# they saw on the previous poll.
+import threading
+import time
+
+DEFAULT_TIMEOUT = 10.0  # seconds
+POLL_INTERVAL = 0.15
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+_NODES_JS = "return document.getElementsByTagName('*').length;"
+_NETWORK_JS = (
+    "return [document.readyState, "
+    "(window.performance && performance.getEntriesByType) ? performance.getEntriesByType('resource').length : 0];"
+)
+
+_stats = {"waits": 0, "timeouts": 0, "fixed": 0.0, "actual": 0.0}
+_stats_lock = threading.Lock()
+
+
+# -------------------------
+# CONDITIONS
+# -------------------------
+def selector_count(css, minimum=1):
+    """Ready once at least `minimum` elements match the CSS selector."""
+    def check(driver, state):
+        return driver.execute_script(_COUNT_JS, css) >= minimum
+    check.description = f"{minimum}+ × {css}"
+    return check
+
+
+def dom_stable(quiet=0.5):
+    """Ready once the number of DOM nodes has not changed for `quiet` seconds."""
+    def check(driver, state):
+        count = driver.execute_script(_NODES_JS)
+        now = time.monotonic()
+        if count != state.get("nodes"):
+            state["nodes"] = count
+            state["nodes_since"] = now
+            return False
+        return now - state["nodes_since"] >= quiet
+    check.description = f"DOM stable {quiet}s"
+    return check
+
+
+def network_idle(quiet=0.5):
+    """Ready once the document has loaded and no new resources were fetched for `quiet` seconds."""
+    def check(driver, state):
+        ready_state, resources = driver.execute_script(_NETWORK_JS)
+        now = time.monotonic()
+        if ready_state != "complete" or resources != state.get("resources"):
+            state["resources"] = resources
+            state["resources_since"] = now
+            return False
+        return now - state["resources_since"] >= quiet
+    check.description = f"network idle {quiet}s"
+    return check
+
+
+def any_of(*conditions):
+    """Ready as soon as any of the conditions is."""
+    def check(driver, state):
+        return any(c(driver, state.setdefault(i, {})) for i, c in enumerate(conditions))
+    check.description = " or ".join(getattr(c, "description", "?") for c in conditions)
+    return check
+
+
+# -------------------------
+# WAITING
+# -------------------------
+def wait_until(driver, condition, timeout=DEFAULT_TIMEOUT, fixed=None, poll=POLL_INTERVAL):
+    """
+    Poll `condition` until it holds or `timeout` passes. Returns True if the
+    page became ready. `fixed` is the sleep this wait replaces; it is only
+    used for the time-saved report.
+    """
+    state = {}
+    started = time.monotonic()
+    deadline = started + timeout
+    ready = False
+    while True:
+        try:
+            ready = bool(condition(driver, state))
+        except Exception:
+            ready = False
+        if ready or time.monotonic() >= deadline:
+            break
+        time.sleep(poll)
+    _record(fixed, time.monotonic() - started, timed_out=not ready)
+    return ready
+
+
+def scroll_until_stable(driver, css=None, max_scrolls=6, settle=0.7, poll=POLL_INTERVAL):
+    """
+    Scroll to the bottom repeatedly to trigger lazy loading, stopping as soon
+    as a scroll brings in no new cards (elements matching `css`, or page
+    height growth when no selector is given). After each scroll, waits at
+    most `settle` seconds for new content. Returns the number of scrolls made.
+    """
+    measure_js = _COUNT_JS if css else "return document.body.scrollHeight;"
+    args = (css,) if css else ()
+    started = time.monotonic()
+    scrolls = 0
+    before = driver.execute_script(measure_js, *args)
+    for _ in range(max_scrolls):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        scrolls += 1
+        grew = False
+        deadline = time.monotonic() + settle
+        while time.monotonic() < deadline:
+            time.sleep(poll)
+            now = driver.execute_script(measure_js, *args)
+            if now > before:
+                before = now
+                grew = True
+                break
+        if not grew:
+            break
+    _record(settle * max_scrolls, time.monotonic() - started)
+    return scrolls
+
+
+# -------------------------
+# INSTRUMENTATION
+# -------------------------
+def _record(fixed, actual, timed_out=False):
+    with _stats_lock:
+        _stats["waits"] += 1
+        _stats["actual"] += actual
+        _stats["fixed"] += fixed if fixed is not None else actual
+        if timed_out:
+            _stats["timeouts"] += 1
+
+
+def stats():
+    with _stats_lock:
+        return dict(_stats, saved=_stats["fixed"] - _stats["actual"])
+
+
+def report():
+    s = stats()
+    return (f"⏳ Readiness waits: {s['waits']} ({s['timeouts']} hit the deadline) — "
+            f"{s['actual']:.1f}s waited vs {s['fixed']:.1f}s of fixed sleeps, saved {s['saved']:.1f}s")
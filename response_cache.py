@@ -0,0 +1,152 @@
+# response_cache.py
+# On-disk HTTP response cache for the plain-HTTP scrapers.
+#
+# Each URL gets one JSON file holding the last body, its hash and the
+# ETag / Last-Modified validators. A fetch within the source's TTL is served
+# straight from disk; after that a conditional GET is sent and a 304 (or an
+# identical body) marks the page as unchanged, so callers can reuse results
+# they derived from it instead of parsing it again.
+#
+# HTTP_CACHE_MODE: "normal" (default), "replay" (never touch the network —
+# for development against yesterday's pages) or "off".
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_DIR = os.path.join(".cache", "http")
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a URL was never cached."""
+
+
+class CachedPage:
+    def __init__(self, url, text, body_hash, status, fetched_at):
+        self.url = url
+        self.text = text
+        self.body_hash = body_hash
+        self.status = status          # "fresh" | "not-modified" | "same-body" | "changed" | "new" | "replay" | "uncached"
+        self.fetched_at = fetched_at
+
+    @property
+    def unchanged(self):
+        """True when the body is known to be the same as in the previous run."""
+        return self.status in ("fresh", "not-modified", "same-body", "replay")
+
+
+def _hash(text):
+    return hashlib.sha256(text.encode("utf-8", "replace")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory=None, mode=None):
+        self.directory = directory or os.getenv("HTTP_CACHE_DIR", DEFAULT_DIR)
+        self.mode = (mode or os.getenv("HTTP_CACHE_MODE", "normal")).lower()
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    # ---- storage ----
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url):
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, url, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _count(self, status):
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    # ---- fetching ----
+    def fetch(self, session, url, ttl=0, timeout=20):
+        """Return a CachedPage for url, using the cache and conditional GETs."""
+        if self.mode == "off":
+            resp = session.get(url, timeout=timeout)
+            resp.raise_for_status()
+            self._count("uncached")
+            return CachedPage(url, resp.text, _hash(resp.text), "uncached", time.time())
+
+        entry = self.load(url)
+        if self.mode == "replay":
+            if entry is None:
+                raise CacheMiss(url)
+            self._count("replay")
+            return CachedPage(url, entry["body"], entry["body_hash"], "replay", entry["fetched_at"])
+
+        now = time.time()
+        if entry and ttl and now - entry["fetched_at"] < ttl:
+            self._count("fresh")
+            return CachedPage(url, entry["body"], entry["body_hash"], "fresh", entry["fetched_at"])
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = session.get(url, headers=headers, timeout=timeout)
+
+        if resp.status_code == 304 and entry:
+            entry["fetched_at"] = now
+            self.save(url, entry)
+            self._count("not-modified")
+            return CachedPage(url, entry["body"], entry["body_hash"], "not-modified", now)
+
+        resp.raise_for_status()
+        body = resp.text
+        body_hash = _hash(body)
+        if entry is None:
+            status = "new"
+        elif entry["body_hash"] == body_hash:
+            status = "same-body"
+        else:
+            status = "changed"
+        new_entry = {
+            "url": url,
+            "fetched_at": now,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "body_hash": body_hash,
+            "body": body,
+            # results derived from an unchanged body stay valid
+            "derived": entry.get("derived", {}) if status == "same-body" else {},
+        }
+        self.save(url, new_entry)
+        self._count(status)
+        return CachedPage(url, body, body_hash, status, now)
+
+    # ---- results derived from a page ----
+    def recall(self, url, body_hash, key):
+        """Return a value stored with remember() if the page body is still the same, else None."""
+        entry = self.load(url)
+        if not entry or entry.get("body_hash") != body_hash:
+            return None
+        return entry.get("derived", {}).get(key)
+
+    def remember(self, url, body_hash, key, value):
+        if self.mode in ("off", "replay"):
+            return
+        entry = self.load(url)
+        if not entry or entry.get("body_hash") != body_hash:
+            return
+        entry.setdefault("derived", {})[key] = value
+        self.save(url, entry)
+
+    def report(self):
+        if not self.counts:
+            return "🗄️ HTTP cache: unused"
+        parts = ", ".join(f"{k}: {v}" for k, v in sorted(self.counts.items()))
+        return f"🗄️ HTTP cache ({self.mode}) — {parts}"
@@ -0,0 +1,359 @@
+# roster.py
+# Every student who registered through appCred.py, kept in SQLite
+# (data/roster.db), and the debounced sync that mirrors the whole roster
+# into the EMAIL_TO / STUDENT_NAMES / STUDENT_PROFILES secrets read by the
+# scheduled run. A registration only writes one row and marks the roster
+# dirty; a background thread waits until sign-ins have been quiet for
+# ROSTER_SYNC_DELAY seconds (at most ROSTER_SYNC_MAX_DELAY after the first
+# pending one) and then pushes each changed secret once, so a burst of
+# registrations costs one round of GitHub API calls instead of a few per
+# student.
+#
+# The secrets cannot be read back from GitHub, so a new roster must first be
+# seeded with the students already in them: automatically when EMAIL_TO (and
+# STUDENT_NAMES / STUDENT_PROFILES) are set in the environment, otherwise
+# with `EMAIL_TO=... STUDENT_NAMES=... python roster.py`. Until then nothing
+# is pushed, so the sync can never replace the recipients with only the
+# students registered locally.
+import atexit
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+from student_profiles import parse_skills
+
+DEFAULT_PATH = os.path.join("data", "roster.db")
+ROSTER_SYNC_DELAY = float(os.getenv("ROSTER_SYNC_DELAY", "5"))
+ROSTER_SYNC_MAX_DELAY = float(os.getenv("ROSTER_SYNC_MAX_DELAY", "60"))
+ROSTER_SYNC_RETRY = float(os.getenv("ROSTER_SYNC_RETRY", "30"))   # seconds before retrying a failed sync
+REGISTRATION_BATCH = 1000
+MAX_NAME = 100
+
+EMAIL_RE = re.compile(r"^[^@\s,]+@[^@\s,]+\.[^@\s,]+$")
+
+EMAIL_SECRET = "EMAIL_TO"
+NAMES_SECRET = "STUDENT_NAMES"
+PROFILES_SECRET = "STUDENT_PROFILES"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,             -- registration order = position in EMAIL_TO
+    email TEXT NOT NULL UNIQUE,         -- lowercased
+    name TEXT NOT NULL,
+    skills TEXT NOT NULL DEFAULT '[]',  -- JSON list, see student_profiles.parse_skills
+    registered_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roster_meta (
+    key TEXT PRIMARY KEY,               -- "seeded_at": when the existing secrets were imported
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS synced_secrets (
+    name TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,               -- sha256 of the value last pushed
+    synced_at TEXT NOT NULL
+);
+"""
+
+UPSERT = """
+INSERT INTO students (email, name, skills, registered_at, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(email) DO UPDATE SET
+    name = excluded.name,
+    skills = CASE WHEN excluded.skills != '[]' THEN excluded.skills ELSE students.skills END,
+    updated_at = excluded.updated_at
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def clean_name(name):
+    # STUDENT_NAMES is comma separated, so a comma inside a name would shift every later name
+    return " ".join(name.replace(",", " ").split())
+
+
+def validate(student_name, student_mail, skills=""):
+    """(email, name, skills) ready for Roster.add, or raise ValueError with what is wrong."""
+    if not isinstance(student_name or "", str) or not isinstance(student_mail or "", str):
+        raise ValueError("student_name and student_mail must be strings.")
+    name = clean_name(student_name or "")
+    email = (student_mail or "").strip().lower()
+    if not name or not email:
+        raise ValueError("student_name and student_mail are required.")
+    if len(name) > MAX_NAME:
+        raise ValueError(f"student_name is longer than {MAX_NAME} characters.")
+    if len(email) > 254 or not EMAIL_RE.match(email):
+        raise ValueError(f"{email!r} is not a valid email address.")
+    if skills and not isinstance(skills, (str, list)):
+        raise ValueError("skills must be a string or a list.")
+    return email, name, skills or ""
+
+
+class Roster:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("ROSTER_DB_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, students):
+        """Add or update (email, name, skills) registrations; returns how many were written."""
+        now = _now()
+        rows = [(email.strip().lower(), clean_name(name), json.dumps(parse_skills(skills)), now, now)
+                for email, name, skills in students if email.strip() and name.strip()]
+        with closing(self.connect()) as conn, conn:
+            conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    @property
+    def seeded(self):
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT 1 FROM roster_meta WHERE key = 'seeded_at'").fetchone() is not None
+
+    def seed(self, students):
+        """Import the students already in the secrets and allow syncing; returns how many were written."""
+        added = self.add(students)
+        with closing(self.connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO roster_meta (key, value) VALUES ('seeded_at', ?)", (_now(),))
+        return added
+
+    def students(self):
+        with closing(self.connect()) as conn:
+            cur = conn.execute("SELECT email, name, skills FROM students ORDER BY id")
+            return [{"email": e, "name": n, "skills": json.loads(s)} for e, n, s in cur]
+
+    def secrets(self):
+        """{secret name: value} for the whole roster, in the format app.py reads."""
+        students = self.students()
+        return {
+            EMAIL_SECRET: ",".join(s["email"] for s in students),
+            NAMES_SECRET: ",".join(s["name"] for s in students),
+            PROFILES_SECRET: json.dumps({s["email"]: {"name": s["name"], "skills": s["skills"]} for s in students},
+                                        ensure_ascii=False),
+        }
+
+    def changed_secrets(self):
+        """The secrets whose value differs from what was last pushed (none while the roster is empty)."""
+        with closing(self.connect()) as conn:
+            pushed = dict(conn.execute("SELECT name, digest FROM synced_secrets"))
+        secrets = self.secrets()
+        if not secrets[EMAIL_SECRET]:
+            return {}
+        return {k: v for k, v in secrets.items() if pushed.get(k) != _digest(v)}
+
+    def mark_synced(self, secrets):
+        with closing(self.connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO synced_secrets (name, digest, synced_at) VALUES (?, ?, ?)",
+                             [(k, _digest(v), _now()) for k, v in secrets.items()])
+
+
+class RosterSync:
+    """
+    Debounced background push of the roster secrets. schedule() is cheap
+    and can be called on every registration; push(name, value) does the
+    actual write (appCred.upsert_secret).
+    """
+
+    def __init__(self, roster, push, delay=ROSTER_SYNC_DELAY, max_delay=ROSTER_SYNC_MAX_DELAY,
+                 retry=ROSTER_SYNC_RETRY):
+        self.roster = roster
+        self.push = push
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry = retry
+        self._cond = threading.Condition()
+        self._first = self._last = None     # monotonic time of the first / latest pending change
+        self._hold_until = 0                # no attempt before this after a failed sync
+        self._thread = None
+        self._stopped = False
+        self.syncs = 0
+        self.writes = 0
+
+    def start(self):
+        if not self.roster.seeded and EMAIL_SECRET in os.environ:
+            added = self.roster.seed(from_env())
+            print(f"📋 Roster seeded with {added} students from {EMAIL_SECRET} / {NAMES_SECRET}")
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="roster-sync", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+        # registrations stored before a restart may not have been pushed yet
+        if self.roster.changed_secrets():
+            self.schedule()
+
+    def schedule(self):
+        now = time.monotonic()
+        with self._cond:
+            if self._first is None:
+                self._first = now
+            self._last = now
+            self._cond.notify()
+        if self._thread is None:
+            self.start()
+
+    def _due(self):
+        if self._first is None:
+            return None
+        return max(min(self._last + self.delay, self._first + self.max_delay), self._hold_until)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (self._due() is None or self._due() > time.monotonic()):
+                    due = self._due()
+                    self._cond.wait(None if due is None else due - time.monotonic())
+                if self._stopped and self._first is None:
+                    return
+                self._first = self._last = None
+                stopped = self._stopped
+            if not self.sync() and not stopped:
+                with self._cond:
+                    now = time.monotonic()
+                    self._first = self._first or now
+                    self._last = self._last or now
+                    self._hold_until = now + self.retry
+            if stopped:
+                return
+
+    def sync(self):
+        """Push every changed roster secret now; returns False if a write failed."""
+        if not self.roster.seeded:
+            print(f"⚠️ Roster {self.roster.path} was never seeded from the current secrets, not pushing "
+                  f"(set {EMAIL_SECRET} / {NAMES_SECRET} / {PROFILES_SECRET} and run python roster.py)")
+            return True
+        secrets = self.roster.changed_secrets()
+        done = {}
+        try:
+            for name, value in secrets.items():
+                self.push(name, value)
+                done[name] = value
+                self.writes += 1
+        except Exception as e:
+            print(f"⚠️ Roster sync failed, will retry: {e}")
+            return False
+        finally:
+            if done:
+                self.roster.mark_synced(done)
+        self.syncs += 1
+        if done:
+            print(f"🔐 Roster synced: {', '.join(done)} ({len(self.roster.students())} students)")
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+
+
+class RegistrationQueue:
+    """
+    Registrations accepted by the API, written to the roster by one
+    background worker in batches (one transaction per batch), which then
+    schedules the secret sync. submit() only enqueues.
+    """
+
+    def __init__(self, roster, sync, batch=REGISTRATION_BATCH):
+        self.roster = roster
+        self.sync = sync
+        self.batch = batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def submit(self, students):
+        """Queue validated (email, name, skills) rows; returns the queue length."""
+        for s in students:
+            self._queue.put(s)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="roster-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.stop)
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            rows, stop = [], item is None
+            if not stop:
+                rows.append(item)
+            while len(rows) < self.batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    rows.append(item)
+            if rows:
+                try:
+                    self.written += self.roster.add(rows)
+                    self.sync.schedule()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Roster write failed, {len(rows)} registrations requeued: {e}")
+                    for r in rows:
+                        self._queue.put(r)
+                    time.sleep(1)
+            if stop:
+                return
+
+    def stop(self):
+        """Write everything still queued, then stop the worker."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=30)
+            self._thread = None
+
+
+def from_env():
+    """(email, name, skills) rows from the current EMAIL_TO / STUDENT_NAMES / STUDENT_PROFILES values."""
+    emails = [x.strip() for x in os.getenv("EMAIL_TO", "").split(",") if x.strip()]
+    names = [x.strip() for x in os.getenv("STUDENT_NAMES", "").replace("\r", "").replace("\n", "").split(",")
+             if x.strip()]
+    try:
+        profiles = {k.strip().lower(): v for k, v in json.loads(os.getenv("STUDENT_PROFILES") or "{}").items()}
+    except ValueError:
+        profiles = {}
+    return [(e, names[i] if i < len(names) else "Student", profiles.get(e.lower(), {}).get("skills", []))
+            for i, e in enumerate(emails)]
+
+
+if __name__ == "__main__":
+    # Seed the roster with the students already in the secrets before the
+    # first sync, so the first push does not drop them:
+    #   EMAIL_TO=... STUDENT_NAMES=... python roster.py
+    roster = Roster()
+    if EMAIL_SECRET not in os.environ:
+        raise SystemExit(f"Set {EMAIL_SECRET} (and {NAMES_SECRET}, {PROFILES_SECRET}) to the current secret values; "
+                         f"{EMAIL_SECRET}= (empty) starts from an empty roster.")
+    added = roster.seed(from_env())
+    print(f"📋 {added} students imported into {roster.path} ({len(roster.students())} in the roster), "
+          f"secrets to push: {', '.join(roster.changed_secrets()) or 'none'}")
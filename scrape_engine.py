@@ -0,0 +1,151 @@
+# scrape_engine.py
+# Runs job sources concurrently so a daily scrape costs roughly the slowest
+# source instead of the sum of all of them.
+import queue
+import threading
+import time
+
+DEFAULT_WORKERS = 4
+DEFAULT_SOURCE_TIMEOUT = 300  # seconds
+
+_task = threading.local()
+
+
+def current_source():
+    """Name of the source the calling worker thread is scraping (None outside a task)."""
+    source = getattr(_task, "source", None)
+    return source["name"] if source else None
+
+
+def source_setting(key, default=None):
+    """Read a declared setting (e.g. "mode") of the source the calling thread is scraping."""
+    source = getattr(_task, "source", None)
+    if not source:
+        return default
+    value = source.get(key)
+    return default if value is None else value
+
+
+def make_source(name, fetch, timeout=None, mode="browser", expect=None, ready=None, cards=None,
+                cache_ttl=None, **kwargs):
+    """
+    Describe one scraping task: a name, the fetch function and its kwargs.
+
+    mode is "static" for pages that can be parsed from the plain HTTP response
+    or "browser" for pages that need Chrome to render them. expect is the CSS
+    selector a static response must match to be trusted (otherwise the page is
+    re-loaded in the browser). ready is a readiness condition saying when a
+    browser-loaded page is done loading, and cards the CSS selector of the
+    job cards that lazy-load while scrolling. cache_ttl is how many seconds
+    a cached static response is reused without any request.
+    """
+    return {"name": name, "fetch": fetch, "kwargs": kwargs, "timeout": timeout,
+            "mode": mode, "expect": expect, "ready": ready, "cards": cards, "cache_ttl": cache_ttl}
+
+
+def _worker(tasks, results, running, abandoned, lock, after_task):
+    while True:
+        try:
+            source = tasks.get_nowait()
+        except queue.Empty:
+            return
+        name = source["name"]
+        _task.source = source
+        with lock:
+            running[name] = time.monotonic()
+        started = running[name]
+        try:
+            jobs = source["fetch"](**source.get("kwargs", {})) or []
+            results.put((name, jobs, None, time.monotonic() - started))
+        except Exception as e:
+            results.put((name, [], e, time.monotonic() - started))
+        finally:
+            _task.source = None
+            if after_task:
+                try:
+                    after_task(name)
+                except Exception as e:
+                    print(f"⚠️ Cleanup after {name} failed: {e}")
+        with lock:
+            running.pop(name, None)
+            if name in abandoned:
+                return  # a replacement worker already took this thread's place
+
+
+def _start_worker(tasks, results, running, abandoned, lock, after_task=None):
+    t = threading.Thread(target=_worker, args=(tasks, results, running, abandoned, lock, after_task), daemon=True)
+    t.start()
+    return t
+
+
+def run_sources(sources, max_workers=DEFAULT_WORKERS, default_timeout=DEFAULT_SOURCE_TIMEOUT, poll=0.5,
+                after_task=None, on_timeout=None):
+    """
+    Run every source on its own worker thread (at most max_workers at a time)
+    and return (jobs, stats). Jobs are merged in the order the sources were
+    declared so the output does not depend on which site answered first.
+
+    A source that runs longer than its timeout is abandoned: its late result
+    is ignored and a replacement worker is started so the remaining sources
+    keep their full concurrency. The abandoned thread exits as soon as its
+    fetch returns instead of taking more work, so a hung source never leaves
+    more than max_workers threads pulling from the queue. Worker threads are
+    daemons, so a hung site can never block interpreter exit.
+
+    after_task(name) runs on the worker thread once a source finishes (used to
+    hand its browser back to the pool); on_timeout(name) runs on the calling
+    thread when a source is abandoned (used to kill its browser).
+    """
+    tasks = queue.Queue()
+    for s in sources:
+        tasks.put(s)
+    results = queue.Queue()
+    running = {}
+    abandoned = set()
+    lock = threading.Lock()
+    timeouts = {s["name"]: (s.get("timeout") or default_timeout) for s in sources}
+    pending = set(timeouts)
+    collected = {}
+    stats = {}
+
+    for _ in range(max(1, min(max_workers, len(sources)))):
+        _start_worker(tasks, results, running, abandoned, lock, after_task)
+
+    while pending:
+        try:
+            name, jobs, err, elapsed = results.get(timeout=poll)
+            if name in pending:
+                pending.discard(name)
+                for j in jobs:
+                    j.setdefault("source", name)
+                collected[name] = jobs
+                stats[name] = {"jobs": len(jobs), "seconds": round(elapsed, 2),
+                               "status": "error" if err else "ok"}
+                if err:
+                    print(f"⚠️ {name} fetch failed: {err}")
+                else:
+                    print(f"✅ {name}: {len(jobs)} jobs in {elapsed:.1f}s")
+        except queue.Empty:
+            pass
+
+        now = time.monotonic()
+        with lock:
+            overdue = {n: t0 for n, t0 in running.items() if n in pending and now - t0 > timeouts[n]}
+            abandoned.update(overdue)
+        for name, started in overdue.items():
+            pending.discard(name)
+            collected[name] = []
+            stats[name] = {"jobs": 0, "seconds": round(now - started, 2), "status": "timeout"}
+            print(f"⏱️ {name} exceeded {timeouts[name]}s — skipping it")
+            if on_timeout:
+                try:
+                    on_timeout(name)
+                except Exception as e:
+                    print(f"⚠️ Timeout handler for {name} failed: {e}")
+            if not tasks.empty():
+                _start_worker(tasks, results, running, abandoned, lock, after_task)
+
+    all_jobs = []
+    for s in sources:
+        all_jobs += collected.get(s["name"], [])
+    return all_jobs, stats
@@ -0,0 +1,99 @@
+# send_history.py
+# Which jobs each student has already been emailed, so the daily digest only
+# carries postings that are new to them. Per student the job-store ids sent
+# so far are kept as a bitmap (a Python int, bit n = job id n), stored as a
+# blob in SQLite: membership is one shift-and-mask and the whole history of
+# a student is a few KB even with tens of thousands of jobs.
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join("data", "send_history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS send_history (
+    student TEXT PRIMARY KEY,           -- lowercased email address
+    sent BLOB NOT NULL,                 -- bitmap of job ids already emailed
+    jobs_sent INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def to_bitmap(ids):
+    bits = 0
+    for i in ids:
+        bits |= 1 << i
+    return bits
+
+
+def sent_flags(bits, job_ids):
+    """
+    Bool array: was each job id (None = not in the store) set in the bitmap?
+    Unpacks the bitmap once instead of testing bit by bit.
+    """
+    ids = np.array([-1 if i is None else i for i in job_ids], dtype=np.int64)
+    flags = np.unpackbits(np.frombuffer(_encode(bits), dtype=np.uint8), bitorder="little").astype(bool)
+    known = (ids >= 0) & (ids < len(flags))
+    out = np.zeros(len(ids), dtype=bool)
+    out[known] = flags[ids[known]]
+    return out
+
+
+def _decode(blob):
+    return int.from_bytes(blob, "little") if blob else 0
+
+
+def _encode(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+class SendHistory:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SEND_HISTORY_PATH", DEFAULT_PATH)
+        self._lock = threading.RLock()
+        self._ready = False
+        self._bitmaps = None  # student -> int, loaded once
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._ready = True
+        return conn
+
+    def _load(self):
+        if self._bitmaps is None:
+            with closing(self.connect()) as conn:
+                self._bitmaps = {s: _decode(b) for s, b in conn.execute("SELECT student, sent FROM send_history")}
+        return self._bitmaps
+
+    def sent_bitmap(self, student):
+        with self._lock:
+            return self._load().get(student.strip().lower(), 0)
+
+    def mark_sent(self, student, job_ids):
+        """Add job_ids to the student's history (called once their email is delivered)."""
+        student = student.strip().lower()
+        with self._lock:
+            bitmaps = self._load()
+            bits = bitmaps.get(student, 0) | to_bitmap(job_ids)
+            bitmaps[student] = bits
+            with closing(self.connect()) as conn, conn:
+                conn.execute(
+                    "INSERT INTO send_history (student, sent, jobs_sent, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(student) DO UPDATE SET sent = excluded.sent, jobs_sent = excluded.jobs_sent, "
+                    "updated_at = excluded.updated_at",
+                    (student, _encode(bits), bin(bits).count("1"), _now()),
+                )
@@ -1,22 +1,22 @@
 import os
 import smtplib
-import time
 import urllib.parse
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from browser_pool import BrowserPool, chrome_factory, chromedriver_path
 
 # ---- CHROME SETUP ----
-chrome_options = Options()
-chrome_options.add_argument("headless")
-chrome_options.add_argument("no-sandbox")
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-time.sleep(1)
+def chrome_options():
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.add_argument("headless")
+    options.add_argument("no-sandbox")
+    return options
+
+
+browser_pool = BrowserPool(chrome_factory(chrome_options, chromedriver_path), size=1)
 
 # ---- FILTERS ----
 TECHNICAL_ROLES = [
@@ -27,12 +27,20 @@ TECHNICAL_ROLES = [
 EXCLUDE_ROLES = ["php", "laravel", "wordpress", "drupal", ".net", "c#", "java", "spring", "hibernate"]
 
 # ---- SCRAPE INFOPARK ----
+def _load_page(driver, page):
+    driver.get(f"https://infopark.in/companies/job-search?page={page}")
+    browser_pool.record_page_load(driver)
+    return BeautifulSoup(driver.page_source, "html.parser")
+
+
 def fetch_infopark_jobs():
     jobs = []
-    for page in range(1, 3):
-        url = f"https://infopark.in/companies/job-search?page={page}"
-        driver.get(url)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+    driver = browser_pool.acquire()
+    try:
+        pages = [_load_page(driver, page) for page in range(1, 3)]
+    finally:
+        browser_pool.release(driver)
+    for soup in pages:
         rows = soup.select("table tr")[1:]
         for row in rows:
             cols = row.find_all("td")
@@ -165,8 +173,10 @@ def send_email(jobs):
 
 # ---- MAIN ----
 if __name__ == "__main__":
-    jobs = fetch_infopark_jobs()
-    driver.quit()
+    try:
+        jobs = fetch_infopark_jobs()
+    finally:
+        browser_pool.shutdown()
     if jobs:
         send_email(jobs)
     else:
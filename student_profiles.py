@@ -0,0 +1,45 @@
+# student_profiles.py
+# Skills / interests each student gave when registering through appCred.py.
+# They are kept with the roster (roster.py), which appCred mirrors into the
+# STUDENT_PROFILES secret; the scheduled run reads that from the environment,
+# local runs can point STUDENT_PROFILES_PATH at a JSON file instead.
+#
+#   {"student@mail.com": {"name": "Student", "skills": ["python", "sql"]}, ...}
+import json
+import os
+import re
+
+DEFAULT_PATH = os.path.join("data", "student_profiles.json")
+MAX_SKILLS = 30
+
+
+def profiles_path(path=None):
+    return path or os.getenv("STUDENT_PROFILES_PATH", DEFAULT_PATH)
+
+
+def parse_skills(value):
+    """Skills from a list or a comma / semicolon / newline separated string, lowercased and deduped."""
+    if isinstance(value, str):
+        value = re.split(r"[,;\n]", value)
+    skills = [s.strip().lower() for s in (value or []) if isinstance(s, str) and s.strip()]
+    return list(dict.fromkeys(skills))[:MAX_SKILLS]
+
+
+def load_profiles(path=None):
+    """{email: {"name", "skills"}} from STUDENT_PROFILES (JSON) if set, otherwise the local file."""
+    raw = os.getenv("STUDENT_PROFILES")
+    if raw is None:
+        try:
+            with open(profiles_path(path), encoding="utf-8") as f:
+                raw = f.read()
+        except OSError:
+            return {}
+    try:
+        data = json.loads(raw or "{}")
+    except ValueError:
+        print("⚠️ STUDENT_PROFILES is not valid JSON, ranking without profiles")
+        return {}
+    return {
+        email.strip().lower(): {"name": p.get("name", ""), "skills": parse_skills(p.get("skills"))}
+        for email, p in data.items() if isinstance(p, dict)
+    }
@@ -0,0 +1,116 @@
+# url_canon.py
+# Canonical form of job links, used as the primary dedupe key.
+#
+# The same posting is reached through many URLs: tracking parameters
+# (utm_*, refId, trk, ...), Indeed's /rc/clk and /pagead/clk redirects,
+# LinkedIn query strings, "www." / trailing-slash / relative-vs-absolute
+# variants. canonical_url() folds those into one URL; source_job_id() pulls
+# the portal's own job id out of Indeed, Naukri and LinkedIn links, which
+# is the most reliable identity of all.
+import re
+import urllib.parse
+
+from matcher import tokenize
+
+# query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "utm_id",
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "igshid",
+    "ref", "refid", "referer", "referrer", "trk", "trkinfo", "trackingid", "tracking_id",
+    "src", "from", "sid", "sessionid", "session_id",
+    "tk", "xkcb", "vjs", "advn", "sjdu", "acatk", "camk", "from_search",
+    "lipi", "midtoken", "midsig", "eba", "otptoken", "currentjobid", "originalsubdomain",
+}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+_NAUKRI_ID_RE = re.compile(r"-(\d{9,})/?$")
+_LINKEDIN_ID_RE = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d{6,})(?:/|$)")
+
+
+def _host(netloc):
+    host = netloc.lower().rsplit("@", 1)[-1]
+    name, _, port = host.partition(":")
+    if name.startswith("www."):
+        name = name[4:]
+    return name, port
+
+
+def source_job_id(url):
+    """'indeed:<jk>', 'naukri:<id>' or 'linkedin:<id>' for portal job links, else None."""
+    if not url:
+        return None
+    parts = urllib.parse.urlsplit(url.strip())
+    host, _ = _host(parts.netloc)
+    query = urllib.parse.parse_qs(parts.query)
+    if "indeed." in host:
+        jk = query.get("jk") or query.get("vjk")
+        return f"indeed:{jk[0].lower()}" if jk else None
+    if host.endswith("naukri.com"):
+        m = _NAUKRI_ID_RE.search(parts.path)
+        return f"naukri:{m.group(1)}" if m else None
+    if host.endswith("linkedin.com"):
+        m = _LINKEDIN_ID_RE.search(parts.path)
+        if m:
+            return f"linkedin:{m.group(1)}"
+        cur = query.get("currentJobId")
+        return f"linkedin:{cur[0]}" if cur and cur[0].isdigit() else None
+    return None
+
+
+def canonical_url(url, base=None):
+    """
+    Normalized absolute URL: lowercase scheme and host without "www." or a
+    default port, no fragment, tracking parameters dropped, remaining
+    parameters sorted, duplicate and trailing slashes removed. Portal links
+    with a job id become that portal's plain job page. Empty -> "".
+    """
+    url = (url or "").strip()
+    if not url or url.startswith(("javascript:", "mailto:", "tel:", "#")):
+        return ""
+    if base and not urllib.parse.urlsplit(url).scheme:
+        url = urllib.parse.urljoin(base, url)
+    parts = urllib.parse.urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    host, port = _host(parts.netloc)
+
+    job_id = source_job_id(url)
+    if job_id:
+        portal, ident = job_id.split(":", 1)
+        if portal == "indeed":
+            return f"https://in.indeed.com/viewjob?jk={ident}"
+        if portal == "linkedin":
+            return f"https://linkedin.com/jobs/view/{ident}"
+
+    netloc = host if not port or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    return urllib.parse.urlunsplit((scheme, netloc, path, urllib.parse.urlencode(query), ""))
+
+
+def title_key(title):
+    return " ".join(tokenize(title or ""))
+
+
+def link_key(link):
+    """The portal job id of a link if it has one, else its canonical URL ("" for no link)."""
+    return source_job_id(link) or canonical_url(link)
+
+
+def dedupe_key(title, company, link, key=None):
+    """
+    Identity of a job: the portal job id when the link has one, else the
+    canonical link plus the normalized title (careers pages often point
+    every opening at the same page), else title|company. `key` is
+    link_key(link) when the caller has already computed it.
+    """
+    key = link_key(link) if key is None else key
+    if key and "://" not in key:
+        return key
+    if key:
+        return f"{key}|{title_key(title)}"
+    return f"{(title or '').strip().lower()}|{(company or '').strip().lower()}"